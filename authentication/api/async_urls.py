@@ -0,0 +1,8 @@
+from django.urls import path
+from .async_views import login_view, registration_view
+
+# Nur unter ASGI eingebunden, siehe core.asgi_urls
+urlpatterns = [
+    path('registration/', registration_view, name='registration'),
+    path('login/', login_view, name='login'),
+]
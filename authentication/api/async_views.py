@@ -0,0 +1,110 @@
+"""
+Async counterparts of LoginView and RegisterView, routed by core.asgi.
+
+Request and response bodies match the DRF views. Password hashing runs in
+authentication.hashing's bounded pool, so the event loop keeps serving other
+requests during a login burst; a full pool answers 503 with Retry-After.
+Login goes through django.contrib.auth.aauthenticate(), the hashing itself
+happens in authentication.backends.PooledHashingBackend.
+"""
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.authtoken.models import Token
+
+from users.models import CustomUser
+from .. import hashing
+from .serializers import RegistrationSerializer
+
+RETRY_AFTER_SECONDS = 1
+
+
+class ParseError(Exception):
+    pass
+
+
+def read_data(request):
+    if request.content_type != "application/json":
+        return request.POST
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError as exc:
+        raise ParseError(f"JSON parse error - {exc}")
+    if not isinstance(data, dict):
+        raise ParseError("JSON-Objekt erwartet.")
+    return data
+
+
+def token_response(user, token, status):
+    return JsonResponse({
+        "token": token.key,
+        "username": user.username,
+        "email": user.email,
+        "user_id": user.id,
+    }, status=status)
+
+
+def overloaded_response():
+    response = JsonResponse({"detail": "Zu viele Anmeldungen, bitte später erneut versuchen."}, status=503)
+    response["Retry-After"] = str(RETRY_AFTER_SECONDS)
+    return response
+
+
+def json_view(view):
+    @wraps(view)
+    async def wrapper(request):
+        try:
+            return await view(request, read_data(request))
+        except ParseError as exc:
+            return JsonResponse({"detail": str(exc)}, status=400)
+        except hashing.PoolOverloaded:
+            return overloaded_response()
+    return csrf_exempt(require_POST(wrapper))
+
+
+@json_view
+async def login_view(request, data):
+    username = data.get("username")
+    password = data.get("password")
+
+    errors = {}
+    if not username:
+        errors["username"] = ["This field is required."]
+    if not password:
+        errors["password"] = ["This field is required."]
+    if errors:
+        return JsonResponse(errors, status=400)
+
+    user = await aauthenticate(request, username=username, password=password)
+    if user is None:
+        return JsonResponse({"detail": "Ungültige Anfragedaten."}, status=400)
+    token, _ = await Token.objects.aget_or_create(user=user)
+    return token_response(user, token, status=200)
+
+
+@json_view
+async def registration_view(request, data):
+    serializer = RegistrationSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=400)
+
+    validated = serializer.validated_data
+    user = CustomUser(
+        username=CustomUser.normalize_username(validated["username"]),
+        email=CustomUser.objects.normalize_email(validated["email"]),
+        type=validated["type"],
+        password=await hashing.get_pool().make_password(validated["password"]),
+    )
+    try:
+        await user.asave()
+    except IntegrityError:
+        # paralleler Request mit demselben Namen
+        return JsonResponse({"username": ["A user with that username already exists."]}, status=400)
+    token, _ = await Token.objects.aget_or_create(user=user)
+    return token_response(user, token, status=201)
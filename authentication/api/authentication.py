@@ -0,0 +1,22 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from .. import cache as token_cache
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that skips the Token/User
+    query for tokens seen recently, see authentication.cache.
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.lookup(key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.store(token)
+            return user, token
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return token.user, token
@@ -26,3 +26,21 @@ class RegistrationSerializer(serializers.ModelSerializer):
             type=validated_data["type"],
         )
         return user
+
+
+class UserImportSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk import (authentication.importers). Username uniqueness
+    is checked per batch by the importer instead of one query per row.
+    """
+
+    class Meta:
+        model = CustomUser
+        fields = (
+            "username", "email", "password", "type",
+            "first_name", "last_name", "location", "tel", "description", "working_hours",
+        )
+        extra_kwargs = {
+            "password": {"write_only": True},
+            "username": {"validators": [CustomUser.username_validator]},
+        }
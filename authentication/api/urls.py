@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import RegisterView, LoginView
+from .views import RegisterView, LoginView, TokenCacheStatsView, UserImportView
 
 urlpatterns = [
     path('registration/', RegisterView.as_view(), name='registration'),
     path('login/', LoginView.as_view(), name='login'),
+    path('token-cache-stats/', TokenCacheStatsView.as_view(), name='token-cache-stats'),
+    path('users/import/', UserImportView.as_view(), name='user-import'),
 ]
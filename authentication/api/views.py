@@ -2,9 +2,13 @@ from rest_framework.views import APIView
 from rest_framework.generics import CreateAPIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate
+from core.renderers import FastJSONParser
+from market.api.parsers import NDJSONParser
+from .. import cache as token_cache
+from ..importers import UserImporter, get_request_executor
 from .serializers import RegistrationSerializer
 
 
@@ -54,3 +58,41 @@ class LoginView(APIView):
                 "user_id": user.id
             }, status=status.HTTP_200_OK)
         return Response({"detail": "Ungültige Anfragedaten."}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TokenCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(token_cache.stats())
+
+
+class UserImportView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [FastJSONParser, NDJSONParser]
+
+    def post(self, request):
+        rows = request.data
+        if isinstance(rows, dict):
+            return Response(
+                {"detail": "Erwartet ein JSON-Array oder NDJSON."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        # kein Prozess-Pool im Request, siehe get_request_executor()
+        with UserImporter(workers=1, executor=get_request_executor()) as importer:
+            results = list(importer.import_rows(rows))
+        counts = {"created": 0, "exists": 0, "error": 0}
+        for result in results:
+            counts[result["status"]] += 1
+
+        if not counts["error"]:
+            response_status = status.HTTP_201_CREATED
+        elif counts["created"] or counts["exists"]:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            "created": counts["created"],
+            "exists": counts["exists"],
+            "failed": counts["error"],
+            "results": results,
+        }, status=response_status)
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from . import hashing
+
+UserModel = get_user_model()
+
+
+class PooledHashingBackend(ModelBackend):
+    """
+    ModelBackend whose async path (aauthenticate) verifies and upgrades
+    password hashes in authentication.hashing's bounded pool instead of on
+    the event loop; PoolOverloaded propagates to the caller. The sync path is
+    ModelBackend's own.
+    """
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        pool = hashing.get_pool()
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # gleiche Laufzeit wie bei bekannten Usern (#20760)
+            await pool.make_password(password)
+            return None
+        is_correct, must_update = await pool.verify_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = await pool.make_password(password)
+            await user.asave(update_fields=["password"])
+        return user
@@ -0,0 +1,253 @@
+"""
+Token -> user cache for CachedTokenAuthentication.
+
+Two layers: a bounded in-process LRU (TOKEN_AUTH_LOCAL_CACHE_SIZE entries,
+TOKEN_AUTH_LOCAL_CACHE_TIMEOUT seconds) in front of the Django cache
+TOKEN_AUTH_CACHE_ALIAS, which is shared by all workers
+(TOKEN_AUTH_CACHE_TIMEOUT seconds). Keys are hashes of the token, never the
+token itself. Entries hold the token's creation time and the user's field
+values without the password hash; lookup() builds new Token and user
+instances from them for every request.
+
+invalidate() drops both layers in this process and replaces the shared entry
+with a short tombstone, so a request that read the user before the
+invalidation cannot store it again (store() uses cache.add()). LRU copies in
+other workers expire after the local timeout.
+
+If the configured cache is process-local (LocMemCache), an invalidation
+could not reach other workers; only the short-lived LRU is used then.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router, transaction
+
+from core.cache import is_shared
+
+PREFIX = "auth:token"
+HITS_KEY = f"{PREFIX}:hits"
+LOCAL_HITS_KEY = f"{PREFIX}:local_hits"
+MISSES_KEY = f"{PREFIX}:misses"
+TOMBSTONE = "invalidated"
+TOMBSTONE_TIMEOUT = 10
+# nie in den Cache: der Hash gehört nicht in Redis/DB-Cache
+EXCLUDED_USER_FIELDS = {"password"}
+# Treffer/Fehlschläge werden gesammelt gezählt, sonst kostet jeder Lookup einen Cache-Roundtrip
+COUNTER_FLUSH_EVERY = 100
+
+
+def get_cache_alias():
+    return getattr(settings, "TOKEN_AUTH_CACHE_ALIAS", "default")
+
+
+def get_cache():
+    return caches[get_cache_alias()]
+
+
+def get_shared_cache():
+    """The cache shared by all workers, or None if it is process-local."""
+    cache = get_cache()
+    return cache if is_shared(cache) else None
+
+
+def get_timeout():
+    return getattr(settings, "TOKEN_AUTH_CACHE_TIMEOUT", 300)
+
+
+def get_local_size():
+    return getattr(settings, "TOKEN_AUTH_LOCAL_CACHE_SIZE", 1024)
+
+
+def get_local_timeout():
+    return getattr(settings, "TOKEN_AUTH_LOCAL_CACHE_TIMEOUT", 5)
+
+
+class LRUCache:
+    """Thread-safe LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize=get_local_size, timeout=get_local_timeout, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= self.clock():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        maxsize, timeout = self.maxsize(), self.timeout()
+        if maxsize <= 0 or timeout <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (value, self.clock() + timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > maxsize:
+                self.entries.popitem(last=False)
+
+    def add(self, key, value):
+        """Like set(), but keeps an existing unexpired entry."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] > self.clock():
+                return False
+        self.set(key, value)
+        return True
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+local_cache = LRUCache()
+_pending_counts = Counter()
+_pending_lock = threading.Lock()
+
+
+def make_key(token_key):
+    return f"{PREFIX}:{hashlib.sha256(token_key.encode('utf-8')).hexdigest()}"
+
+
+def _incr(key, delta=1):
+    cache = get_cache()
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key, delta)
+
+
+def _count(key):
+    with _pending_lock:
+        _pending_counts[key] += 1
+        if _pending_counts.total() < COUNTER_FLUSH_EVERY:
+            return
+    flush_counters()
+
+
+def flush_counters():
+    with _pending_lock:
+        pending = dict(_pending_counts)
+        _pending_counts.clear()
+    for key, delta in pending.items():
+        _incr(key, delta)
+
+
+def make_entry(token):
+    user = token.user
+    fields = {
+        field.attname: field.get_prep_value(field.value_from_object(user))
+        for field in user._meta.concrete_fields
+        if field.attname not in EXCLUDED_USER_FIELDS
+    }
+    return {"created": token.created, "user": fields}
+
+
+def restore(token_key, entry):
+    """New Token and user instances; password is deferred and loaded on access."""
+    from rest_framework.authtoken.models import Token
+
+    user_model = get_user_model()
+    # JSON-Felder sind veränderlich, jeder Request bekommt eigene Werte
+    fields = copy.deepcopy(entry["user"])
+    user = user_model.from_db(router.db_for_read(user_model), list(fields), list(fields.values()))
+    token = Token.from_db(
+        router.db_for_read(Token), ["key", "user_id", "created"], [token_key, user.pk, entry["created"]]
+    )
+    token.user = user
+    return token
+
+
+def lookup(token_key):
+    """A Token (with .user set) built from the cache, or None."""
+    key = make_key(token_key)
+    entry = local_cache.get(key)
+    if entry is not None and entry != TOMBSTONE:
+        _count(LOCAL_HITS_KEY)
+        return restore(token_key, entry)
+    shared = get_shared_cache()
+    entry = shared.get(key) if shared is not None else None
+    if entry is None or entry == TOMBSTONE:
+        _count(MISSES_KEY)
+        return None
+    _count(HITS_KEY)
+    local_cache.set(key, entry)
+    return restore(token_key, entry)
+
+
+def store(token):
+    key = make_key(token.key)
+    entry = make_entry(token)
+    shared = get_shared_cache()
+    if shared is None:
+        local_cache.add(key, entry)
+    # add() statt set(): eine Tombstone aus invalidate() bleibt stehen
+    elif shared.add(key, entry, timeout=get_timeout()):
+        local_cache.set(key, entry)
+
+
+def _drop(keys):
+    shared = get_shared_cache()
+    if shared is None:
+        # Tombstone im LRU, sonst könnte store() den alten Stand zurückschreiben
+        for key in keys:
+            local_cache.set(key, TOMBSTONE)
+        return
+    for key in keys:
+        local_cache.delete(key)
+    shared.set_many(dict.fromkeys(keys, TOMBSTONE), timeout=TOMBSTONE_TIMEOUT)
+
+
+def invalidate(*token_keys):
+    keys = [make_key(token_key) for token_key in token_keys]
+    if not keys:
+        return
+    _drop(keys)
+    if transaction.get_connection().in_atomic_block:
+        # ein paralleler Request kann den Stand vor dem Commit gecacht haben
+        transaction.on_commit(lambda: _drop(keys))
+
+
+def invalidate_user(user_id):
+    from rest_framework.authtoken.models import Token
+
+    invalidate(*Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+
+
+def stats():
+    flush_counters()
+    cache = get_cache()
+    local_hits = cache.get(LOCAL_HITS_KEY, 0)
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = local_hits + hits + misses
+    return {
+        "local_hits": local_hits,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round((local_hits + hits) / total, 4) if total else 0.0,
+        "local_size": len(local_cache),
+        "shared": is_shared(cache),
+    }
@@ -0,0 +1,73 @@
+"""
+Bounded pool for password hashing in the async login/registration views.
+
+PBKDF2 (hashlib.pbkdf2_hmac) releases the GIL, so a thread pool hashes on all
+cores without the pickling and Django bootstrapping a process pool would need.
+At most PASSWORD_HASHING_WORKERS hashes run at once and at most
+PASSWORD_HASHING_QUEUE_SIZE more wait; beyond that run() raises PoolOverloaded
+right away (the views answer 503 with Retry-After) instead of queueing without
+bound. A slot is freed when the hash has finished, not when the awaiting
+request gives up, so cancelled requests cannot push the pool past its bound.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+
+def get_workers():
+    return getattr(settings, "PASSWORD_HASHING_WORKERS", os.cpu_count() or 2)
+
+
+def get_queue_size():
+    return getattr(settings, "PASSWORD_HASHING_QUEUE_SIZE", get_workers() * 4)
+
+
+class PoolOverloaded(Exception):
+    pass
+
+
+class HashingPool:
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        # threading statt asyncio.Semaphore: unabhängig vom Event Loop
+        self.slots = threading.BoundedSemaphore(self.capacity)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hashing")
+
+    async def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            raise PoolOverloaded
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        # erst freigeben, wenn der Thread fertig ist, auch bei abgebrochenem Request
+        future.add_done_callback(lambda _: self.slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def verify_password(self, password, encoded):
+        """(is_correct, must_update) as in django.contrib.auth.hashers.verify_password."""
+        return await self.run(verify_password, password, encoded)
+
+    async def make_password(self, password):
+        return await self.run(make_password, password)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(get_workers(), get_queue_size())
+        return _pool
@@ -0,0 +1,170 @@
+"""
+Bulk user provisioning shared by POST /api/users/import/ and ``manage.py import_users``.
+
+Rows are validated with UserImportSerializer in memory; usernames that
+already exist are reported as ``exists`` and skipped before any hashing, so
+re-running an interrupted import resumes where it stopped. Passwords of the
+remaining rows are hashed in a process pool (manage.py import_users) or, for
+the endpoint, in a thread pool of USER_IMPORT_REQUEST_WORKERS threads shared
+by all requests; every batch is written with one bulk_create for CustomUser
+and one for Token inside a transaction.
+bulk_create bypasses model signals, so PlatformStats is updated per batch.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+
+from market import stats as platform_stats
+from market.importers import InvalidRow
+from market.models import PlatformStats
+from users.models import CustomUser
+from .api.serializers import UserImportSerializer
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_workers():
+    return getattr(settings, "USER_IMPORT_WORKERS", os.cpu_count() or 1)
+
+
+def get_request_workers():
+    return getattr(settings, "USER_IMPORT_REQUEST_WORKERS", 2)
+
+
+_request_executor = None
+_request_executor_lock = threading.Lock()
+
+
+def get_request_executor():
+    """Thread pool for imports inside a request, None means hashing in the request thread."""
+    global _request_executor
+    workers = get_request_workers()
+    if workers <= 1:
+        return None
+    with _request_executor_lock:
+        if _request_executor is None:
+            # PBKDF2 gibt den GIL frei; keine Prozesse aus einem Web-Worker starten
+            _request_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="user-import")
+        return _request_executor
+
+
+def _init_worker():
+    # nötig für spawn/forkserver, bei fork schon eingerichtet
+    django.setup()
+
+
+class UserImporter:
+    """
+    Use as a context manager, the process pool lives until ``close()``.
+    ``workers <= 1`` hashes in the calling process. With ``executor`` the
+    hashes run in that existing pool, which ``close()`` leaves running.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, workers=None, executor=None):
+        self.batch_size = batch_size
+        self.workers = get_workers() if workers is None else workers
+        self.executor = executor
+        self.owns_executor = executor is None and self.workers > 1
+        if self.owns_executor:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self.seen = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.owns_executor and self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        self.executor = None
+
+    def hash_passwords(self, passwords):
+        if self.executor is None:
+            return [make_password(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self.executor.map(make_password, passwords, chunksize=chunksize))
+
+    def import_rows(self, rows, progress=None):
+        """
+        Yield one result dict per input row, in input order; calls
+        ``progress(rows_done, created_so_far)`` after each committed batch.
+        """
+        rows = enumerate(rows)
+        done = created = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return
+            results = self.import_batch(batch)
+            done += len(batch)
+            created += sum(1 for result in results if result["status"] == "created")
+            yield from results
+            if progress is not None:
+                progress(done, created)
+
+    def import_batch(self, batch):
+        results = []
+        pending = []
+        for index, row in batch:
+            if isinstance(row, InvalidRow):
+                results.append({"row": index, "status": "error", "errors": {"non_field_errors": [row.message]}})
+                continue
+            if not isinstance(row, dict):
+                results.append({"row": index, "status": "error", "errors": {"non_field_errors": ["Objekt erwartet."]}})
+                continue
+            serializer = UserImportSerializer(data=row)
+            if not serializer.is_valid():
+                results.append({"row": index, "status": "error", "errors": serializer.errors})
+                continue
+            data = dict(serializer.validated_data)
+            data["username"] = CustomUser.normalize_username(data["username"])
+            data["email"] = CustomUser.objects.normalize_email(data.get("email", ""))
+            if data["username"] in self.seen:
+                results.append({"row": index, "status": "error",
+                                "errors": {"username": ["Doppelt in der Eingabe."]}})
+                continue
+            self.seen.add(data["username"])
+            result = {"row": index, "status": "created", "username": data["username"]}
+            results.append(result)
+            pending.append((result, data))
+
+        if pending:
+            self.skip_existing(pending)
+            pending = [(result, data) for result, data in pending if result["status"] == "created"]
+            hashes = self.hash_passwords([data.pop("password") for _, data in pending])
+            users = [CustomUser(password=encoded, **data) for (_, data), encoded in zip(pending, hashes)]
+            try:
+                self.write(pending, users)
+            except IntegrityError:
+                # paralleler Import mit denselben Namen: bereits angelegte überspringen, einmal neu versuchen
+                self.skip_existing(pending)
+                remaining = [(entry, user) for entry, user in zip(pending, users) if entry[0]["status"] == "created"]
+                self.write([entry for entry, _ in remaining], [user for _, user in remaining])
+        return results
+
+    def skip_existing(self, pending):
+        usernames = [data["username"] for _, data in pending]
+        existing = set(CustomUser.objects.filter(username__in=usernames).values_list("username", flat=True))
+        for result, data in pending:
+            if data["username"] in existing:
+                result["status"] = "exists"
+
+    def write(self, pending, users):
+        if not users:
+            return
+        with transaction.atomic():
+            users = CustomUser.objects.bulk_create(users)
+            Token.objects.bulk_create(Token(key=Token.generate_key(), user=user) for user in users)
+            PlatformStats.objects.add(business_profile_count=sum(1 for user in users if user.type == "business"))
+            platform_stats.invalidate()
+        for (result, _), user in zip(pending, users):
+            result["id"] = user.pk
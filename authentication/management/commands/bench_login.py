@@ -0,0 +1,125 @@
+import asyncio
+import json
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test import Client
+from rest_framework.authtoken.models import Token
+
+from authentication import hashing
+from core.asgi import application
+from users.models import CustomUser
+
+USERNAME_PREFIX = "bench-login-"
+PASSWORD = "bench-password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Login throughput against concurrency: the sync DRF view behind a fixed number of "
+        "WSGI worker threads vs. the async view served by core.asgi. Creates temporary "
+        f"'{USERNAME_PREFIX}*' users and deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated in-flight request counts.")
+        parser.add_argument("--requests", type=int, default=32, help="Logins per concurrency level and path.")
+        parser.add_argument("--sync-workers", type=int, default=4, help="WSGI worker threads for the sync path.")
+        parser.add_argument("--users", type=int, default=8)
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options["concurrency"].split(",")]
+        encoded = make_password(PASSWORD)
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f"{USERNAME_PREFIX}{i}", password=encoded, type="customer")
+            for i in range(options["users"])
+        )
+        # Tokens vorab, damit der Login nur liest (SQLite sperrt bei parallelen Writes)
+        Token.objects.bulk_create(Token(key=Token.generate_key(), user=user) for user in users)
+        bodies = [json.dumps({"username": user.username, "password": PASSWORD}) for user in users]
+        # abgelehnte Requests (503) nicht einzeln loggen
+        request_logger = logging.getLogger("django.request")
+        log_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            self.stdout.write(
+                f"{hashing.get_workers()} hashing workers, queue {hashing.get_queue_size()}, "
+                f"{options['sync_workers']} sync workers"
+            )
+            self.stdout.write(f"{'concurrency':>11}  {'sync req/s':>10}  {'p95 ms':>8}  "
+                              f"{'async req/s':>11}  {'p95 ms':>8}  {'503':>4}")
+            for level in levels:
+                sync = self.run_sync(bodies, level, options["requests"], options["sync_workers"])
+                async_ = asyncio.run(self.run_async(bodies, level, options["requests"]))
+                self.stdout.write(
+                    f"{level:>11}  {sync['throughput']:>10.1f}  {sync['p95']:>8.0f}  "
+                    f"{async_['throughput']:>11.1f}  {async_['p95']:>8.0f}  {async_['rejected']:>4}"
+                )
+        finally:
+            request_logger.setLevel(log_level)
+            CustomUser.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    def summarize(self, started, latencies, statuses):
+        elapsed = time.perf_counter() - started
+        ok = [latency for latency, status in zip(latencies, statuses) if status == 200]
+        return {
+            "throughput": len(ok) / elapsed,
+            "p95": statistics.quantiles(ok, n=20)[-1] * 1000 if len(ok) > 1 else 0,
+            "rejected": statuses.count(503),
+        }
+
+    def run_sync(self, bodies, concurrency, total, workers):
+        # mehr als `workers` Requests gleichzeitig warten wie bei WSGI in der Queue
+        def login(index):
+            start = time.perf_counter()
+            response = Client().post(
+                "/api/login/", bodies[index % len(bodies)], content_type="application/json", HTTP_HOST="localhost"
+            )
+            return time.perf_counter() - start, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(concurrency, workers)) as executor:
+            results = list(executor.map(login, range(total)))
+        return self.summarize(started, *zip(*results))
+
+    async def run_async(self, bodies, concurrency, total):
+        in_flight = asyncio.Semaphore(concurrency)
+
+        async def login(index):
+            async with in_flight:
+                start = time.perf_counter()
+                status = await call_asgi("/api/login/", bodies[index % len(bodies)].encode("utf-8"))
+                return time.perf_counter() - start, status
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(login(index) for index in range(total)))
+        return self.summarize(started, *zip(*results))
+
+
+async def call_asgi(path, body):
+    """POST ``body`` to core.asgi.application in-process, return the status code."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode("ascii"), "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json")],
+        "server": ("localhost", 80), "client": ("127.0.0.1", 50000),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    statuses = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # kein Disconnect, solange die Antwort läuft
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await application(scope, receive, send)
+    return statuses[0]
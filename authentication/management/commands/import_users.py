@@ -0,0 +1,70 @@
+import json
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.importers import DEFAULT_BATCH_SIZE, UserImporter, get_workers
+from market.importers import iter_ndjson
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users (with tokens) from a JSON array or NDJSON file. Existing usernames are skipped, "
+        "so an interrupted import can simply be started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, '-' reads from stdin.")
+        parser.add_argument("--format", choices=["json", "ndjson"], help="Default: guessed from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--workers", type=int, default=None,
+                            help=f"Hashing processes (default {get_workers()}, 1 = no pool).")
+        parser.add_argument("--start", type=int, default=0,
+                            help="Skip the first N rows, e.g. the row count reported by an interrupted run.")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or ("json" if options["path"].endswith(".json") else "ndjson")
+        stream = sys.stdin if options["path"] == "-" else open(options["path"], encoding="utf-8")
+        start = options["start"]
+        counts = {"created": 0, "exists": 0, "error": 0}
+        committed = start
+        started = time.monotonic()
+
+        def progress(done, created):
+            nonlocal committed
+            committed = start + done
+            rate = created / max(time.monotonic() - started, 1e-9)
+            self.stdout.write(f"{committed} rows processed, {created} users created ({rate:.0f}/s) ...")
+
+        try:
+            if fmt == "json":
+                try:
+                    rows = json.load(stream)
+                except json.JSONDecodeError as exc:
+                    raise CommandError(f"Invalid JSON input: {exc}")
+                if not isinstance(rows, list):
+                    raise CommandError("JSON input must be an array of users.")
+            else:
+                rows = iter_ndjson(stream)
+            with UserImporter(batch_size=options["batch_size"], workers=options["workers"]) as importer:
+                for result in importer.import_rows(islice(rows, start, None), progress=progress):
+                    counts[result["status"]] += 1
+                    if result["status"] == "error":
+                        row = start + result["row"]
+                        self.stderr.write(f"row {row}: {json.dumps(result['errors'], ensure_ascii=False)}")
+        except CommandError:
+            raise
+        except Exception as exc:
+            # Batches bis committed sind gespeichert
+            raise CommandError(f"Import failed after row {committed}: {exc}. Resume with --start {committed}.")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['created']} users, {counts['exists']} already existed, "
+            f"{counts['error']} rows failed ({elapsed:.1f}s)."
+        ))
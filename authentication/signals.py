@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from . import cache as token_cache
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # Passwort, is_active, aber auch type/Profil stecken im gecachten User;
+    # queryset.update() umgeht das und wird erst nach dem Timeout sichtbar
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    token_cache.invalidate_user(instance.pk)
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_login_failed
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+from rest_framework.authtoken.models import Token
+
+from authentication import hashing
+from authentication.api.async_views import login_view, registration_view
+from core.asgi import application
+from users.models import CustomUser
+
+
+@override_settings(ROOT_URLCONF="core.asgi_urls")
+class AsyncAuthViewTests(TestCase):
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="loginuser", email="login@mail.de", password="loginPassword", type="customer"
+        )
+
+    async def post(self, path, data):
+        return await self.async_client.post(path, data, content_type="application/json")
+
+    async def test_login_success(self):
+        response = await self.post("/api/login/", {"username": "loginuser", "password": "loginPassword"})
+        self.assertEqual(response.status_code, 200)
+        token = await Token.objects.aget(user_id=self.user.id)
+        self.assertEqual(response.json(), {
+            "token": token.key, "username": "loginuser", "email": "login@mail.de", "user_id": self.user.id,
+        })
+
+    async def test_login_errors(self):
+        response = await self.post("/api/login/", {"username": "loginuser", "password": "wrong"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Ungültige Anfragedaten."})
+
+        response = await self.post("/api/login/", {"username": "nobody", "password": "wrong"})
+        self.assertEqual(response.status_code, 400)
+
+        response = await self.post("/api/login/", {})
+        self.assertEqual(set(response.json()), {"username", "password"})
+
+    async def test_inactive_user_cannot_login(self):
+        await CustomUser.objects.filter(pk=self.user.pk).aupdate(is_active=False)
+        response = await self.post("/api/login/", {"username": "loginuser", "password": "loginPassword"})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_outdated_hash_is_upgraded(self):
+        await CustomUser.objects.filter(pk=self.user.pk).aupdate(
+            password=make_password("loginPassword", hasher="pbkdf2_sha1")
+        )
+        response = await self.post("/api/login/", {"username": "loginuser", "password": "loginPassword"})
+        self.assertEqual(response.status_code, 200)
+        user = await CustomUser.objects.aget(pk=self.user.pk)
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+
+    async def test_login_goes_through_aauthenticate(self):
+        failed = []
+
+        def record(sender, credentials, **kwargs):
+            failed.append(credentials)
+
+        user_login_failed.connect(record)
+        self.addCleanup(user_login_failed.disconnect, record)
+        response = await self.post("/api/login/", {"username": "loginuser", "password": "wrong"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(failed, [{"username": "loginuser", "password": "********************"}])
+
+    async def test_registration(self):
+        data = {
+            "username": "newuser", "email": "new@mail.de", "password": "examplePassword",
+            "repeated_password": "examplePassword", "type": "business",
+        }
+        response = await self.post("/api/registration/", data)
+        self.assertEqual(response.status_code, 201)
+        user = await CustomUser.objects.aget(username="newuser")
+        self.assertEqual(user.type, "business")
+        self.assertTrue(await asyncio.to_thread(user.check_password, "examplePassword"))
+        self.assertEqual(response.json()["token"], (await Token.objects.aget(user=user)).key)
+
+        response = await self.post("/api/registration/", data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("username", response.json())
+
+    async def test_overloaded_pool_answers_503(self):
+        class FullPool:
+            async def verify_password(self, password, encoded):
+                raise hashing.PoolOverloaded
+
+        with mock.patch.object(hashing, "get_pool", FullPool):
+            response = await self.post("/api/login/", {"username": "loginuser", "password": "loginPassword"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    async def test_invalid_json(self):
+        response = await self.async_client.post("/api/login/", "{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("JSON parse error", response.json()["detail"])
+
+
+class HashingPoolTests(SimpleTestCase):
+
+    def test_backpressure(self):
+        pool = hashing.HashingPool(workers=1, queue_size=1)
+        release = threading.Event()
+        self.addCleanup(pool.shutdown)
+
+        async def burst():
+            blocked = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with self.assertRaises(hashing.PoolOverloaded):
+                await pool.run(release.wait, 5)
+            release.set()
+            await asyncio.gather(*blocked)
+            # Plätze sind wieder frei
+            return await pool.run(sum, [1, 2])
+
+        self.assertEqual(asyncio.run(burst()), 3)
+
+    def test_cancelled_request_keeps_slot_until_hash_finished(self):
+        pool = hashing.HashingPool(workers=1, queue_size=0)
+        release = threading.Event()
+        self.addCleanup(pool.shutdown)
+
+        async def cancel_then_retry():
+            task = asyncio.ensure_future(pool.run(release.wait, 5))
+            await asyncio.sleep(0)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # Thread hasht noch, der Platz ist weiter belegt
+            with self.assertRaises(hashing.PoolOverloaded):
+                await pool.run(sum, [1])
+            release.set()
+            while not pool.slots.acquire(blocking=False):
+                await asyncio.sleep(0.01)
+            pool.slots.release()
+            return await pool.run(sum, [1, 2])
+
+        self.assertEqual(asyncio.run(cancel_then_retry()), 3)
+
+
+class AsgiRoutingTests(SimpleTestCase):
+
+    def test_asgi_routes_auth_to_async_views(self):
+        self.assertEqual(application.urlconf, "core.asgi_urls")
+        self.assertIs(resolve("/api/login/", urlconf="core.asgi_urls").func, login_view)
+        self.assertIs(resolve("/api/registration/", urlconf="core.asgi_urls").func, registration_view)
+        self.assertIsNot(resolve("/api/login/").func, login_view)
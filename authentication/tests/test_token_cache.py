@@ -0,0 +1,172 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import exceptions, status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from authentication import cache as token_cache
+from authentication.api.authentication import CachedTokenAuthentication
+from users.models import CustomUser
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        token_cache.flush_counters()
+        cache.clear()
+        token_cache.local_cache.clear()
+        self.user = CustomUser.objects.create_user(username="cached", password="secret", type="business")
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def test_second_lookup_without_queries(self):
+        user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user.type, "business")
+        self.assertEqual(token.key, self.token.key)
+
+    def test_entry_without_password_and_new_instances(self):
+        first, _ = self.auth.authenticate_credentials(self.token.key)
+        entry = cache.get(token_cache.make_key(self.token.key))
+        self.assertNotIn("password", entry["user"])
+        self.assertNotIn(self.user.password, repr(entry))
+
+        with self.assertNumQueries(0):
+            user, token = self.auth.authenticate_credentials(self.token.key)
+            again, _ = self.auth.authenticate_credentials(self.token.key)
+        self.assertIsNot(user, again)
+        user.file_variants["thumb"] = "x"
+        self.assertEqual(again.file_variants, {})
+        self.assertEqual((user.pk, token.user_id, token.created), (self.user.pk, self.user.pk, self.token.created))
+        # Passwort wird bei Bedarf nachgeladen
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password("secret"))
+
+    @override_settings(TOKEN_AUTH_LOCAL_CACHE_TIMEOUT=0)
+    def test_shared_cache_without_local_layer(self):
+        self.auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(len(token_cache.local_cache), 0)
+
+    def test_invalidation_reaches_other_worker(self):
+        # zwei Cache-Instanzen auf demselben Speicher, wie zwei Worker-Prozesse
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}
+
+        def worker(alias):
+            token_cache.local_cache.clear()
+            return override_settings(TOKEN_AUTH_CACHE_ALIAS=alias)
+
+        with override_settings(CACHES={"default": settings.CACHES["default"], "one": shared, "two": shared}):
+            self.assertIsNot(caches["one"], caches["two"])
+            with worker("one"):
+                self.auth.authenticate_credentials(self.token.key)
+            with worker("two"), self.assertNumQueries(0):
+                self.auth.authenticate_credentials(self.token.key)
+            with worker("one"):
+                self.user.set_password("new-secret")
+                self.user.save()
+            with worker("two"):
+                self.assertIsNone(token_cache.lookup(self.token.key))
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_process_local_cache_uses_lru_only(self):
+        self.auth.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            self.auth.authenticate_credentials(self.token.key)
+        self.assertIsNone(cache.get(token_cache.make_key(self.token.key)))
+
+        token = Token.objects.select_related("user").get(key=self.token.key)
+        token_cache.invalidate(self.token.key)
+        token_cache.store(token)
+        self.assertIsNone(token_cache.lookup(self.token.key))
+
+    def test_token_deletion_invalidates(self):
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        self.token.delete()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_password_change_invalidates(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.set_password("new-secret")
+        self.user.save()
+        self.assertIsNone(token_cache.lookup(self.token.key))
+
+    def test_deactivation_rejects_requests(self):
+        url = reverse("profile-detail", args=[self.user.pk])
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_last_login_update_keeps_entry(self):
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.save(update_fields=["last_login"])
+        self.assertIsNotNone(token_cache.lookup(self.token.key))
+
+    def test_store_after_invalidation_is_ignored(self):
+        # Request hat den User vor der Invalidierung gelesen und speichert danach
+        token = Token.objects.select_related("user").get(key=self.token.key)
+        token_cache.invalidate(self.token.key)
+        token_cache.store(token)
+        self.assertIsNone(token_cache.lookup(self.token.key))
+
+    def test_hit_rate(self):
+        for _ in range(4):
+            self.auth.authenticate_credentials(self.token.key)
+        token_cache.local_cache.clear()
+        self.auth.authenticate_credentials(self.token.key)
+        stats = token_cache.stats()
+        self.assertEqual((stats["local_hits"], stats["hits"], stats["misses"]), (3, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.8)
+
+    def test_counters_are_batched(self):
+        self.auth.authenticate_credentials(self.token.key)
+        token_cache.local_cache.clear()
+        self.auth.authenticate_credentials(self.token.key)
+        # noch nicht in den Cache geschrieben, erst stats() bzw. alle COUNTER_FLUSH_EVERY Lookups
+        self.assertIsNone(cache.get(token_cache.HITS_KEY))
+        self.assertIsNone(cache.get(token_cache.MISSES_KEY))
+        self.assertEqual((token_cache.stats()["hits"], token_cache.stats()["misses"]), (1, 1))
+
+    def test_stats_endpoint_is_admin_only(self):
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(reverse("token-cache-stats")).status_code, status.HTTP_403_FORBIDDEN)
+        admin = CustomUser.objects.create_superuser(username="admin", password="secret")
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(reverse("token-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hit_rate", response.data)
+
+
+class LRUCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 0
+        self.lru = token_cache.LRUCache(maxsize=lambda: 2, timeout=lambda: 10, clock=lambda: self.now)
+
+    def test_evicts_least_recently_used(self):
+        self.lru.set("a", 1)
+        self.lru.set("b", 2)
+        self.lru.get("a")
+        self.lru.set("c", 3)
+        self.assertEqual((self.lru.get("a"), self.lru.get("b"), self.lru.get("c")), (1, None, 3))
+
+    def test_entries_expire(self):
+        self.lru.set("a", 1)
+        self.now = 10
+        self.assertIsNone(self.lru.get("a"))
+        self.assertEqual(len(self.lru), 0)
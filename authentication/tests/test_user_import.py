@@ -0,0 +1,166 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from authentication import importers
+from authentication.importers import UserImporter
+from market.models import PlatformStats
+from users.models import CustomUser
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def user_rows(count, start=0, **extra):
+    return [
+        {"username": f"import{i}", "email": f"import{i}@MAIL.DE", "password": f"secret{i}", "type": "business", **extra}
+        for i in range(start, start + count)
+    ]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, USER_IMPORT_WORKERS=1)
+class UserImporterTests(APITestCase):
+
+    def setUp(self):
+        PlatformStats.objects.recount()
+
+    def test_creates_users_and_tokens_in_batches(self):
+        progress = []
+        with UserImporter(batch_size=2) as importer, self.assertNumQueries(3 * 6):
+            # je Batch: Existenz-Check, SAVEPOINT, Users, Tokens, PlatformStats, RELEASE
+            results = list(importer.import_rows(user_rows(5), progress=lambda *args: progress.append(args)))
+        self.assertEqual([result["status"] for result in results], ["created"] * 5)
+        self.assertEqual(progress, [(2, 2), (4, 4), (5, 5)])
+
+        user = CustomUser.objects.get(username="import3")
+        self.assertEqual(results[3]["id"], user.pk)
+        self.assertEqual(user.email, "import3@mail.de")
+        self.assertTrue(user.check_password("secret3"))
+        self.assertEqual(Token.objects.count(), 5)
+        self.assertEqual(PlatformStats.objects.get().business_profile_count, 5)
+
+    def test_resume_skips_existing_users(self):
+        with UserImporter(batch_size=2) as importer:
+            list(importer.import_rows(user_rows(3)))
+        with UserImporter(batch_size=2) as importer:
+            results = list(importer.import_rows(user_rows(5)))
+        self.assertEqual([result["status"] for result in results], ["exists"] * 3 + ["created"] * 2)
+        self.assertEqual(CustomUser.objects.filter(username__startswith="import").count(), 5)
+
+    def test_invalid_and_duplicate_rows(self):
+        rows = user_rows(2) + [{"username": "import0", "password": "x"}, {"username": "bad name!", "password": "x"}, 7]
+        with UserImporter() as importer:
+            results = list(importer.import_rows(rows))
+        self.assertEqual([result["status"] for result in results], ["created", "created", "error", "error", "error"])
+        self.assertIn("username", results[2]["errors"])
+        self.assertIn("username", results[3]["errors"])
+
+    @override_settings(USER_IMPORT_WORKERS=2)
+    def test_process_pool(self):
+        with UserImporter() as importer:
+            self.assertIsNotNone(importer.executor)
+            results = list(importer.import_rows(user_rows(4)))
+        self.assertEqual([result["status"] for result in results], ["created"] * 4)
+        self.assertTrue(CustomUser.objects.get(username="import1").check_password("secret1"))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, USER_IMPORT_WORKERS=1)
+class ImportUsersCommandTests(APITestCase):
+
+    def write(self, rows):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False)
+        handle.write("\n".join(json.dumps(row) for row in rows))
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def test_progress_and_start(self):
+        path = self.write(user_rows(5))
+        out = StringIO()
+        call_command("import_users", path, "--batch-size", "2", "--start", "1", stdout=out)
+        self.assertIn("5 rows processed, 4 users created", out.getvalue())
+        self.assertIn("Created 4 users, 0 already existed", out.getvalue())
+        self.assertFalse(CustomUser.objects.filter(username="import0").exists())
+
+    def test_failure_reports_resume_position(self):
+        path = self.write(user_rows(4))
+        original = UserImporter.write
+        calls = []
+
+        def fail_second_batch(importer, pending, users):
+            calls.append(len(users))
+            if len(calls) == 2:
+                raise RuntimeError("Verbindung weg")
+            return original(importer, pending, users)
+
+        with mock.patch.object(UserImporter, "write", fail_second_batch), \
+                self.assertRaisesMessage(CommandError, "Resume with --start 2"):
+            call_command("import_users", path, "--batch-size", "2", stdout=StringIO())
+        self.assertEqual(CustomUser.objects.filter(username__startswith="import").count(), 2)
+
+    def test_value_error_during_import_keeps_resume_hint(self):
+        path = self.write(user_rows(2))
+        with mock.patch.object(UserImporter, "write", side_effect=ValueError("kaputt")), \
+                self.assertRaisesMessage(CommandError, "Resume with --start 0"):
+            call_command("import_users", path, stdout=StringIO())
+
+    def test_invalid_json_file(self):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        handle.write("[{")
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        with self.assertRaisesMessage(CommandError, "Invalid JSON input"):
+            call_command("import_users", handle.name, stdout=StringIO())
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, USER_IMPORT_WORKERS=1)
+class UserImportEndpointTests(APITestCase):
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(username="admin", password="secret")
+        self.url = reverse("user-import")
+
+    def test_admin_only(self):
+        customer = CustomUser.objects.create_user(username="customer", password="secret")
+        self.client.force_authenticate(user=customer)
+        response = self.client.post(self.url, user_rows(1), format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_json_and_ndjson(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(self.url, user_rows(2), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["created"], response.data["exists"]), (2, 0))
+        self.assertNotIn("password", response.data["results"][0])
+
+        body = "\n".join(json.dumps(row) for row in user_rows(3) + [{"username": "x"}])
+        response = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            (response.data["created"], response.data["exists"], response.data["failed"]), (1, 2, 1)
+        )
+
+    @override_settings(USER_IMPORT_WORKERS=4, USER_IMPORT_REQUEST_WORKERS=2)
+    def test_hashes_in_thread_pool_not_processes(self):
+        self.client.force_authenticate(user=self.admin)
+        with mock.patch("authentication.importers.ProcessPoolExecutor") as process_pool:
+            response = self.client.post(self.url, user_rows(3), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        process_pool.assert_not_called()
+        self.assertTrue(CustomUser.objects.get(username="import2").check_password("secret2"))
+        # Pool bleibt für den nächsten Request bestehen
+        self.assertIs(importers.get_request_executor(), importers.get_request_executor())
+
+    def test_object_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(self.url, {"username": "x"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -2,6 +2,9 @@
 ASGI config for marketplace project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Unless ``ASYNC_AUTH_VIEWS`` is False, requests are resolved against
+core.asgi_urls, which serves login and registration with the async views
+(password hashing in a bounded pool, see authentication.hashing).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -9,8 +12,26 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+
+class AsyncAuthASGIHandler(ASGIHandler):
+    urlconf = 'core.asgi_urls'
+
+    async def get_response_async(self, request):
+        if getattr(settings, 'ASYNC_AUTH_VIEWS', True):
+            request.urlconf = self.urlconf
+        return await super().get_response_async(request)
+
+
+def get_asgi_application():
+    # wie django.core.asgi.get_asgi_application, nur mit eigenem Handler
+    django.setup(set_prefix=False)
+    return AsyncAuthASGIHandler()
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'marketplace.settings')
 
 application = get_asgi_application()
@@ -0,0 +1,13 @@
+"""
+URLconf for requests served by core.asgi: login and registration go to the
+async views in authentication.api.async_views, everything else as in
+core.urls (checked in order, so the async routes win).
+"""
+from django.urls import include, path
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path('api/', include('authentication.api.async_urls')),
+    *wsgi_urlpatterns,
+]
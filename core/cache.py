@@ -0,0 +1,27 @@
+"""
+Helpers for caches that must be shared by all workers.
+
+Generation counters, tombstones and hit/miss counters only work if every
+worker reads and writes the same cache; LocMemCache keeps one copy per
+process, DummyCache none at all.
+"""
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared(backend):
+    return not isinstance(backend, (LocMemCache, DummyCache))
+
+
+def check_shared_cache(app_configs=None, **kwargs):
+    # registriert in MarketConfig.ready()
+    if is_shared(caches["default"]):
+        return []
+    return [checks.Warning(
+        "The default cache is not shared between worker processes.",
+        hint="Set REDIS_URL (or configure another shared backend in CACHES); until then the "
+             "offer list cache is disabled and token lookups use only the in-process LRU.",
+        id="core.W001",
+    )]
@@ -0,0 +1,75 @@
+"""
+Conditional GET (ETag / Last-Modified) for DRF list and retrieve actions.
+
+Validators come from one cheap query (max updated_at + row count for lists,
+the row's updated_at for single objects). If the client's If-None-Match /
+If-Modified-Since still match, a 304 is returned before anything is
+serialized.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Validators are tuples whose first item is the Last-Modified datetime;
+    all items feed the ETag. Returning None skips the precheck.
+    """
+    last_modified_field = "updated_at"
+    conditional_actions = ("list", "retrieve")
+
+    def list(self, request, *args, **kwargs):
+        if "list" not in self.conditional_actions:
+            return super().list(request, *args, **kwargs)
+        return self.conditional(super().list, self.get_list_validators, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if "retrieve" not in self.conditional_actions:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional(super().retrieve, self.get_object_validators, request, *args, **kwargs)
+
+    def get_validator_queryset(self):
+        return self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None).order_by()
+
+    def get_list_validators(self):
+        result = self.get_validator_queryset().aggregate(
+            last_modified=Max(self.last_modified_field), count=Count("pk")
+        )
+        return result["last_modified"], result["count"]
+
+    def get_object_validators(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            self.get_validator_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list(self.last_modified_field, "pk")
+            .first()
+        )
+
+    def conditional(self, handler, get_validators, request, *args, **kwargs):
+        validators = get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        last_modified = validators[0]
+        # Dieselben Zeilen können je nach Query-String/Renderer anders aussehen
+        source = "|".join(
+            [request.get_full_path(), request.accepted_renderer.format]
+            + [v.isoformat() if hasattr(v, "isoformat") else str(v) for v in validators]
+        )
+        etag = quote_etag(hashlib.md5(source.encode("utf-8")).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
@@ -0,0 +1,108 @@
+"""
+Read-only fast path for hot list endpoints.
+
+A ``ValuesSerializer`` mirrors the output of an existing DRF serializer but
+works on ``.values()`` rows instead of model instances. Per-field converters
+are looked up once per request: plain columns whose DRF representation is
+the value itself are copied as-is, everything else is converted with the
+original DRF field's own ``to_representation`` (so datetimes, decimals etc.
+come out byte-identical), and computed fields are implemented by
+``represent_<field>(row)`` methods. ``prepare(rows)`` can batch-load data
+for a whole page (e.g. nested ids) with one query.
+"""
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# DRF fields whose to_representation() returns the loaded column unchanged
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.JSONField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class ValuesSerializer:
+    serializer_class = None
+    # output field -> .values() columns it needs (default: the field's source)
+    columns = {}
+
+    def __init__(self, context=None, fields=None):
+        self.context = context or {}
+        self.request = self.context.get("request")
+        serializer = self.serializer_class(context=self.context)
+        self.converters = []
+        self.field_names = set()
+        value_columns = {"id"}
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            self.field_names.add(name)
+            custom = getattr(self, f"represent_{name}", None)
+            if custom is not None:
+                self.converters.append((name, None, custom))
+                value_columns.update(self.columns.get(name, []))
+                continue
+            source = field.source
+            value_columns.update(self.columns.get(name, [source]))
+            converter = None if isinstance(field, IDENTITY_FIELDS) else field.to_representation
+            self.converters.append((name, source, converter))
+        self.value_columns = sorted(value_columns)
+
+    def values(self, queryset, extra_columns=()):
+        columns = sorted(set(self.value_columns).union(extra_columns))
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    def prepare(self, rows):
+        """Hook for batch loading per page."""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        converters = self.converters
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, convert in converters:
+                if source is None:
+                    item[name] = convert(row)
+                    continue
+                value = row[source]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+class FastListMixin:
+    """
+    Serves ``list`` through ``fast_serializer_class`` when
+    ``settings.FAST_LIST_SERIALIZATION`` is on (default).
+    """
+    fast_serializer_class = None
+
+    def get_fast_serializer(self):
+        if self.fast_serializer_class is None or not getattr(settings, "FAST_LIST_SERIALIZATION", True):
+            return None
+        requested = self.get_requested_fields() if hasattr(self, "get_requested_fields") else None
+        if requested is not None:
+            # gleiche Prüfung wie der DRF-Pfad (SparseFieldsetMixin.get_serializer)
+            self.get_serializer()
+        return self.fast_serializer_class(context=self.get_serializer_context(), fields=requested)
+
+    def list(self, request, *args, **kwargs):
+        fast = self.get_fast_serializer()
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+
+        # Keyset-Pagination braucht die Sortierspalte für den Cursor
+        get_ordering_fields = getattr(self.paginator, "get_ordering_fields", None)
+        queryset = fast.values(
+            self.filter_queryset(self.get_queryset()),
+            extra_columns=get_ordering_fields() if get_ordering_fields else (),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(queryset))
@@ -0,0 +1,71 @@
+"""
+Sparse fieldsets (``?fields=a,b``) for list endpoints.
+
+The serializer output is trimmed to the requested fields and, where every
+requested field maps to known columns, the queryset is narrowed with
+``.only()`` so unused columns (e.g. long descriptions) are never loaded.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    fields_query_param = "fields"
+    sparse_actions = ("list",)
+    # serializer field -> model columns it reads; fields not listed here fall
+    # back to their ``source`` if that is a concrete model field
+    sparse_field_columns = {}
+
+    def get_requested_fields(self):
+        if getattr(self, "action", "list") not in self.sparse_actions or self.request is None:
+            return None
+        raw = self.request.query_params.get(self.fields_query_param)
+        if not raw:
+            return None
+        return [name.strip() for name in raw.split(",") if name.strip()]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested is not None:
+            fields = serializer.child.fields if hasattr(serializer, "child") else serializer.fields
+            readable = [name for name, field in fields.items() if not field.write_only]
+            unknown = set(requested) - set(readable)
+            if unknown:
+                raise ValidationError({
+                    self.fields_query_param: [f"Unbekannte Felder: {', '.join(sorted(unknown))}."]
+                })
+            for name in readable:
+                if name not in requested:
+                    fields.pop(name)
+        return serializer
+
+    def get_sparse_columns(self, requested):
+        """Columns needed for ``requested``, or None if any field can't be mapped."""
+        model = self.get_queryset().model
+        serializer_fields = self.get_serializer_class()().fields
+        columns = {model._meta.pk.name}
+        for name in requested:
+            if name in self.sparse_field_columns:
+                columns.update(self.sparse_field_columns[name])
+                continue
+            field = serializer_fields.get(name)
+            # SerializerMethodField & Co. haben source "*"
+            source = field.source if field is not None and field.source != "*" else name
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete:
+                return None
+            columns.add(source)
+        return columns
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        requested = self.get_requested_fields()
+        if requested:
+            columns = self.get_sparse_columns(requested)
+            if columns is not None:
+                queryset = queryset.only(*columns)
+        return queryset
@@ -0,0 +1,183 @@
+"""
+Background generation of downscaled / WebP variants for uploaded images.
+
+Rendering runs in a process pool so requests never pay for Pillow. The pool
+only returns file names; the parent process records them in the model's
+``<field>_variants`` JSONField with a queryset update guarded on the
+original file name, so a newer upload is never overwritten by a stale job.
+
+Variants are written next to the original, which requires a storage with
+local paths (FileSystemStorage). Their names keep the original's extension
+(logo.png -> logo_png_thumbnail.jpg), so logo.png and logo.jpg in the same
+folder do not share variant files. Files of replaced variants are deleted
+once the new ones are recorded. Recording sets the model's
+``variants_updated_at``, not ``updated_at``.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_UPDATED_FIELD = "variants_updated_at"
+
+# name -> (max width/height, Pillow format, file extension)
+DEFAULT_VARIANTS = {
+    "thumbnail": ((320, 320), "JPEG", "jpg"),
+    "thumbnail_webp": ((320, 320), "WEBP", "webp"),
+    "webp": ((1600, 1600), "WEBP", "webp"),
+}
+
+_executor = None
+# (model, field name) -> callback(pk) run after variants have been recorded
+_listeners = {}
+
+
+def get_variant_specs():
+    return getattr(settings, "IMAGE_VARIANTS", DEFAULT_VARIANTS)
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=getattr(settings, "IMAGE_PROCESSING_WORKERS", 2))
+    return _executor
+
+
+def render_variants(source_path, specs):
+    """
+    Runs in the worker process. Returns {variant: path} for the files written
+    next to ``source_path``.
+    """
+    from PIL import Image, ImageOps
+
+    stem, source_ext = os.path.splitext(source_path)
+    if source_ext:
+        stem = f"{stem}_{source_ext[1:].lower()}"
+    written = {}
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original)
+        for name, (size, fmt, ext) in specs.items():
+            variant = image.copy()
+            variant.thumbnail(size)
+            if fmt == "JPEG" and variant.mode not in ("RGB", "L"):
+                variant = variant.convert("RGB")
+            target = f"{stem}_{name}.{ext}"
+            variant.save(target, fmt, quality=82, optimize=True)
+            written[name] = target
+    return written
+
+
+def on_variants_recorded(model, field_name, callback):
+    _listeners[(model, field_name)] = callback
+
+
+def variants_field_name(field_name):
+    return f"{field_name}_variants"
+
+
+def variant_names(variants):
+    return {path for name, path in (variants or {}).items() if name != "source"}
+
+
+def delete_variant_files(model, field_name, names):
+    storage = model._meta.get_field(field_name).storage
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.warning("Could not delete image variant %s", name)
+
+
+def needs_processing(instance, field_name):
+    file = getattr(instance, field_name)
+    variants = getattr(instance, variants_field_name(field_name)) or {}
+    if not file:
+        return bool(variants)
+    return variants.get("source") != file.name
+
+
+def schedule(instance, field_name):
+    """Queue variant rendering once the current transaction has committed."""
+    model = type(instance)
+    pk = instance.pk
+    file = getattr(instance, field_name)
+    if not file:
+        previous = variant_names(getattr(instance, variants_field_name(field_name)))
+        model._default_manager.filter(pk=pk).update(
+            **{variants_field_name(field_name): {}, VARIANTS_UPDATED_FIELD: timezone.now()}
+        )
+        transaction.on_commit(lambda: delete_variant_files(model, field_name, previous))
+        return
+    source_name = file.name
+    source_path = file.path
+
+    def submit():
+        future = get_executor().submit(render_variants, source_path, get_variant_specs())
+        future.add_done_callback(
+            lambda f: _store(f, model, pk, field_name, source_name, source_path)
+        )
+
+    transaction.on_commit(submit)
+
+
+def process_now(instance, field_name):
+    """Render and record the variants in the current process, bypassing the pool."""
+    file = getattr(instance, field_name)
+    paths = render_variants(file.path, get_variant_specs())
+    return record_variants(type(instance), instance.pk, field_name, file.name, file.path, paths)
+
+
+def _store(future, model, pk, field_name, source_name, source_path):
+    # Runs in the executor's callback thread of the parent process
+    try:
+        record_variants(model, pk, field_name, source_name, source_path, future.result())
+    except Exception:
+        logger.exception("Image variants for %s %s failed", model.__name__, pk)
+    finally:
+        close_old_connections()
+
+
+def record_variants(model, pk, field_name, source_name, source_path, paths):
+    base_dir = os.path.dirname(source_path)
+    name_dir = os.path.dirname(source_name)
+    variants = {"source": source_name}
+    for name, path in paths.items():
+        variants[name] = os.path.join(name_dir, os.path.relpath(path, base_dir)).replace(os.sep, "/")
+    rows = model._default_manager.filter(pk=pk)
+    previous = rows.values_list(variants_field_name(field_name), flat=True).first()
+    updated = rows.filter(**{field_name: source_name}).update(
+        **{variants_field_name(field_name): variants, VARIANTS_UPDATED_FIELD: timezone.now()}
+    )
+    if updated:
+        # Varianten des vorherigen Bildes (oder alter Namensschemata) aufräumen
+        delete_variant_files(model, field_name, variant_names(previous) - variant_names(variants))
+    else:
+        # inzwischen neues Bild hochgeladen: eben gerenderte Dateien verwerfen
+        delete_variant_files(model, field_name, variant_names(variants) - variant_names(previous))
+    listener = _listeners.get((model, field_name))
+    if updated and listener is not None:
+        listener(pk)
+    return updated
+
+
+def variant_url(file, variants, name, request=None):
+    """URL of the requested variant, falling back to the original file."""
+    if not file:
+        return None
+    variant_name = (variants or {}).get(name) if (variants or {}).get("source") == file.name else None
+    url = file.storage.url(variant_name) if variant_name else file.url
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def variant_urls(file, variants, request=None):
+    if not file or not variants or variants.get("source") != file.name:
+        return {}
+    return {
+        name: variant_url(file, variants, name, request)
+        for name in variants if name != "source"
+    }
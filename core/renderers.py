@@ -0,0 +1,102 @@
+"""
+Optional orjson-backed JSON renderer and parser.
+
+Enabled through ``REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"]`` /
+``["DEFAULT_PARSER_CLASSES"]``. orjson writes UTF-8 bytes directly and
+handles dicts, lists, datetimes and UUIDs in C; ``Decimal`` and lazy
+translation strings go through a small ``default`` hook with the same
+results as DRF's encoder. Without orjson installed, or for anything orjson
+can't represent the way DRF would (indented output, integers beyond 64
+bit, floats in exponent notation, non-UTF-8 request bodies), both classes
+fall back to the stock DRF implementation, so the output stays
+byte-compatible with ``JSONRenderer``. orjson writes NaN and Infinity as
+``null``; such data goes through the fallback as well, which raises
+ValueError like ``JSONRenderer`` (``strict``).
+"""
+import io
+import math
+import re
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework import renderers
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_drf_default = encoders.JSONEncoder().default
+# orjson liest Ganzzahlen jenseits von 64 Bit als float
+_LONG_NUMBER = re.compile(rb'\d{20}')
+# Exponentenschreibweise weicht von repr(float) ab (1e16 statt 1e+16)
+_EXPONENT = re.compile(rb'\de-?\d')
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        if not obj.is_finite():
+            raise ValueError("Out of range float values are not JSON compliant")
+        return float(obj)
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    return _drf_default(obj)
+
+
+def _has_non_finite(data):
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(value) for value in data)
+    return False
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or not self.compact
+            or self.ensure_ascii
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=self.options)
+        except (orjson.JSONEncodeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # NaN/Infinity kommen als null an; nur dann lohnt die Suche
+        if _EXPONENT.search(ret) or (b'null' in ret and _has_non_finite(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+        # wie JSONRenderer: U+2028/U+2029 für JavaScript escapen
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower() not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read() if stream is not None else b''
+        if not _LONG_NUMBER.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        # Fehlermeldung und Sonderfälle (z.B. sehr große Zahlen) wie JSONParser
+        return super().parse(io.BytesIO(body), media_type, parser_context)
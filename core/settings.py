@@ -10,6 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import atexit
+import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -85,6 +90,45 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Offer-Liste und Token-Auth brauchen einen Cache, den alle Worker teilen:
+# REDIS_URL setzen (braucht das Paket redis). Ohne REDIS_URL LocMem pro
+# Prozess; dann ist der Listen-Cache aus und die Token-Auth nutzt nur den
+# LRU (Warnung core.W001). Tests nutzen einen Datei-Cache in einem frischen
+# Temp-Verzeichnis, damit der geteilte Pfad ohne Redis läuft.
+TESTING = 'pytest' in sys.modules or sys.argv[1:2] == ['test']
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tempfile.mkdtemp(prefix='coderr-cache-'),
+        }
+    }
+    atexit.register(shutil.rmtree, CACHES['default']['LOCATION'], ignore_errors=True)
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# ModelBackend; im async Login (core.asgi) wird im Pool gehasht
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.PooledHashingBackend',
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -130,12 +174,23 @@ AUTH_USER_MODEL = 'users.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # TokenAuthentication mit Cache, siehe authentication.cache
+        'authentication.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # orjson-basiert, fällt ohne orjson auf JSONRenderer/JSONParser zurück
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
@@ -0,0 +1,164 @@
+import base64
+import json
+from operator import attrgetter
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorPaginationMixin:
+    """
+    ``?pagination=cursor`` switches a view from its ``pagination_class`` to
+    ``cursor_pagination_class``. Views with ``pagination_class = None`` keep
+    answering with a plain array unless the cursor is requested.
+    """
+    cursor_pagination_class = None
+    pagination_query_param = "pagination"
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            mode = self.request.query_params.get(self.pagination_query_param) if self.request is not None else None
+            if mode == "cursor" and self.cursor_pagination_class is not None:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class is not None else None
+        return self._paginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on the composite key (ordering_field, pk).
+
+    Every page is a range scan starting right after the last row of the
+    previous page, so deep pages cost the same as the first one and no
+    COUNT(*) is issued. Needs an index on (ordering_field, id).
+    ``ordering_fields`` can allow further ``?ordering=`` keys; the default
+    key is always ``ordering_field``.
+    """
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    ordering_field = "updated_at"
+    ordering_fields = None
+    default_descending = True
+    invalid_cursor_message = "Ungültiger Cursor."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering, self.descending = self.get_ordering(request)
+        self.field = queryset.model._meta.get_field(ordering)
+
+        prefix = "-" if self.descending else ""
+        op = "lt" if self.descending else "gt"
+        cursor = self.decode_cursor(request)
+        if self.field.primary_key:
+            # Schlüssel ist schon eindeutig, einfacher Range-Scan
+            queryset = queryset.order_by(f"{prefix}pk")
+            if cursor is not None:
+                queryset = queryset.filter(**{f"pk__{op}": cursor[1]})
+        else:
+            queryset = queryset.order_by(f"{prefix}{ordering}", f"{prefix}pk")
+            if cursor is not None:
+                value, pk = cursor
+                queryset = queryset.filter(
+                    Q(**{f"{ordering}__{op}": value})
+                    | Q(**{ordering: value, f"pk__{op}": pk})
+                )
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """One page across several querysets sharing the key (e.g. live and archived orders)."""
+        rows = []
+        has_next = False
+        for queryset in querysets:
+            rows.extend(self.paginate_queryset(queryset, request, view))
+            has_next = has_next or self.has_next
+        rows.sort(key=attrgetter(self.field.attname, "pk"), reverse=self.descending)
+        self.has_next = has_next or len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering_fields(self):
+        return self.ordering_fields or (self.ordering_field,)
+
+    def get_ordering(self, request):
+        """(field, descending) from ``?ordering=``, falling back to ordering_field."""
+        ordering = request.query_params.get(self.ordering_query_param, "")
+        name = ordering.lstrip("-")
+        if name in self.get_ordering_fields():
+            return name, ordering.startswith("-")
+        return self.ordering_field, self.default_descending
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        if isinstance(last, dict):
+            # .values()-Zeilen (FastListMixin)
+            last = self.field.model(**{"id": last["id"], self.field.attname: last[self.field.attname]})
+        cursor = self.encode_cursor(self.field.value_to_string(last), last.pk)
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, value, pk):
+        raw = json.dumps([value, pk]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            return self.field.to_python(value), int(pk)
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+
+class OfferKeysetPagination(KeysetPagination):
+    ordering_field = "updated_at"
+
+
+class OrderKeysetPagination(KeysetPagination):
+    ordering_field = "created_at"
+
+
+class ReviewKeysetPagination(KeysetPagination):
+    ordering_field = "updated_at"
+    ordering_fields = ("updated_at", "rating")
@@ -0,0 +1,14 @@
+from rest_framework.parsers import BaseParser
+
+from ..importers import iter_ndjson
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline delimited JSON, one object per line. Lines are decoded lazily
+    so a large import body is never held as a parsed list.
+    """
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return iter_ndjson(stream)
@@ -1,7 +1,10 @@
 from rest_framework import serializers
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from core import images
+from core.fastserializers import ValuesSerializer
 from users.models import CustomUser # Corrected import path for CustomUser
-from ..models import Offer, OfferDetail, Order, Review # Existing imports
+from ..models import Offer, OfferDetail, Order, Review, min_detail_values # Existing imports
 
 
 class OfferDetailLinkSerializer(serializers.ModelSerializer):
@@ -59,12 +62,10 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
     def get_min_price(self, obj):
-        min_price_value = obj.details.aggregate(models.Min("price"))["price__min"]
-        return int(min_price_value) if min_price_value is not None else 0
+        return int(obj.min_price or 0)
 
     def get_min_delivery_time(self, obj):
-        min_delivery_time_value = obj.details.aggregate(models.Min("delivery_time_in_days"))["delivery_time_in_days__min"]
-        return int(min_delivery_time_value) if min_delivery_time_value is not None else 0
+        return int(obj.min_delivery_time or 0)
 
 
 class OfferListSerializer(serializers.ModelSerializer):
@@ -73,11 +74,13 @@ class OfferListSerializer(serializers.ModelSerializer):
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
     user_details = serializers.SerializerMethodField()
+    image = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
         fields = [
-            "id", "user", "title", "image", "description",
+            "id", "user", "title", "image", "image_variants", "description",
             "created_at", "updated_at",
             "details",
             "min_price", "min_delivery_time", "user_details"
@@ -85,12 +88,10 @@ class OfferListSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
     def get_min_price(self, obj):
-        min_price_value = obj.details.aggregate(models.Min("price"))["price__min"]
-        return int(min_price_value) if min_price_value is not None else 0
+        return int(obj.min_price or 0)
 
     def get_min_delivery_time(self, obj):
-        min_delivery_time_value = obj.details.aggregate(models.Min("delivery_time_in_days"))["delivery_time_in_days__min"]
-        return int(min_delivery_time_value) if min_delivery_time_value is not None else 0
+        return int(obj.min_delivery_time or 0)
 
     def get_user_details(self, obj):
         return {
@@ -99,6 +100,70 @@ class OfferListSerializer(serializers.ModelSerializer):
             "username": obj.user.username
         }
 
+    def get_image(self, obj):
+        # In der Liste das Thumbnail, solange es noch nicht erzeugt ist das Original
+        return images.variant_url(obj.image, obj.image_variants, "thumbnail", self.context.get("request"))
+
+    def get_image_variants(self, obj):
+        return images.variant_urls(obj.image, obj.image_variants, self.context.get("request"))
+
+
+class OfferListValuesSerializer(ValuesSerializer):
+    """Fast path for the offer list, output identical to OfferListSerializer."""
+    serializer_class = OfferListSerializer
+    columns = {
+        "image": ["image", "image_variants"],
+        "image_variants": ["image", "image_variants"],
+        "details": [],
+        "min_price": ["min_price"],
+        "min_delivery_time": ["min_delivery_time"],
+        "user_details": ["user__first_name", "user__last_name", "user__username"],
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        image_field = Offer._meta.get_field("image")
+        self.image_file = lambda name: image_field.attr_class(None, image_field, name)
+        detail_path = "/api/offerdetails/"
+        self.detail_prefix = self.request.build_absolute_uri(detail_path) if self.request else detail_path
+
+    def prepare(self, rows):
+        self.detail_ids = {}
+        if "details" not in self.field_names or not rows:
+            return
+        details = (
+            OfferDetail.objects.filter(offer_id__in=[row["id"] for row in rows])
+            .order_by("id").values_list("offer_id", "id")
+        )
+        for offer_id, detail_id in details:
+            self.detail_ids.setdefault(offer_id, []).append(detail_id)
+
+    def represent_details(self, row):
+        prefix = self.detail_prefix
+        return [
+            {"id": detail_id, "url": f"{prefix}{detail_id}/"}
+            for detail_id in self.detail_ids.get(row["id"], ())
+        ]
+
+    def represent_min_price(self, row):
+        return int(row["min_price"] or 0)
+
+    def represent_min_delivery_time(self, row):
+        return int(row["min_delivery_time"] or 0)
+
+    def represent_user_details(self, row):
+        return {
+            "first_name": row["user__first_name"] or "",
+            "last_name": row["user__last_name"] or "",
+            "username": row["user__username"],
+        }
+
+    def represent_image(self, row):
+        return images.variant_url(self.image_file(row["image"]), row["image_variants"], "thumbnail", self.request)
+
+    def represent_image_variants(self, row):
+        return images.variant_urls(self.image_file(row["image"]), row["image_variants"], self.request)
+
 
 class OfferSerializer(serializers.ModelSerializer):
     details = OfferDetailSerializer(many=True)
@@ -117,12 +182,10 @@ class OfferSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user", "created_at", "updated_at"]
         
     def get_min_price(self, obj):
-        min_price_value = obj.details.aggregate(models.Min("price"))["price__min"]
-        return int(min_price_value) if min_price_value is not None else 0
+        return int(obj.min_price or 0)
 
     def get_min_delivery_time(self, obj):
-        min_delivery_time_value = obj.details.aggregate(models.Min("delivery_time_in_days"))["delivery_time_in_days__min"]
-        return int(min_delivery_time_value) if min_delivery_time_value is not None else 0
+        return int(obj.min_delivery_time or 0)
 
     def get_user_details(self, obj):
         return {
@@ -145,45 +208,77 @@ class OfferSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         details_data = validated_data.pop("details", [])
-        offer = Offer.objects.create(user=self.context["request"].user, **validated_data)
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+        details = [OfferDetail(**detail_data) for detail_data in details_data]
+        min_price, min_delivery_time = min_detail_values(details)
+
+        with transaction.atomic():
+            offer = Offer.objects.create(
+                user=self.context["request"].user,
+                min_price=min_price,
+                min_delivery_time=min_delivery_time,
+                **validated_data,
+            )
+            for detail in details:
+                detail.offer = offer
+            # bulk_create löst keine Signale aus, min-Werte sind oben schon gesetzt
+            OfferDetail.objects.bulk_create(details)
         return offer
 
     def update(self, instance, validated_data):
         details_data = validated_data.pop("details", None)
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        if details_data is not None:
-            for i, detail_data in enumerate(details_data):
-                offer_type = detail_data.get("offer_type")
-                if not offer_type:
-                    raise serializers.ValidationError({
-                        f"details[{i}]": "Feld 'offer_type' ist erforderlich, um das zugehörige Detail zu finden."
-                    })
-
-                try:
-                    detail_instance = instance.details.get(offer_type=offer_type)
-                except OfferDetail.DoesNotExist:
-                    raise serializers.ValidationError({
-                        f"details[{i}]": f"Kein OfferDetail mit offer_type '{offer_type}' vorhanden."
-                    })
+        with transaction.atomic():
+            if details_data is not None:
+                self._update_details(instance, details_data)
 
-                detail_serializer = OfferDetailSerializer(
-                    detail_instance,
-                    data=detail_data,
-                    context=self.context,
-                    partial=False  # ⬅️ erzwingt vollständige Angabe!
-                )
-                detail_serializer.is_valid(raise_exception=True)
-                detail_serializer.save()
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
 
         return instance
 
-
+    def _update_details(self, instance, details_data):
+        # alle Details mit einer Abfrage laden, Fehler pro Eintrag als details[i] sammeln
+        existing = {detail.offer_type: detail for detail in instance.details.select_for_update()}
+        errors = {}
+        changed = []
+        fields = {"updated_at"}
+
+        for i, detail_data in enumerate(details_data):
+            offer_type = detail_data.get("offer_type")
+            if not offer_type:
+                errors[f"details[{i}]"] = "Feld 'offer_type' ist erforderlich, um das zugehörige Detail zu finden."
+                continue
+
+            detail_instance = existing.get(offer_type)
+            if detail_instance is None:
+                errors[f"details[{i}]"] = f"Kein OfferDetail mit offer_type '{offer_type}' vorhanden."
+                continue
+
+            detail_serializer = OfferDetailSerializer(
+                detail_instance,
+                data=detail_data,
+                context=self.context,
+                partial=False  # ⬅️ erzwingt vollständige Angabe!
+            )
+            if not detail_serializer.is_valid():
+                errors[f"details[{i}]"] = detail_serializer.errors
+                continue
+
+            for attr, value in detail_serializer.validated_data.items():
+                setattr(detail_instance, attr, value)
+                fields.add(attr)
+            changed.append(detail_instance)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        now = timezone.now()
+        for detail in changed:
+            detail.updated_at = now  # bulk_update setzt auto_now nicht
+        if changed:
+            OfferDetail.objects.bulk_update(changed, sorted(fields))
+        instance.min_price, instance.min_delivery_time = min_detail_values(existing.values())
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -203,7 +298,13 @@ class OfferSerializer(serializers.ModelSerializer):
 
 class OrderSerializer(serializers.ModelSerializer):
     offer_detail_id = serializers.IntegerField(write_only=True, required=True)
+    # aus Order.snapshot (OrderSnapshot)
+    title = serializers.CharField(read_only=True)
+    revisions = serializers.IntegerField(read_only=True)
+    delivery_time_in_days = serializers.IntegerField(read_only=True)
     price = serializers.SerializerMethodField()
+    features = serializers.JSONField(read_only=True)
+    offer_type = serializers.CharField(read_only=True)
 
     class Meta:
         model = Order
@@ -271,6 +372,16 @@ class OrderSerializer(serializers.ModelSerializer):
         return order
 
 
+class OrderBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000
+    )
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
@@ -286,4 +397,9 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         user = self.context['request'].user
-        return Review.objects.create(reviewer=user, **validated_data)
\ No newline at end of file
+        return Review.objects.create(reviewer=user, **validated_data)
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Fast path for the review list, output identical to ReviewSerializer."""
+    serializer_class = ReviewSerializer
@@ -1,26 +1,50 @@
+from collections import Counter
+from itertools import chain
+from operator import attrgetter
+
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db import models
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Min
-from django_filters.rest_framework import DjangoFilterBackend, FilterSet, NumberFilter
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Count, Max, Prefetch
+from django_filters.rest_framework import ChoiceFilter, DateTimeFilter, DjangoFilterBackend, FilterSet, NumberFilter
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.core.exceptions import ValidationError
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError as DRFValidationError
 from django.shortcuts import get_object_or_404
 
-from users.models import CustomUser
-from ..models import OfferDetail, Offer, Order, Review
+from core.conditional import ConditionalGetMixin
+from core.fastserializers import FastListMixin
+from core.fieldsets import SparseFieldsetMixin
+from core.renderers import FastJSONParser
+from .. import cache as offer_list_cache
+from .. import exports
+from .. import stats as platform_stats
+from ..importers import OfferImporter
+from ..search import get_search_backend
+from ..models import ArchivedOrder, BusinessOrderCounter, OfferDetail, Offer, Order, OrderSnapshot, Review
 from .serializers import (
     OfferDetailSerializer,
     OfferSerializer,
     OfferListSerializer,
+    OfferListValuesSerializer,
     OfferRetrieveSerializer,
+    OrderBulkStatusSerializer,
     OrderSerializer,
     ReviewSerializer,
+    ReviewValuesSerializer,
+)
+from .pagination import (
+    CursorPaginationMixin,
+    OfferKeysetPagination,
+    OrderKeysetPagination,
+    ReviewKeysetPagination,
 )
+from .parsers import NDJSONParser
 from .permissions import (
     IsBusinessUser,
     IsAuthenticatedCustomer,
@@ -30,10 +54,10 @@ from .permissions import (
 )
 
 class OfferFilter(FilterSet):
-    min_price = NumberFilter(field_name="min_price_agg", lookup_expr="gte")
-    max_price = NumberFilter(field_name="min_price_agg", lookup_expr="lte")
-    min_delivery_time = NumberFilter(field_name="details__delivery_time_in_days", lookup_expr="gte")
-    max_delivery_time = NumberFilter(field_name="details__delivery_time_in_days", lookup_expr="lte")
+    min_price = NumberFilter(field_name="min_price", lookup_expr="gte")
+    max_price = NumberFilter(field_name="min_price", lookup_expr="lte")
+    min_delivery_time = NumberFilter(field_name="min_delivery_time", lookup_expr="gte")
+    max_delivery_time = NumberFilter(field_name="min_delivery_time", lookup_expr="lte")
 
     class Meta:
         model = Offer
@@ -63,7 +87,37 @@ class OfferFilter(FilterSet):
             raise ValidationError(errors)
 
         return super().qs
-        
+
+
+class OrderFilter(FilterSet):
+    status = ChoiceFilter(choices=Order.STATUS_CHOICES)
+    created_after = DateTimeFilter(field_name="created_at", lookup_expr="gte")
+    created_before = DateTimeFilter(field_name="created_at", lookup_expr="lt")
+
+    class Meta:
+        model = Order
+        fields = ['status', 'created_after', 'created_before']
+
+
+class OfferSearchFilter(SearchFilter):
+    """
+    ?search= über den Volltext-Index (market.search) statt icontains-Scans,
+    Treffer sind nach Relevanz sortiert solange kein ?ordering= gesetzt ist.
+    """
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return get_search_backend(queryset.db).search(queryset, terms)
+
+
+def get_export_format(request):
+    # "format" ist in DRF für die Content-Negotiation reserviert
+    file_format = request.query_params.get('file_format', 'ndjson')
+    if file_format not in exports.FORMATS:
+        raise DRFValidationError({"file_format": f"Zulässig sind: {', '.join(exports.FORMATS)}."})
+    return file_format
+
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
@@ -71,13 +125,24 @@ class StandardResultsSetPagination(PageNumberPagination):
 
 User = get_user_model()
 
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(CursorPaginationMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Offer.objects.all()
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter, OrderingFilter]
     filterset_class = OfferFilter
     pagination_class = StandardResultsSetPagination
+    # opt-in per ?pagination=cursor, Schlüssel (updated_at, id)
+    cursor_pagination_class = OfferKeysetPagination
+    fast_serializer_class = OfferListValuesSerializer
     search_fields = ['title', 'description']
     ordering_fields = ['updated_at']
+    # Liste wird über market.cache gecacht
+    conditional_actions = ('retrieve',)
+    sparse_field_columns = {
+        'details': [],
+        'user_details': ['user__first_name', 'user__last_name', 'user__username'],
+        'image': ['image', 'image_variants'],
+        'image_variants': ['image', 'image_variants'],
+    }
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -89,60 +154,169 @@ class OfferViewSet(viewsets.ModelViewSet):
     def get_permissions(self):
         if self.action == 'list':
             return [permissions.AllowAny()]
+        elif self.action == 'cache_stats':
+            return [permissions.IsAdminUser()]
         elif self.action == 'retrieve':
             return [permissions.IsAuthenticated()]
         elif self.action == 'create':
             return [IsBusinessUser()]
+        elif self.action == 'bulk':
+            return [IsAuthenticatedBusiness()]
+        elif self.action == 'export':
+            return [permissions.IsAuthenticated()]
         elif self.action in ['update', 'partial_update', 'destroy']:
             return [IsBusinessUser(), IsOfferOwner()]
         return super().get_permissions()
 
     def get_queryset(self):
-        qs = Offer.objects.annotate(
-            min_price_agg=Min("details__price")
-        ).distinct()
-
-        # manuell über query params filtern
-        min_price = self.request.query_params.get("min_price")
-        if min_price is not None:
-            qs = qs.filter(min_price_agg__gte=min_price)
-
+        # min_price / min_delivery_time sind denormalisierte Spalten,
+        # OfferFilter filtert direkt darauf (kein JOIN, kein distinct nötig)
+        qs = Offer.objects.all()
+        # bei ?fields= nur laden, was ausgegeben wird
+        requested = self.get_requested_fields()
+        if self.action in ('list', 'retrieve') and (requested is None or 'details' in requested):
+            # Links brauchen nur die IDs der Details
+            detail_links = OfferDetail.objects.only('id', 'offer_id').order_by('id')
+            qs = qs.prefetch_related(Prefetch('details', queryset=detail_links))
+        if self.action in ('list', 'update', 'partial_update') and (requested is None or 'user_details' in requested):
+            # user_details bzw. IsOfferOwner lesen obj.user
+            qs = qs.select_related('user')
         return qs
     
+    def get_object_validators(self):
+        # min_price/min_delivery_time und die Detail-Links hängen an den Details,
+        # die Bild-URLs an variants_updated_at
+        row = (
+            Offer.objects.filter(pk=self.kwargs['pk'])
+            .annotate(details_updated_at=Max('details__updated_at'), details_count=Count('details'))
+            .values_list('updated_at', 'details_updated_at', 'details_count', 'variants_updated_at')
+            .first()
+        )
+        if row is None:
+            return None
+        updated_at, details_updated_at, details_count, variants_updated_at = row
+        last_modified = max(filter(None, [updated_at, details_updated_at, variants_updated_at]))
+        return last_modified, details_count, variants_updated_at
+
+    def list(self, request, *args, **kwargs):
+        # Nur anonyme Aufrufe cachen, Invalidierung über Generationszähler
+        if request.user.is_authenticated or not offer_list_cache.is_enabled():
+            return super().list(request, *args, **kwargs)
+        key, data = offer_list_cache.lookup(request)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            offer_list_cache.store(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request):
+        return Response(offer_list_cache.stats())
+
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[FastJSONParser, NDJSONParser])
+    def bulk(self, request):
+        rows = request.data
+        if isinstance(rows, dict):
+            return Response(
+                {"detail": "Erwartet ein JSON-Array oder NDJSON."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        importer = OfferImporter(request.user, context=self.get_serializer_context())
+        results = list(importer.import_rows(rows))
+        created = sum(1 for result in results if result["status"] == "created")
+        failed = len(results) - created
+
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"created": created, "failed": failed, "results": results}, status=response_status)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        file_format = get_export_format(request)
+        queryset = self.filter_queryset(Offer.objects.all())
+        if not queryset.ordered:
+            queryset = queryset.order_by('id')
+        return exports.offers_response(queryset, file_format)
+
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
-        updated_instance = self.get_object()
-        full_serializer = OfferSerializer(updated_instance, context=self.get_serializer_context())  # ✅ korrekt
+        # Details können sich geändert haben -> Prefetch-Cache verwerfen statt neu zu laden
+        instance._prefetched_objects_cache = {}
+        full_serializer = OfferSerializer(instance, context=self.get_serializer_context())
         return Response(full_serializer.data, status=status.HTTP_200_OK)
 
 
-class OfferDetailViewSet(viewsets.ReadOnlyModelViewSet):
+class OfferDetailViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_actions = ('retrieve',)
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(CursorPaginationMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = OrderFilter
+    # Standard bleibt das flache Array, ?pagination=cursor mit Schlüssel (created_at, id)
     pagination_class = None
+    cursor_pagination_class = OrderKeysetPagination
+    sparse_field_columns = {
+        name: [f'snapshot__{name}'] for name in OrderSnapshot.FIELDS
+    }
 
     def get_permissions(self):
         if self.action == "create":
             return [IsAuthenticatedCustomer()]
-        elif self.action in ["partial_update"]:
+        elif self.action in ["partial_update", "bulk_status"]:
             return [IsAuthenticatedBusiness()]
         elif self.action == "destroy":
             return [permissions.IsAdminUser()]
         return [permissions.IsAuthenticated()]
 
     def get_queryset(self):
-        user = self.request.user
-        return Order.objects.filter(
-            models.Q(customer_user=user) | models.Q(business_user=user)
-        )
+        queryset = Order.objects.visible_to(self.request.user).select_related('snapshot')
+        if self.action in ('update', 'partial_update', 'destroy'):
+            # Zeile bis zum Commit sperren: parallele PATCHes lesen sonst denselben
+            # alten Status und buchen das Zähler-Delta doppelt (market.signals)
+            queryset = queryset.select_for_update(of=('self',))
+        return queryset
+
+    def filter_queryset(self, queryset):
+        if self.action != 'list':
+            return super().filter_queryset(queryset)
+        # status/Zeitraum in beiden Hälften der Union filtern, damit jede
+        # Seite den (user, status, created_at)-Index komplett nutzen kann
+        queryset = Order.objects.select_related('snapshot')
+        return super().filter_queryset(queryset).visible_to(self.request.user)
+
+    def wants_history(self):
+        return self.request.query_params.get('history', '').lower() in ('1', 'true', 'yes')
+
+    def get_archive_queryset(self):
+        # gleiche Filter und Sichtbarkeit wie für die laufenden Bestellungen
+        queryset = ArchivedOrder.objects.select_related('snapshot')
+        queryset = OrderFilter(self.request.query_params, queryset=queryset, request=self.request).qs
+        return queryset.visible_to(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        if not self.wants_history():
+            return super().list(request, *args, **kwargs)
+        # ?history=true: zusätzlich das Archiv (market.archive)
+        queryset = self.filter_queryset(self.get_queryset())
+        archived = self.get_archive_queryset()
+        if self.paginator is not None:
+            page = self.paginator.paginate_querysets([queryset, archived], request, view=self)
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        orders = sorted(chain(queryset, archived), key=attrgetter('pk'))
+        return Response(self.get_serializer(orders, many=True).data)
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -151,35 +325,87 @@ class OrderViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    # Order und BusinessOrderCounter (market.signals) in einer Transaktion
+    @transaction.atomic
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+
+    # Laden (select_for_update, siehe get_queryset) und Speichern in einer Transaktion
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        serializer = OrderBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        target = serializer.validated_data['status']
+
+        with transaction.atomic():
+            # Eigentum und aktueller Status in einer Abfrage, Zeilen gesperrt bis zum UPDATE
+            current = dict(
+                Order.objects.select_for_update()
+                .filter(pk__in=ids, business_user=request.user)
+                .values_list('pk', 'status')
+            )
+            missing = [pk for pk in ids if pk not in current]
+            if missing:
+                raise DRFValidationError({
+                    "ids": [f"Keine eigenen Bestellungen: {', '.join(map(str, missing))}."]
+                })
+            changed = [pk for pk in ids if current[pk] != target]
+            if changed:
+                # queryset.update() umgeht auto_now und die Zähler-Signale
+                Order.objects.filter(pk__in=changed).update(status=target, updated_at=timezone.now())
+                deltas = Counter(current[pk] for pk in changed)
+                deltas = {old_status: -count for old_status, count in deltas.items()}
+                deltas[target] = len(changed)
+                BusinessOrderCounter.objects.add(request.user.pk, deltas)
+
+        return Response({
+            "status": target,
+            "updated": changed,
+            "unchanged": [pk for pk in ids if pk not in changed],
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        # gleiche Sichtbarkeit wie die Liste (get_queryset)
+        file_format = get_export_format(request)
+        return exports.orders_response(self.get_queryset().order_by('id'), file_format)
+
 class OrderCountView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, business_user_id):
-        if not CustomUser.objects.filter(id=business_user_id, type="business").exists():
+        # vorberechnete Zähler statt COUNT(*) über Order
+        counter = BusinessOrderCounter.objects.for_business(business_user_id)
+        if counter is None:
             raise NotFound("Kein Geschäftsnutzer mit der angegebenen ID gefunden.")
-
-        count = Order.objects.filter(
-            business_user_id=business_user_id, status="in_progress"
-        ).count()
-        return Response({"order_count": count}, status=status.HTTP_200_OK)
+        return Response({"order_count": counter.in_progress}, status=status.HTTP_200_OK)
 
 
 class CompletedOrderCountView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, business_user_id):
-        if not CustomUser.objects.filter(id=business_user_id, type="business").exists():
+        counter = BusinessOrderCounter.objects.for_business(business_user_id)
+        if counter is None:
             raise NotFound("Kein Geschäftsnutzer mit der angegebenen ID gefunden.")
+        return Response({"completed_order_count": counter.completed}, status=status.HTTP_200_OK)
 
-        count = Order.objects.filter(
-            business_user_id=business_user_id, status="completed"
-        ).count()
-        return Response({"completed_order_count": count}, status=status.HTTP_200_OK)
-
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CursorPaginationMixin, ConditionalGetMixin, SparseFieldsetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    fast_serializer_class = ReviewValuesSerializer
+    # Standard bleibt das flache Array, ?pagination=cursor mit ?ordering=[-]updated_at|[-]rating
     pagination_class = None
+    cursor_pagination_class = ReviewKeysetPagination
 
     def get_permissions(self):
         if self.action == "create":
@@ -188,6 +414,20 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return [IsReviewOwner()]
         return [permissions.IsAuthenticated()]
 
+    # Review und BusinessRating (market.signals) in einer Transaktion
+    @transaction.atomic
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+
+    # Laden (select_for_update, siehe get_queryset) und Speichern in einer Transaktion
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
     def get_queryset(self):
         qs = Review.objects.all()
         business_user_id = self.request.query_params.get("business_user_id")
@@ -199,22 +439,15 @@ class ReviewViewSet(viewsets.ModelViewSet):
         ordering = self.request.query_params.get("ordering")
         if ordering in ["updated_at", "rating"]:
             qs = qs.order_by(ordering)
+        if self.action in ("update", "partial_update", "destroy"):
+            # Zeile bis zum Commit sperren: parallele Änderungen lesen sonst dieselbe
+            # alte Bewertung und buchen das Delta doppelt (market.signals)
+            qs = qs.select_for_update(of=("self",))
         return qs
 
 class BaseInfoView(APIView):
     permission_classes = []
 
     def get(self, request):
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(avg_rating=Avg('rating'))['avg_rating'] or 0
-        average_rating = round(average_rating, 1)
-        business_profile_count = CustomUser.objects.filter(type='business').count()
-        offer_count = Offer.objects.count()
-
-        data = {
-            "review_count": review_count,
-            "average_rating": average_rating,
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count
-        }
-        return Response(data)
+        # PlatformStats wird inkrementell gepflegt, siehe market.stats
+        return Response(platform_stats.get_base_info())
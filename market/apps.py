@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.core import checks
+from django.db.models.signals import post_migrate
 
 
 class MarketConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'market'
+
+    def ready(self):
+        from core.cache import check_shared_cache
+        from . import signals
+        checks.register(check_shared_cache, checks.Tags.caches)
+        post_migrate.connect(signals.install_search_index, sender=self)
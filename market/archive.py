@@ -0,0 +1,98 @@
+"""
+Moves terminal orders out of the hot ``Order`` table.
+
+Completed and cancelled orders whose last change is older than
+``settings.ORDER_ARCHIVE_AFTER_DAYS`` (default 180) are copied into
+``ArchivedOrder`` (same id, same snapshot) and removed from ``Order`` in
+batches. The rows are deleted without signals: archived orders keep being
+counted in ``BusinessOrderCounter``.
+
+Offline runs move everything in one transaction. Online runs commit every
+batch separately, skip rows locked by concurrent requests and pause between
+batches so the table stays available.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import ArchivedOrder, Order
+
+TERMINAL_STATUSES = ("completed", "cancelled")
+DEFAULT_ARCHIVE_AFTER_DAYS = 180
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_archive_after_days():
+    return getattr(settings, "ORDER_ARCHIVE_AFTER_DAYS", DEFAULT_ARCHIVE_AFTER_DAYS)
+
+
+def get_cutoff(older_than_days=None):
+    if older_than_days is None:
+        older_than_days = get_archive_after_days()
+    return timezone.now() - timedelta(days=older_than_days)
+
+
+def archivable(cutoff):
+    return Order.objects.filter(status__in=TERMINAL_STATUSES, updated_at__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size=DEFAULT_BATCH_SIZE, skip_locked=False):
+    """Move up to ``batch_size`` orders, must run inside a transaction. Returns the number moved."""
+    rows = list(
+        archivable(cutoff)
+        .select_for_update(skip_locked=skip_locked)
+        .order_by("pk")
+        .values(
+            "id", "customer_user_id", "business_user_id", "offer_detail_id", "snapshot_id",
+            "status", "created_at", "updated_at",
+        )[:batch_size]
+    )
+    if not rows:
+        return 0
+    now = timezone.now()
+    ArchivedOrder.objects.bulk_create(ArchivedOrder(archived_at=now, **row) for row in rows)
+    _delete_without_signals([row["id"] for row in rows])
+    return len(rows)
+
+
+def _delete_without_signals(pks):
+    # Order.delete() würde über market.signals die Zähler verringern
+    connection = connections[router.db_for_write(Order)]
+    table = connection.ops.quote_name(Order._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", pks)
+
+
+def archive_orders(older_than_days=None, batch_size=DEFAULT_BATCH_SIZE, online=False, pause=0.0, progress=None):
+    """Archive all eligible orders, calling ``progress(moved_so_far)`` after each batch."""
+    cutoff = get_cutoff(older_than_days)
+    moved = 0
+
+    def run_batches():
+        nonlocal moved
+        while True:
+            if online:
+                with transaction.atomic():
+                    count = archive_batch(cutoff, batch_size, skip_locked=True)
+            else:
+                count = archive_batch(cutoff, batch_size)
+            if not count:
+                return
+            moved += count
+            if progress is not None:
+                progress(moved)
+            if count < batch_size:
+                return
+            if online and pause:
+                time.sleep(pause)
+
+    if online:
+        run_batches()
+    else:
+        with transaction.atomic():
+            run_batches()
+    return moved
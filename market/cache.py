@@ -0,0 +1,149 @@
+"""
+Response cache for the anonymous /api/offers/ listing.
+
+Keys embed a generation token. Every Offer / OfferDetail write replaces the
+token with a new random one (see market.signals), which orphans all cached
+pages at once without flushing the rest of the cache; orphaned entries
+simply expire. Tokens never repeat, so a lost or evicted token cannot bring
+back pages cached under an earlier generation. Queryset
+.update() calls on offers bypass the signals and call invalidate() themselves.
+
+The token only works if all workers share the cache, so the listing is
+not cached at all with a process-local backend (LocMemCache).
+"""
+import hashlib
+import threading
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+from core.cache import is_shared
+
+PREFIX = "offers:list"
+GENERATION_KEY = f"{PREFIX}:generation"
+HITS_KEY = f"{PREFIX}:hits"
+MISSES_KEY = f"{PREFIX}:misses"
+# Treffer/Fehlschläge werden gesammelt gezählt, sonst kostet jeder Request Cache-Roundtrips
+COUNTER_FLUSH_EVERY = 100
+
+# Fehlende Parameter werden mit ihren Defaults ergänzt, damit z.B.
+# "?page=1&page_size=10" und "" denselben Eintrag treffen.
+DEFAULT_PARAMS = {
+    "page": "1",
+    "page_size": "10",
+    "ordering": "",
+    "search": "",
+    "user": "",
+    "min_price": "",
+    "max_price": "",
+    "min_delivery_time": "",
+    "max_delivery_time": "",
+}
+
+
+def is_enabled():
+    return is_shared(caches["default"])
+
+
+def get_timeout():
+    return getattr(settings, "OFFER_LIST_CACHE_TIMEOUT", 300)
+
+
+_pending_counts = Counter()
+_pending_lock = threading.Lock()
+
+
+def _incr(key, delta=1):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key, delta)
+
+
+def _count(key):
+    with _pending_lock:
+        _pending_counts[key] += 1
+        if _pending_counts.total() < COUNTER_FLUSH_EVERY:
+            return
+    flush_counters()
+
+
+def flush_counters():
+    with _pending_lock:
+        pending = dict(_pending_counts)
+        _pending_counts.clear()
+    for key, delta in pending.items():
+        _incr(key, delta)
+
+
+def _new_generation():
+    return uuid.uuid4().hex
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, _new_generation(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    # set() statt incr(): incr() der DB-/Datei-Caches setzt den Default-Timeout,
+    # danach begänne der Zähler wieder bei 0 und träfe alte Seiten
+    generation = _new_generation()
+    cache.set(GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def invalidate():
+    bump_generation()
+    if transaction.get_connection().in_atomic_block:
+        # a concurrent reader may have cached the pre-commit state in between
+        transaction.on_commit(bump_generation)
+
+
+def normalize_query(query_params):
+    params = {key: sorted(query_params.getlist(key)) for key in query_params}
+    for key, default in DEFAULT_PARAMS.items():
+        if not any(params.get(key, [])):
+            params[key] = [default]
+    return "&".join(
+        f"{key}={value}" for key in sorted(params) for value in params[key]
+    )
+
+
+def make_key(request):
+    # Links in der Antwort sind absolute URLs -> Host gehört zum Schlüssel
+    raw = f"{request.get_host()}?{normalize_query(request.query_params)}"
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"{PREFIX}:{get_generation()}:{digest}"
+
+
+def lookup(request):
+    key = make_key(request)
+    data = cache.get(key)
+    _count(HITS_KEY if data is not None else MISSES_KEY)
+    return key, data
+
+
+def store(key, data):
+    cache.set(key, data, get_timeout())
+
+
+def stats():
+    flush_counters()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+        "generation": get_generation(),
+        "enabled": is_enabled(),
+    }
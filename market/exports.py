@@ -0,0 +1,117 @@
+"""
+Streaming NDJSON / CSV exports for offers (with details) and orders.
+
+Rows are read with ``.values().iterator()`` in chunks and encoded one line
+at a time, so memory stays flat no matter how many rows are exported.
+Decimals are written unrounded (the API truncates prices to int).
+"""
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .models import OfferDetail, OrderSnapshot
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CHUNK_SIZE = 2000
+
+OFFER_FIELDS = [
+    "id", "user", "title", "image", "description", "created_at", "updated_at",
+    "min_price", "min_delivery_time",
+]
+OFFER_DETAIL_FIELDS = [
+    "id", "title", "revisions", "delivery_time_in_days", "price", "features", "offer_type",
+]
+ORDER_FIELDS = [
+    "id", "customer_user", "business_user", "title", "revisions", "delivery_time_in_days",
+    "price", "features", "offer_type", "status", "created_at", "updated_at",
+]
+# title, revisions, ... kommen aus Order.snapshot
+ORDER_COLUMNS = [
+    f"snapshot__{name}" if name in OrderSnapshot.FIELDS else name for name in ORDER_FIELDS
+]
+
+
+class _Echo:
+    """csv.writer target that hands the formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def iter_offers(queryset, chunk_size=CHUNK_SIZE):
+    """Offers as dicts with a nested ``details`` list, one detail query per chunk."""
+    rows = queryset.values(*OFFER_FIELDS).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        details = {}
+        for detail in (
+            OfferDetail.objects.filter(offer_id__in=[row["id"] for row in chunk])
+            .order_by("offer_id", "id")
+            .values("offer_id", *OFFER_DETAIL_FIELDS)
+        ):
+            details.setdefault(detail.pop("offer_id"), []).append(detail)
+        for row in chunk:
+            row["details"] = details.get(row["id"], [])
+            yield row
+
+
+def iter_orders(queryset, chunk_size=CHUNK_SIZE):
+    rows = queryset.values_list(*ORDER_COLUMNS).iterator(chunk_size=chunk_size)
+    return (dict(zip(ORDER_FIELDS, row)) for row in rows)
+
+
+def flatten_offer(offer):
+    """One CSV row per offer detail, offer columns repeated."""
+    base = {f"offer_{key}": value for key, value in offer.items() if key != "details"}
+    for detail in offer["details"] or [{}]:
+        yield {**base, **{f"detail_{key}": value for key, value in detail.items()}}
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield _dumps(row) + "\n"
+
+
+def csv_lines(rows, fieldnames):
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames, extrasaction="ignore")
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow({
+            key: _dumps(value) if isinstance(value, (list, dict)) else value
+            for key, value in row.items()
+        })
+
+
+def offers_response(queryset, file_format):
+    rows = iter_offers(queryset)
+    if file_format == "csv":
+        fieldnames = [f"offer_{f}" for f in OFFER_FIELDS] + [f"detail_{f}" for f in OFFER_DETAIL_FIELDS]
+        lines = csv_lines((flat for offer in rows for flat in flatten_offer(offer)), fieldnames)
+    else:
+        lines = ndjson_lines(rows)
+    return _response(lines, file_format, "offers")
+
+
+def orders_response(queryset, file_format):
+    rows = iter_orders(queryset)
+    lines = csv_lines(rows, ORDER_FIELDS) if file_format == "csv" else ndjson_lines(rows)
+    return _response(lines, file_format, "orders")
+
+
+def _response(lines, file_format, name):
+    response = StreamingHttpResponse(lines, content_type=FORMATS[file_format])
+    response["Content-Disposition"] = f'attachment; filename="{name}.{file_format}"'
+    return response
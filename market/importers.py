@@ -0,0 +1,93 @@
+"""
+Bulk offer import shared by POST /api/offers/bulk/ and ``manage.py import_offers``.
+
+Rows are validated with OfferSerializer in memory and every batch is written
+with one bulk_create for Offer and one for OfferDetail inside a transaction.
+bulk_create bypasses model signals, so min values are computed up front and
+the offer list cache and PlatformStats are updated once per batch.
+"""
+import json
+from itertools import islice
+
+from django.db import transaction
+
+from . import cache as offer_list_cache
+from . import stats as platform_stats
+from .api.serializers import OfferSerializer
+from .models import Offer, OfferDetail, PlatformStats, min_detail_values
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def iter_ndjson(lines):
+    """Yield one object per non-empty line; undecodable lines yield the error message."""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield InvalidRow(f"Ungültiges JSON: {exc}")
+
+
+class InvalidRow:
+    def __init__(self, message):
+        self.message = message
+
+
+class OfferImporter:
+    def __init__(self, user, batch_size=DEFAULT_BATCH_SIZE, context=None):
+        self.user = user
+        self.batch_size = batch_size
+        self.context = context or {}
+
+    def import_rows(self, rows):
+        """Yield one result dict per input row, in input order."""
+        rows = enumerate(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return
+            yield from self.import_batch(batch)
+
+    def import_batch(self, batch):
+        results = []
+        pending = []
+        for index, row in batch:
+            if isinstance(row, InvalidRow):
+                results.append({"row": index, "status": "error", "errors": {"non_field_errors": [row.message]}})
+                continue
+            if not isinstance(row, dict):
+                results.append({"row": index, "status": "error", "errors": {"non_field_errors": ["Objekt erwartet."]}})
+                continue
+            serializer = OfferSerializer(data=row, context=self.context)
+            if not serializer.is_valid():
+                results.append({"row": index, "status": "error", "errors": serializer.errors})
+                continue
+            data = dict(serializer.validated_data)
+            details = [OfferDetail(**detail_data) for detail_data in data.pop("details", [])]
+            min_price, min_delivery_time = min_detail_values(details)
+            offer = Offer(
+                user=self.user, min_price=min_price, min_delivery_time=min_delivery_time, **data
+            )
+            result = {"row": index, "status": "created"}
+            results.append(result)
+            pending.append((result, offer, details))
+
+        if pending:
+            with transaction.atomic():
+                offers = Offer.objects.bulk_create([offer for _, offer, _ in pending])
+                details = []
+                for (result, _, offer_details), offer in zip(pending, offers):
+                    result["id"] = offer.pk
+                    for detail in offer_details:
+                        detail.offer = offer
+                        details.append(detail)
+                OfferDetail.objects.bulk_create(details)
+                PlatformStats.objects.add(offer_count=len(offers))
+                offer_list_cache.invalidate()
+                platform_stats.invalidate()
+        return results
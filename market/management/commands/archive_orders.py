@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from market import archive
+
+
+class Command(BaseCommand):
+    help = "Move completed / cancelled orders older than ORDER_ARCHIVE_AFTER_DAYS into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=None,
+            help=f"Default: settings.ORDER_ARCHIVE_AFTER_DAYS ({archive.DEFAULT_ARCHIVE_AFTER_DAYS}).",
+        )
+        parser.add_argument("--batch-size", type=int, default=archive.DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--online",
+            action="store_true",
+            help="Commit every batch on its own and skip rows locked by running requests.",
+        )
+        parser.add_argument("--pause", type=float, default=0.1, help="Seconds between batches in --online mode.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count eligible orders.")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = archive.archivable(archive.get_cutoff(options["older_than_days"])).count()
+            self.stdout.write(self.style.SUCCESS(f"{count} orders would be archived."))
+            return
+
+        moved = archive.archive_orders(
+            older_than_days=options["older_than_days"],
+            batch_size=options["batch_size"],
+            online=options["online"],
+            pause=options["pause"],
+            progress=lambda moved: self.stdout.write(f"{moved} orders archived ..."),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} orders."))
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.db.models import F, Min, Value
+from django.db.models.functions import Coalesce
+
+from market.models import Offer
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair the denormalized Offer.min_price / Offer.min_delivery_time columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report offers whose stored values drifted, do not write anything.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        check = options["check"]
+        last_pk = 0
+        scanned = 0
+        drifted = 0
+
+        while True:
+            pks = list(
+                Offer.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                break
+            last_pk = pks[-1]
+            scanned += len(pks)
+
+            stale_pks = list(
+                Offer.objects.filter(pk__in=pks)
+                .annotate(
+                    actual_min_price=Coalesce(
+                        Min("details__price"), Value(0),
+                        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+                    ),
+                    actual_min_delivery_time=Coalesce(
+                        Min("details__delivery_time_in_days"), Value(0),
+                        output_field=models.PositiveIntegerField(),
+                    ),
+                )
+                .exclude(
+                    min_price=F("actual_min_price"),
+                    min_delivery_time=F("actual_min_delivery_time"),
+                )
+                .values_list("pk", flat=True)
+            )
+            if not stale_pks:
+                continue
+            drifted += len(stale_pks)
+            if not check:
+                with transaction.atomic():
+                    Offer.objects.filter(pk__in=stale_pks).refresh_min_values()
+
+        action = "found" if check else "repaired"
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} offers, {action} {drifted} with stale min values."
+        ))
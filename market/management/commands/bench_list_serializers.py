@@ -0,0 +1,83 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from market.api.views import OfferViewSet, ReviewViewSet
+from market.models import Offer, OfferDetail, Review
+from users.api.views import BusinessProfileListView
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the DRF serializers with the .values() fast path on the offer, review "
+        "and business profile lists. Test data is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100, help="Rows per list (page size for offers).")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options["rows"], options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, rows, repeat):
+        customer = User.objects.create_user(username="bench-customer", password="x", type="customer")
+        businesses = User.objects.bulk_create(
+            User(username=f"bench-business-{i}", type="business", first_name="Bench", tel=None)
+            for i in range(rows)
+        )
+        offers = Offer.objects.bulk_create(
+            Offer(user=businesses[i % len(businesses)], title=f"Offer {i}", description="x" * 500,
+                  min_price=100, min_delivery_time=3)
+            for i in range(rows)
+        )
+        OfferDetail.objects.bulk_create(
+            OfferDetail(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3,
+                        price=100, features=["a", "b"], offer_type=offer_type)
+            for offer in offers for offer_type in ("basic", "standard", "premium")
+        )
+        Review.objects.bulk_create(
+            Review(business_user=business, reviewer=customer, rating=4, description="Gut")
+            for business in businesses
+        )
+
+        factory = APIRequestFactory()
+        cases = [
+            ("offers", OfferViewSet.as_view({"get": "list"}), "/api/offers/",
+             {"pagination": "cursor", "page_size": min(rows, 100)}),
+            ("reviews", ReviewViewSet.as_view({"get": "list"}), "/api/reviews/", {}),
+            ("profiles/business", BusinessProfileListView.as_view(), "/api/profiles/business/", {}),
+        ]
+        for name, view, url, params in cases:
+            timings = {}
+            for fast in (False, True):
+                samples = []
+                with override_settings(FAST_LIST_SERIALIZATION=fast):
+                    for _ in range(repeat):
+                        request = factory.get(url, params, HTTP_HOST="localhost")
+                        force_authenticate(request, user=customer)
+                        start = time.perf_counter()
+                        response = view(request)
+                        response.render()
+                        samples.append(time.perf_counter() - start)
+                timings[fast] = statistics.median(samples) * 1000
+            self.stdout.write(
+                f"{name:<20} drf {timings[False]:8.2f} ms   fast {timings[True]:8.2f} ms   "
+                f"x{timings[False] / timings[True]:.1f}"
+            )
@@ -0,0 +1,63 @@
+import json
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from market.importers import DEFAULT_BATCH_SIZE, OfferImporter, iter_ndjson
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Import offers (with their details) from a JSON array or NDJSON file for one business user."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, '-' reads from stdin.")
+        parser.add_argument("--user", required=True, help="Username or id of the owning business user.")
+        parser.add_argument("--format", choices=["json", "ndjson"], help="Default: guessed from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+        fmt = options["format"] or ("json" if options["path"].endswith(".json") else "ndjson")
+        stream = sys.stdin if options["path"] == "-" else open(options["path"], encoding="utf-8")
+
+        importer = OfferImporter(user, batch_size=options["batch_size"])
+        created = failed = 0
+        started = time.monotonic()
+        try:
+            if fmt == "json":
+                try:
+                    rows = json.load(stream)
+                except json.JSONDecodeError as exc:
+                    raise CommandError(f"Invalid JSON input: {exc}")
+                if not isinstance(rows, list):
+                    raise CommandError("JSON input must be an array of offers.")
+            else:
+                rows = iter_ndjson(stream)
+            for result in importer.import_rows(rows):
+                if result["status"] == "created":
+                    created += 1
+                else:
+                    failed += 1
+                    self.stderr.write(f"row {result['row']}: {json.dumps(result['errors'], ensure_ascii=False)}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} offers, {failed} rows failed ({elapsed:.1f}s)."
+        ))
+
+    def get_user(self, value):
+        lookup = {"pk": value} if value.isdigit() else {"username": value}
+        try:
+            user = User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{value}' does not exist.")
+        if user.type != "business":
+            raise CommandError(f"User '{value}' is not a business user.")
+        return user
@@ -0,0 +1,46 @@
+from concurrent.futures import as_completed
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from core import images
+from market.models import Offer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Render missing thumbnail/WebP variants for Offer.image and CustomUser.file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Re-render variants that already exist.")
+
+    def handle(self, *args, **options):
+        executor = images.get_executor()
+        specs = images.get_variant_specs()
+        done = failed = 0
+
+        for model, field_name in ((Offer, "image"), (User, "file")):
+            queryset = (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .only("pk", field_name, images.variants_field_name(field_name))
+            )
+            jobs = {}
+            for instance in queryset.iterator(chunk_size=500):
+                if not options["force"] and not images.needs_processing(instance, field_name):
+                    continue
+                file = getattr(instance, field_name)
+                future = executor.submit(images.render_variants, file.path, specs)
+                jobs[future] = (instance.pk, file.name, file.path)
+
+            for future in as_completed(jobs):
+                pk, name, path = jobs[future]
+                try:
+                    images.record_variants(model, pk, field_name, name, path, future.result())
+                    done += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} {pk}: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered variants for {done} images, {failed} failed."))
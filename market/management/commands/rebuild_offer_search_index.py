@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from market import cache as offer_list_cache
+from market.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Create (if missing) and rebuild the full-text search index for offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options["database"])
+        backend.install()
+        backend.rebuild()
+        # cached search results may have been served from the stale index
+        offer_list_cache.bump_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt offer search index ({type(backend).__name__})."
+        ))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from market.models import BusinessRating, Review
+
+
+class Command(BaseCommand):
+    help = "Compare BusinessRating with the actual reviews and repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drifted aggregates, do not write anything.",
+        )
+
+    def handle(self, *args, **options):
+        check = options["check"]
+        star_fields = [f"rating_{star}" for star in BusinessRating.STARS]
+        fields = ["review_count", "rating_sum", *star_fields]
+
+        actual = {}
+        rows = Review.objects.order_by().values_list("business_user_id", "rating").annotate(total=Count("pk"))
+        for business_user_id, rating, total in rows:
+            values = actual.setdefault(business_user_id, dict.fromkeys(fields, 0))
+            values["review_count"] += total
+            values["rating_sum"] += rating * total
+            if rating in BusinessRating.STARS:
+                values[f"rating_{rating}"] = total
+
+        stored = {
+            row.pop("business_user_id"): row
+            for row in BusinessRating.objects.values("business_user_id", *fields)
+        }
+
+        drifted = []
+        for business_user_id in actual.keys() | stored.keys():
+            expected = actual.get(business_user_id, dict.fromkeys(fields, 0))
+            if stored.get(business_user_id) != expected:
+                drifted.append(business_user_id)
+                self.stdout.write(
+                    f"Business user {business_user_id}: stored {stored.get(business_user_id)}, actual {expected}"
+                )
+
+        if drifted and not check:
+            with transaction.atomic():
+                for business_user_id in drifted:
+                    BusinessRating.objects.recount(business_user_id)
+
+        action = "found" if check else "repaired"
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {len(actual.keys() | stored.keys())} business users, {action} {len(drifted)} drifted ratings."
+        ))
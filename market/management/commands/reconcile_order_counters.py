@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from market.models import ArchivedOrder, BusinessOrderCounter, Order
+
+
+class Command(BaseCommand):
+    help = "Compare BusinessOrderCounter with the actual (live + archived) order counts and repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drifted counters, do not write anything.",
+        )
+
+    def handle(self, *args, **options):
+        check = options["check"]
+        fields = BusinessOrderCounter.STATUS_FIELDS
+
+        actual = {}
+        for model in (Order, ArchivedOrder):
+            rows = model.objects.order_by().values_list("business_user_id", "status").annotate(total=Count("pk"))
+            for business_user_id, status, total in rows:
+                if status in fields:
+                    actual.setdefault(business_user_id, dict.fromkeys(fields, 0))[status] += total
+
+        stored = {
+            row["business_user_id"]: {field: row[field] for field in fields}
+            for row in BusinessOrderCounter.objects.values("business_user_id", *fields)
+        }
+
+        drifted = []
+        for business_user_id in actual.keys() | stored.keys():
+            expected = actual.get(business_user_id, dict.fromkeys(fields, 0))
+            if stored.get(business_user_id) != expected:
+                drifted.append(business_user_id)
+                self.stdout.write(
+                    f"Business user {business_user_id}: stored {stored.get(business_user_id)}, actual {expected}"
+                )
+
+        if drifted and not check:
+            with transaction.atomic():
+                for business_user_id in drifted:
+                    BusinessOrderCounter.objects.recount(business_user_id)
+
+        action = "found" if check else "repaired"
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {len(actual.keys() | stored.keys())} business users, {action} {len(drifted)} drifted counters."
+        ))
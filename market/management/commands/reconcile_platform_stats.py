@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from market import stats as platform_stats
+from market.models import PlatformStats
+
+
+class Command(BaseCommand):
+    help = "Compare PlatformStats with the actual totals and repair drift. Meant to run periodically (cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift, do not write anything.",
+        )
+
+    def handle(self, *args, **options):
+        check = options["check"]
+        with transaction.atomic():
+            actual = PlatformStats.objects.count_all()
+            stored = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_PK).values(*PlatformStats.FIELDS).first()
+            drifted = [field for field in PlatformStats.FIELDS if stored is None or stored[field] != actual[field]]
+            for field in drifted:
+                self.stdout.write(f"{field}: stored {None if stored is None else stored[field]}, actual {actual[field]}")
+            if drifted and not check:
+                PlatformStats.objects.recount()
+                platform_stats.invalidate()
+
+        action = "found" if check else "repaired"
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {len(PlatformStats.FIELDS)} platform totals, {action} {len(drifted)} drifted values."
+        ))
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def backfill_min_values(apps, schema_editor):
+    Offer = apps.get_model('market', 'Offer')
+    for offer in Offer.objects.annotate(
+        agg_price=Min('details__price'),
+        agg_delivery=Min('details__delivery_time_in_days'),
+    ).iterator(chunk_size=1000):
+        Offer.objects.filter(pk=offer.pk).update(
+            min_price=offer.agg_price or 0,
+            min_delivery_time=offer.agg_delivery or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0002_order'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_min_values, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='offerdetail',
+            name='price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.IntegerField()),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='received_reviews', to=settings.AUTH_USER_MODEL)),
+                ('reviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='written_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('business_user', 'reviewer')},
+            },
+        ),
+    ]
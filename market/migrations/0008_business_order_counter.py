@@ -0,0 +1,40 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Order = apps.get_model('market', 'Order')
+    BusinessOrderCounter = apps.get_model('market', 'BusinessOrderCounter')
+    counters = {}
+    rows = Order.objects.order_by().values_list('business_user_id', 'status').annotate(total=Count('pk'))
+    for business_user_id, status, total in rows:
+        counter = counters.setdefault(business_user_id, BusinessOrderCounter(business_user_id=business_user_id))
+        if status in ('in_progress', 'completed', 'cancelled'):
+            setattr(counter, status, total)
+    BusinessOrderCounter.objects.bulk_create(counters.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0007_order_participant_status_idx'),
+        ('users', '0003_customuser_file_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderCounter',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0008_business_order_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(editable=False, max_length=64, unique=True)),
+                ('title', models.CharField(max_length=255)),
+                ('revisions', models.PositiveIntegerField()),
+                ('delivery_time_in_days', models.PositiveIntegerField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('features', models.JSONField(default=list)),
+                ('offer_type', models.CharField(max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='snapshot',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='market.ordersnapshot'),
+        ),
+        # nullable, damit 0011 rückwärts die Spalten wieder anlegen kann, bevor
+        # 0010 sie aus den Snapshots füllt
+        migrations.AlterField(model_name='order', name='title', field=models.CharField(max_length=255, null=True)),
+        migrations.AlterField(model_name='order', name='revisions', field=models.PositiveIntegerField(null=True)),
+        migrations.AlterField(model_name='order', name='delivery_time_in_days', field=models.PositiveIntegerField(null=True)),
+        migrations.AlterField(model_name='order', name='price', field=models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+        migrations.AlterField(model_name='order', name='features', field=models.JSONField(default=list, null=True)),
+        migrations.AlterField(model_name='order', name='offer_type', field=models.CharField(max_length=50, null=True)),
+    ]
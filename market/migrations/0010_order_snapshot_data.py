@@ -0,0 +1,72 @@
+import hashlib
+import json
+from decimal import Decimal
+
+from django.db import migrations
+
+SNAPSHOT_FIELDS = ('title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type')
+
+
+def snapshot_digest(values):
+    # eingefrorene Kopie von OrderSnapshot.compute_digest
+    canonical = json.dumps(
+        [values[name] if name != 'price' else str(values[name]) for name in SNAPSHOT_FIELDS],
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def move_terms_to_snapshots(apps, schema_editor):
+    Order = apps.get_model('market', 'Order')
+    OrderSnapshot = apps.get_model('market', 'OrderSnapshot')
+    known = dict(OrderSnapshot.objects.values_list('digest', 'pk'))
+    last_pk = 0
+    while True:
+        rows = list(
+            Order.objects.filter(pk__gt=last_pk).order_by('pk').values('pk', *SNAPSHOT_FIELDS)[:1000]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1]['pk']
+        digests = {}
+        new = {}
+        for row in rows:
+            values = {name: row[name] for name in SNAPSHOT_FIELDS}
+            values['price'] = Decimal(values['price']).quantize(Decimal('0.01'))
+            digest = snapshot_digest(values)
+            digests[row['pk']] = digest
+            if digest not in known and digest not in new:
+                new[digest] = OrderSnapshot(digest=digest, **values)
+        if new:
+            OrderSnapshot.objects.bulk_create(new.values())
+            known.update(OrderSnapshot.objects.filter(digest__in=new).values_list('digest', 'pk'))
+        orders = [Order(pk=pk, snapshot_id=known[digest]) for pk, digest in digests.items()]
+        Order.objects.bulk_update(orders, ['snapshot'])
+
+
+
+def copy_snapshots_to_terms(apps, schema_editor):
+    Order = apps.get_model('market', 'Order')
+    last_pk = 0
+    while True:
+        orders = list(Order.objects.filter(pk__gt=last_pk).select_related('snapshot').order_by('pk')[:1000])
+        if not orders:
+            break
+        last_pk = orders[-1].pk
+        for order in orders:
+            for name in SNAPSHOT_FIELDS:
+                setattr(order, name, getattr(order.snapshot, name))
+        Order.objects.bulk_update(orders, SNAPSHOT_FIELDS)
+
+
+class Migration(migrations.Migration):
+    # eigene Migration: Datenänderung und Schemaänderung in einer Transaktion
+    # scheitern auf PostgreSQL an "pending trigger events"
+
+    dependencies = [
+        ('market', '0009_order_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_terms_to_snapshots, copy_snapshots_to_terms),
+    ]
@@ -0,0 +1,23 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0010_order_snapshot_data'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='snapshot',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='orders', to='market.ordersnapshot'),
+        ),
+        migrations.RemoveField(model_name='order', name='title'),
+        migrations.RemoveField(model_name='order', name='revisions'),
+        migrations.RemoveField(model_name='order', name='delivery_time_in_days'),
+        migrations.RemoveField(model_name='order', name='price'),
+        migrations.RemoveField(model_name='order', name='features'),
+        migrations.RemoveField(model_name='order', name='offer_type'),
+    ]
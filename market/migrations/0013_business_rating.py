@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    Review = apps.get_model('market', 'Review')
+    BusinessRating = apps.get_model('market', 'BusinessRating')
+    aggregates = {}
+    rows = Review.objects.order_by().values_list('business_user_id', 'rating').annotate(total=Count('pk'))
+    for business_user_id, rating, total in rows:
+        aggregate = aggregates.setdefault(business_user_id, BusinessRating(business_user_id=business_user_id))
+        aggregate.review_count += total
+        aggregate.rating_sum += rating * total
+        if 1 <= rating <= 5:
+            setattr(aggregate, f'rating_{rating}', total)
+    BusinessRating.objects.bulk_create(aggregates.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0012_archived_order'),
+        ('users', '0003_customuser_file_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRating',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:40
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_platform_stats(apps, schema_editor):
+    Review = apps.get_model('market', 'Review')
+    Offer = apps.get_model('market', 'Offer')
+    CustomUser = apps.get_model('users', 'CustomUser')
+    PlatformStats = apps.get_model('market', 'PlatformStats')
+    reviews = Review.objects.aggregate(review_count=Count('pk'), rating_sum=Sum('rating'))
+    PlatformStats.objects.create(
+        pk=1,
+        review_count=reviews['review_count'],
+        rating_sum=reviews['rating_sum'] or 0,
+        business_profile_count=CustomUser.objects.filter(type='business').count(),
+        offer_count=Offer.objects.count(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0014_review_indexes'),
+        ('users', '0003_customuser_file_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(backfill_platform_stats, migrations.RunPython.noop),
+    ]
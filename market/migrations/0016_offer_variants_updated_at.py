@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0015_platform_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='variants_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,23 +1,77 @@
-from django.db import models
+import hashlib
+import json
+from decimal import Decimal
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from . import cache as offer_list_cache
 
 User = settings.AUTH_USER_MODEL
 
+
+def min_detail_values(details):
+    """In-memory counterpart of OfferQuerySet.refresh_min_values() for unsaved details."""
+    prices = [detail.price for detail in details if detail.price is not None]
+    delivery_times = [detail.delivery_time_in_days for detail in details if detail.delivery_time_in_days is not None]
+    return (min(prices) if prices else 0), (min(delivery_times) if delivery_times else 0)
+
+
+class OfferQuerySet(models.QuerySet):
+    def refresh_min_values(self):
+        """
+        Recompute the denormalized min_price / min_delivery_time columns
+        of every offer in this queryset with a single UPDATE.
+        """
+        details = OfferDetail.objects.filter(offer=OuterRef("pk")).order_by().values("offer")
+        updated = self.update(
+            min_price=Coalesce(
+                Subquery(details.annotate(value=Min("price")).values("value")),
+                Value(0),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2),
+            ),
+            min_delivery_time=Coalesce(
+                Subquery(details.annotate(value=Min("delivery_time_in_days")).values("value")),
+                Value(0),
+                output_field=models.PositiveIntegerField(),
+            ),
+        )
+        if updated:
+            # update() umgeht die Signale, die Liste zeigt min_price
+            offer_list_cache.invalidate()
+        return updated
+
+
 class Offer(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="offers")
     title = models.CharField(max_length=255)
     image = models.ImageField(upload_to='offers/', null=True, blank=True)
+    # Thumbnail/WebP-Varianten, befüllt von core.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # eigener Zeitstempel, damit Varianten updated_at (Sortierung) nicht verschieben
+    variants_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized from OfferDetail, kept in sync by market.signals
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, default=0, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(default=0, db_index=True)
 
-    @property
-    def min_price(self):
-        return self.details.aggregate(models.Min('price'))['price__min'] or 0
+    objects = OfferQuerySet.as_manager()
 
-    @property
-    def min_delivery_time(self):
-        return self.details.aggregate(models.Min('delivery_time_in_days'))['delivery_time_in_days__min'] or 0
+    class Meta:
+        indexes = [
+            # Keyset-Pagination auf (updated_at, id)
+            models.Index(fields=["updated_at", "id"], name="offer_updated_at_id_idx"),
+        ]
+
+    def refresh_min_values(self):
+        Offer.objects.filter(pk=self.pk).refresh_min_values()
+        self.refresh_from_db(fields=["min_price", "min_delivery_time"])
 
     def __str__(self):
         return self.title
@@ -31,10 +85,92 @@ class OfferDetail(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     features = models.JSONField(default=list)
     offer_type = models.CharField(max_length=50)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.offer.title} - {self.title}"
     
+class OrderSnapshotQuerySet(models.QuerySet):
+    def for_values(self, **values):
+        """Snapshot with exactly these terms, created on first use."""
+        values = OrderSnapshot.normalize(values)
+        snapshot, _ = self.get_or_create(digest=OrderSnapshot.compute_digest(values), defaults=values)
+        return snapshot
+
+
+class OrderSnapshot(models.Model):
+    """
+    Terms an order was placed with (copied from the OfferDetail), stored
+    once per distinct content and shared by all orders with the same terms.
+    """
+    FIELDS = ('title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type')
+
+    digest = models.CharField(max_length=64, unique=True, editable=False)
+    title = models.CharField(max_length=255)
+    revisions = models.PositiveIntegerField()
+    delivery_time_in_days = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    features = models.JSONField(default=list)
+    offer_type = models.CharField(max_length=50)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OrderSnapshotQuerySet.as_manager()
+
+    @classmethod
+    def normalize(cls, values):
+        missing = set(cls.FIELDS) - set(values)
+        if missing:
+            raise ValueError(f"Missing snapshot fields: {', '.join(sorted(missing))}")
+        return {
+            'title': values['title'],
+            'revisions': int(values['revisions']),
+            'delivery_time_in_days': int(values['delivery_time_in_days']),
+            'price': Decimal(values['price']).quantize(Decimal('0.01')),
+            'features': values['features'],
+            'offer_type': values['offer_type'],
+        }
+
+    @staticmethod
+    def compute_digest(values):
+        canonical = json.dumps(
+            [values[name] if name != 'price' else str(values[name]) for name in OrderSnapshot.FIELDS],
+            sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def as_values(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __str__(self):
+        return f"{self.title} ({self.digest[:12]})"
+
+
+def _snapshot_property(name):
+    def getter(self):
+        pending = self.__dict__.get('_snapshot_values')
+        if pending is not None and name in pending:
+            return pending[name]
+        return getattr(self.snapshot, name) if self.snapshot_id is not None else None
+
+    def setter(self, value):
+        self.__dict__.setdefault('_snapshot_values', {})[name] = value
+
+    return property(getter, setter)
+
+
+class OrderQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Orders where ``user`` is the customer or the business. Instead of an
+        OR across both foreign keys each side is its own subquery (carrying
+        the filters already applied to this queryset), combined with UNION,
+        so each side can use its (user, status, created_at) index.
+        """
+        business = self.filter(business_user=user).order_by().values('pk')
+        customer = self.filter(customer_user=user).order_by().values('pk')
+        return self.filter(pk__in=business.union(customer))
+
+
 class Order(models.Model):
     STATUS_CHOICES = [
         ('in_progress', 'In Progress'),
@@ -45,18 +181,168 @@ class Order(models.Model):
     customer_user = models.ForeignKey(User, related_name='customer_orders', on_delete=models.CASCADE)
     business_user = models.ForeignKey(User, related_name='business_orders', on_delete=models.CASCADE)
     offer_detail = models.ForeignKey('OfferDetail', on_delete=models.PROTECT)
-    title = models.CharField(max_length=255)
-    revisions = models.PositiveIntegerField()
-    delivery_time_in_days = models.PositiveIntegerField()
-    price = models.DecimalField(max_digits=10, decimal_places=2)
-    features = models.JSONField(default=list)
-    offer_type = models.CharField(max_length=50)
+    # title, revisions, ... liegen dedupliziert in OrderSnapshot
+    snapshot = models.ForeignKey(OrderSnapshot, related_name='orders', on_delete=models.PROTECT)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
+    # Order(title=..., ...) und order.title funktionieren wie bisher
+    title = _snapshot_property('title')
+    revisions = _snapshot_property('revisions')
+    delivery_time_in_days = _snapshot_property('delivery_time_in_days')
+    price = _snapshot_property('price')
+    features = _snapshot_property('features')
+    offer_type = _snapshot_property('offer_type')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status', 'created_at'], name='order_business_status_idx'),
+            models.Index(fields=['customer_user', 'status', 'created_at'], name='order_customer_status_idx'),
+            # Auswahl für market.archive
+            models.Index(fields=['status', 'updated_at'], name='order_status_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counter_key()
+        return instance
+
+    def save(self, *args, **kwargs):
+        pending = self.__dict__.pop('_snapshot_values', None)
+        if pending:
+            values = self.snapshot.as_values() if self.snapshot_id is not None else {}
+            values.update(pending)
+            self.snapshot = OrderSnapshot.objects.for_values(**values)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    'snapshot' if name in OrderSnapshot.FIELDS else name for name in update_fields
+                }
+        super().save(*args, **kwargs)
+
+    def remember_counter_key(self):
+        # (business_user_id, status) wie in der DB, für BusinessOrderCounter;
+        # None wenn eines der Felder nicht geladen wurde
+        loaded = self.__dict__
+        if 'business_user_id' in loaded and 'status' in loaded:
+            self._counter_key = (loaded['business_user_id'], loaded['status'])
+        else:
+            self._counter_key = None
+
     def __str__(self):
         return f"{self.title} ({self.customer_user} -> {self.business_user})"
+
+
+class ArchivedOrder(models.Model):
+    """
+    Completed / cancelled orders moved out of Order by market.archive.
+    Keeps the original id and columns; read by OrderViewSet only with
+    ``?history=true``.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(User, related_name='archived_customer_orders', on_delete=models.CASCADE)
+    business_user = models.ForeignKey(User, related_name='archived_business_orders', on_delete=models.CASCADE)
+    offer_detail = models.ForeignKey('OfferDetail', related_name='+', on_delete=models.PROTECT)
+    snapshot = models.ForeignKey(OrderSnapshot, related_name='archived_orders', on_delete=models.PROTECT)
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    objects = OrderQuerySet.as_manager()
+
+    title = _snapshot_property('title')
+    revisions = _snapshot_property('revisions')
+    delivery_time_in_days = _snapshot_property('delivery_time_in_days')
+    price = _snapshot_property('price')
+    features = _snapshot_property('features')
+    offer_type = _snapshot_property('offer_type')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'created_at'], name='archived_order_business_idx'),
+            models.Index(fields=['customer_user', 'created_at'], name='archived_order_customer_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.customer_user} -> {self.business_user}, archived)"
+
+
+class BusinessOrderCounterQuerySet(models.QuerySet):
+    def add(self, business_user_id, deltas, create=True):
+        """
+        Apply ``{status: delta}`` to the counters of one business with a
+        single UPDATE. A missing row is created from a fresh count instead
+        (unless ``create=False``), which already includes the change that
+        triggered the call.
+        """
+        deltas = {status: delta for status, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        changes = {status: F(status) + delta for status, delta in deltas.items()}
+        if self.filter(pk=business_user_id).update(**changes, updated_at=timezone.now()) or not create:
+            return
+        try:
+            with transaction.atomic():
+                self.create(business_user_id=business_user_id, **self.count_orders(business_user_id))
+        except IntegrityError:
+            # parallel angelegt, dann greift das UPDATE
+            self.filter(pk=business_user_id).update(**changes, updated_at=timezone.now())
+
+    def count_orders(self, business_user_id):
+        # archivierte Bestellungen zählen weiter mit
+        counts = dict.fromkeys(BusinessOrderCounter.STATUS_FIELDS, 0)
+        for model in (Order, ArchivedOrder):
+            rows = (
+                model.objects.filter(business_user_id=business_user_id)
+                .order_by().values_list('status').annotate(total=Count('pk'))
+            )
+            for status, total in rows:
+                if status in counts:
+                    counts[status] += total
+        return counts
+
+    def recount(self, business_user_id):
+        counter, _ = self.update_or_create(
+            business_user_id=business_user_id, defaults=self.count_orders(business_user_id)
+        )
+        return counter
+
+    def for_business(self, business_user_id):
+        """Counters of a business user, None if there is no such business user."""
+        counter = self.filter(pk=business_user_id, business_user__type='business').first()
+        user_model = self.model._meta.get_field('business_user').related_model
+        if counter is None and user_model.objects.filter(pk=business_user_id, type='business').exists():
+            # noch keine Bestellung / vor der Migration angelegt
+            counter = self.recount(business_user_id)
+        return counter
+
+
+class BusinessOrderCounter(models.Model):
+    """
+    Number of orders per status for one business user (including archived
+    ones), kept in step with Order by the signals in market.signals (and by
+    hand for bulk writes).
+    ``manage.py reconcile_order_counters`` repairs drift.
+    """
+    STATUS_FIELDS = [status for status, _ in Order.STATUS_CHOICES]
+
+    business_user = models.OneToOneField(
+        User, primary_key=True, related_name='order_counter', on_delete=models.CASCADE
+    )
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BusinessOrderCounterQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Order counter for {self.business_user_id}"
     
 class Review(models.Model):
     business_user = models.ForeignKey(User, related_name='received_reviews', on_delete=models.CASCADE)
@@ -68,6 +354,184 @@ class Review(models.Model):
 
     class Meta:
         unique_together = ('business_user', 'reviewer')
+        indexes = [
+            # gefilterte Review-Seiten, id für die Keyset-Pagination
+            models.Index(fields=['business_user', 'updated_at', 'id'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating', 'id'], name='review_business_rating_idx'),
+            models.Index(fields=['reviewer', 'updated_at', 'id'], name='review_reviewer_updated_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating_key()
+        return instance
+
+    def remember_rating_key(self):
+        # (business_user_id, rating) wie in der DB, für BusinessRating
+        loaded = self.__dict__
+        if 'business_user_id' in loaded and 'rating' in loaded:
+            self._rating_key = (loaded['business_user_id'], loaded['rating'])
+        else:
+            self._rating_key = None
 
     def __str__(self):
         return f"Review by {self.reviewer} for {self.business_user} ({self.rating})"
+
+
+class BusinessRatingQuerySet(models.QuerySet):
+    def add(self, business_user_id, deltas, create=True):
+        """
+        Apply ``{rating: delta}`` (e.g. ``{4: 1}`` for a new 4-star review)
+        with a single UPDATE. A missing row is created from a fresh
+        aggregate instead (unless ``create=False``), which already includes
+        the change that triggered the call.
+        """
+        deltas = {rating: delta for rating, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        changes = {
+            'review_count': F('review_count') + sum(deltas.values()),
+            'rating_sum': F('rating_sum') + sum(rating * delta for rating, delta in deltas.items()),
+        }
+        for rating, delta in deltas.items():
+            if rating in BusinessRating.STARS:
+                changes[f'rating_{rating}'] = F(f'rating_{rating}') + delta
+        if self.filter(pk=business_user_id).update(**changes, updated_at=timezone.now()) or not create:
+            return
+        try:
+            with transaction.atomic():
+                self.create(business_user_id=business_user_id, **self.aggregate_reviews(business_user_id))
+        except IntegrityError:
+            self.filter(pk=business_user_id).update(**changes, updated_at=timezone.now())
+
+    def aggregate_reviews(self, business_user_id):
+        values = {'review_count': 0, 'rating_sum': 0, **{f'rating_{star}': 0 for star in BusinessRating.STARS}}
+        rows = (
+            Review.objects.filter(business_user_id=business_user_id)
+            .order_by().values_list('rating').annotate(total=Count('pk'))
+        )
+        for rating, total in rows:
+            values['review_count'] += total
+            values['rating_sum'] += rating * total
+            if rating in BusinessRating.STARS:
+                values[f'rating_{rating}'] = total
+        return values
+
+    def recount(self, business_user_id):
+        aggregate, _ = self.update_or_create(
+            business_user_id=business_user_id, defaults=self.aggregate_reviews(business_user_id)
+        )
+        return aggregate
+
+
+class BusinessRating(models.Model):
+    """
+    Review count, rating sum and 1-5 histogram per business user, kept in
+    step with Review by the signals in market.signals.
+    ``manage.py reconcile_business_ratings`` repairs drift.
+    """
+    STARS = (1, 2, 3, 4, 5)
+
+    business_user = models.OneToOneField(
+        User, primary_key=True, related_name='rating', on_delete=models.CASCADE
+    )
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BusinessRatingQuerySet.as_manager()
+
+    @staticmethod
+    def summarize(review_count, rating_sum, histogram):
+        return {
+            'count': review_count,
+            'average': round(rating_sum / review_count, 1) if review_count else 0,
+            'histogram': {str(star): count for star, count in zip(BusinessRating.STARS, histogram)},
+        }
+
+    @classmethod
+    def empty_summary(cls):
+        return cls.summarize(0, 0, [0] * len(cls.STARS))
+
+    def summary(self):
+        histogram = [getattr(self, f'rating_{star}') for star in self.STARS]
+        return self.summarize(self.review_count, self.rating_sum, histogram)
+
+    def __str__(self):
+        return f"Ratings for {self.business_user_id}"
+
+
+class PlatformStatsQuerySet(models.QuerySet):
+    def add(self, **deltas):
+        """
+        Apply column deltas (e.g. ``offer_count=1``) to the single row with
+        one UPDATE; a missing row is created from a fresh count instead.
+        """
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        changes = {name: F(name) + delta for name, delta in deltas.items()}
+        if self.filter(pk=PlatformStats.SINGLETON_PK).update(**changes, updated_at=timezone.now()):
+            return
+        try:
+            with transaction.atomic():
+                self.create(pk=PlatformStats.SINGLETON_PK, **self.count_all())
+        except IntegrityError:
+            # parallel angelegt; ob deren Zählung diesen Write enthält, ist
+            # unbekannt, also neu zählen statt das Delta anzuwenden
+            self.recount()
+
+    def count_all(self):
+        reviews = Review.objects.aggregate(review_count=Count('pk'), rating_sum=Coalesce(Sum('rating'), 0))
+        return {
+            **reviews,
+            'business_profile_count': get_user_model().objects.filter(type='business').count(),
+            'offer_count': Offer.objects.count(),
+        }
+
+    def recount(self):
+        stats, _ = self.update_or_create(pk=PlatformStats.SINGLETON_PK, defaults=self.count_all())
+        return stats
+
+    def current(self):
+        stats = self.filter(pk=PlatformStats.SINGLETON_PK).first()
+        return stats if stats is not None else self.recount()
+
+
+class PlatformStats(models.Model):
+    """
+    Single row with the platform totals shown by /api/base-info/, kept in
+    step by market.signals (and by hand for bulk writes).
+    ``manage.py reconcile_platform_stats`` repairs drift.
+    """
+    SINGLETON_PK = 1
+    FIELDS = ('review_count', 'rating_sum', 'business_profile_count', 'offer_count')
+
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PlatformStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = 'platform stats'
+
+    def as_base_info(self):
+        average = self.rating_sum / self.review_count if self.review_count else 0
+        return {
+            "review_count": self.review_count,
+            "average_rating": round(average, 1),
+            "business_profile_count": self.business_profile_count,
+            "offer_count": self.offer_count,
+        }
+
+    def __str__(self):
+        return "Platform stats"
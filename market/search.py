@@ -0,0 +1,189 @@
+"""
+Full-text search backends for the offer title/description search.
+
+``get_search_backend()`` returns the backend configured in
+``settings.MARKET_SEARCH_BACKEND`` (dotted path) or, if unset, the native
+backend of the database vendor. Every backend narrows an Offer queryset to
+the rows matching all search terms and orders it by relevance.
+"""
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+_WORD_RE = re.compile(r"\w", re.UNICODE)
+_WORDS_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class BaseSearchBackend:
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def install(self):
+        """Create the index structures if they do not exist yet."""
+
+    def rebuild(self):
+        """Re-index every offer from scratch."""
+
+    def search(self, queryset, terms):
+        raise NotImplementedError
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    """Fallback without an index, same semantics as DRF's SearchFilter."""
+
+    def search(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        return queryset
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    External-content FTS5 table shadowing market_offer, kept current by
+    triggers so that bulk_create() and queryset.update() are indexed too.
+    """
+    table = "market_offer_fts"
+    source = "market_offer"
+    trigger_suffixes = ("ai", "ad", "au")
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        super().__init__(using)
+        self._available = False
+
+    def is_available(self):
+        if not self._available:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [self.table]
+                )
+                self._available = cursor.fetchone() is not None
+        return self._available
+
+    def missing_objects(self):
+        names = [self.table] + [f"{self.table}_{suffix}" for suffix in self.trigger_suffixes]
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name IN (%s)"
+                % ", ".join(["%s"] * len(names)),
+                names,
+            )
+            return set(names) - {row[0] for row in cursor.fetchall()}
+
+    def install(self):
+        missing = self.missing_objects()
+        if not missing:
+            self._available = True
+            return
+        t, src = self.table, self.source
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {t} USING fts5("
+            f"title, description, content='{src}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_ai AFTER INSERT ON {src} BEGIN "
+            f"INSERT INTO {t}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_ad AFTER DELETE ON {src} BEGIN "
+            f"INSERT INTO {t}({t}, rowid, title, description) "
+            f"VALUES ('delete', old.id, old.title, old.description); END",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_au AFTER UPDATE OF title, description ON {src} BEGIN "
+            f"INSERT INTO {t}({t}, rowid, title, description) "
+            f"VALUES ('delete', old.id, old.title, old.description); "
+            f"INSERT INTO {t}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+        ]
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        self._available = True
+        # ohne Tabelle oder Trigger verpasste Writes nachholen
+        self.rebuild()
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    def build_match(self, terms):
+        # jeder Begriff als Präfix-Phrase, FTS5-Syntax im Input wird so neutralisiert
+        phrases = ['"{}"*'.format(term.replace('"', '""')) for term in terms if _WORD_RE.search(term)]
+        return " ".join(phrases)
+
+    def search(self, queryset, terms):
+        if not self.is_available():
+            return LikeSearchBackend(self.using).search(queryset, terms)
+        match = self.build_match(terms)
+        if not match:
+            return queryset.none()
+        t, src = self.table, self.source
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {t} WHERE {t} MATCH %s", (match,))
+        ).annotate(
+            # bm25: kleiner ist relevanter
+            search_rank=RawSQL(
+                f"SELECT bm25({t}) FROM {t} WHERE {t} MATCH %s AND rowid = {src}.id",
+                (match,),
+                output_field=FloatField(),
+            )
+        ).order_by("search_rank", "-updated_at")
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector search backed by a GIN expression index."""
+    index = "market_offer_fts_idx"
+    vector = (
+        "to_tsvector('simple', coalesce(market_offer.title, '') || ' ' || "
+        "coalesce(market_offer.description, ''))"
+    )
+
+    def install(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.index} ON market_offer USING GIN (({self.vector}))"
+            )
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {self.index}")
+
+    def build_query(self, terms):
+        # jedes Wort als Präfix (:*), alle müssen passen; \w+ lässt keine tsquery-Syntax durch
+        words = [word for term in terms for word in _WORDS_RE.findall(term)]
+        return " & ".join(f"'{word}':*" for word in words)
+
+    def search(self, queryset, terms):
+        query = self.build_query(terms)
+        if not query:
+            return queryset.none()
+        return queryset.alias(
+            search_match=RawSQL(
+                f"{self.vector} @@ to_tsquery('simple', %s)", (query,), output_field=BooleanField()
+            )
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({self.vector}, to_tsquery('simple', %s))", (query,), output_field=FloatField()
+            )
+        ).order_by("-search_rank", "-updated_at")
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTS5Backend,
+    "postgresql": PostgresSearchBackend,
+}
+
+_backends = {}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    if using not in _backends:
+        path = getattr(settings, "MARKET_SEARCH_BACKEND", None)
+        if path:
+            backend_class = import_string(path)
+        else:
+            backend_class = VENDOR_BACKENDS.get(connections[using].vendor, LikeSearchBackend)
+        _backends[using] = backend_class(using)
+    return _backends[using]
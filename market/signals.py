@@ -0,0 +1,176 @@
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core import images
+
+from . import cache as offer_list_cache
+from . import stats as platform_stats
+from .models import BusinessOrderCounter, BusinessRating, Offer, OfferDetail, Order, PlatformStats, Review
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def sync_offer_min_values(sender, instance, **kwargs):
+    # Bulk writes (bulk_create / bulk_update / queryset.update) bypass this
+    # handler and have to set the values themselves, see min_detail_values()
+    # and Offer.objects.refresh_min_values().
+    Offer.objects.filter(pk=instance.offer_id).refresh_min_values()
+
+
+def install_search_index(sender, using, **kwargs):
+    # Connected to post_migrate in MarketConfig.ready()
+    try:
+        get_search_backend(using).install()
+    except DatabaseError:
+        # e.g. SQLite built without FTS5, search falls back to LIKE
+        pass
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_list_cache(sender, **kwargs):
+    offer_list_cache.invalidate()
+
+
+# Felder des Users, die die Liste als user_details ausgibt
+OFFER_LIST_USER_FIELDS = ("first_name", "last_name", "username")
+
+
+def offer_list_user_values(user):
+    # __dict__ statt getattr: zurückgestellte Felder nicht nachladen
+    return tuple(user.__dict__.get(name) for name in OFFER_LIST_USER_FIELDS)
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_offer_list_user_values(sender, instance, **kwargs):
+    instance._offer_list_values = offer_list_user_values(instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_offer_list_cache_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    old = getattr(instance, "_offer_list_values", None)
+    new = offer_list_user_values(instance)
+    instance._offer_list_values = new
+    if created:
+        # neuer User hat noch keine Angebote
+        return
+    if update_fields is not None and not set(update_fields) & set(OFFER_LIST_USER_FIELDS):
+        return
+    if old == new and None not in old:
+        return
+    offer_list_cache.invalidate()
+
+
+@receiver(post_save, sender=Offer)
+def schedule_offer_image_variants(sender, instance, **kwargs):
+    if images.needs_processing(instance, "image"):
+        images.schedule(instance, "image")
+
+
+# Variants are stored with queryset.update(), which bypasses post_save
+images.on_variants_recorded(Offer, "image", lambda pk: offer_list_cache.invalidate())
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, **kwargs):
+    # queryset.update() / bulk_create umgehen das, siehe OrderViewSet.bulk_status
+    old_key = None if created else getattr(instance, "_counter_key", None)
+    new_key = (instance.business_user_id, instance.status)
+    if created:
+        BusinessOrderCounter.objects.add(instance.business_user_id, {instance.status: 1})
+    elif old_key is None:
+        # Status beim Laden nicht bekannt (deferred)
+        BusinessOrderCounter.objects.recount(instance.business_user_id)
+    elif old_key != new_key:
+        old_business, old_status = old_key
+        if old_business == instance.business_user_id:
+            BusinessOrderCounter.objects.add(old_business, {old_status: -1, instance.status: 1})
+        else:
+            BusinessOrderCounter.objects.add(old_business, {old_status: -1})
+            BusinessOrderCounter.objects.add(instance.business_user_id, {instance.status: 1})
+    instance.remember_counter_key()
+
+
+@receiver(post_delete, sender=Order)
+def count_deleted_order(sender, instance, **kwargs):
+    key = getattr(instance, "_counter_key", None)
+    if key is None:
+        # wird beim nächsten Abruf neu gezählt (BusinessOrderCounter.objects.for_business)
+        BusinessOrderCounter.objects.filter(pk=instance.business_user_id).delete()
+        return
+    business_user_id, status = key
+    # kein Anlegen: beim Löschen des Business-Users ist die Zeile evtl. schon weg
+    BusinessOrderCounter.objects.add(business_user_id, {status: -1}, create=False)
+
+
+@receiver(post_save, sender=Review)
+def rate_saved_review(sender, instance, created, **kwargs):
+    old_key = None if created else getattr(instance, "_rating_key", None)
+    new_key = (instance.business_user_id, instance.rating)
+    if created:
+        BusinessRating.objects.add(instance.business_user_id, {instance.rating: 1})
+        PlatformStats.objects.add(review_count=1, rating_sum=instance.rating)
+    elif old_key is None:
+        BusinessRating.objects.recount(instance.business_user_id)
+        PlatformStats.objects.recount()
+    elif old_key != new_key:
+        old_business, old_rating = old_key
+        if old_business == instance.business_user_id:
+            BusinessRating.objects.add(old_business, {old_rating: -1, instance.rating: 1})
+        else:
+            BusinessRating.objects.add(old_business, {old_rating: -1})
+            BusinessRating.objects.add(instance.business_user_id, {instance.rating: 1})
+        PlatformStats.objects.add(rating_sum=instance.rating - old_rating)
+    instance.remember_rating_key()
+    platform_stats.invalidate()
+
+
+@receiver(post_delete, sender=Review)
+def rate_deleted_review(sender, instance, **kwargs):
+    key = getattr(instance, "_rating_key", None)
+    if key is None:
+        BusinessRating.objects.filter(pk=instance.business_user_id).delete()
+        PlatformStats.objects.recount()
+    else:
+        business_user_id, rating = key
+        BusinessRating.objects.add(business_user_id, {rating: -1}, create=False)
+        PlatformStats.objects.add(review_count=-1, rating_sum=-rating)
+    platform_stats.invalidate()
+
+
+@receiver(post_save, sender=Offer)
+def count_saved_offer(sender, instance, created, **kwargs):
+    # bulk_create (OfferImporter) zählt selbst
+    if created:
+        PlatformStats.objects.add(offer_count=1)
+        platform_stats.invalidate()
+
+
+@receiver(post_delete, sender=Offer)
+def count_deleted_offer(sender, instance, **kwargs):
+    PlatformStats.objects.add(offer_count=-1)
+    platform_stats.invalidate()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def count_saved_business_user(sender, instance, created, **kwargs):
+    # type ist über die API nicht änderbar; Änderungen im Admin repariert
+    # reconcile_platform_stats
+    if created and instance.type == "business":
+        PlatformStats.objects.add(business_profile_count=1)
+        platform_stats.invalidate()
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def count_deleted_business_user(sender, instance, **kwargs):
+    user_type = instance.__dict__.get("type")
+    if user_type is None:
+        PlatformStats.objects.recount()
+    elif user_type == "business":
+        PlatformStats.objects.add(business_profile_count=-1)
+    platform_stats.invalidate()
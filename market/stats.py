@@ -0,0 +1,118 @@
+"""
+In-process cache for the /api/base-info/ totals (PlatformStats).
+
+Within BASE_INFO_CACHE_TTL seconds the cached value is served without a
+query. For another BASE_INFO_STALE_TTL seconds the stale value is still
+served while a single background thread reloads it (stale-while-revalidate);
+after that the next request reloads synchronously while concurrent requests
+wait for its result. Writes in this process drop the value (see
+market.signals), other processes catch up via the TTL. A load that was
+running when the value was dropped is returned to its caller but not cached.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+
+
+def get_ttl():
+    return getattr(settings, "BASE_INFO_CACHE_TTL", 30)
+
+
+def get_stale_ttl():
+    return getattr(settings, "BASE_INFO_STALE_TTL", 300)
+
+
+class StaleWhileRevalidateCache:
+    def __init__(self, loader, ttl=get_ttl, stale_ttl=get_stale_ttl, clock=time.monotonic):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        # höchstens ein Load gleichzeitig (Hintergrund oder synchron)
+        self.refresh_lock = threading.Lock()
+        self.value = None
+        self.loaded_at = None
+        self.generation = 0
+        self.refresher = None
+        self.hits = self.stale_hits = self.misses = 0
+
+    def age(self):
+        return None if self.loaded_at is None else self.clock() - self.loaded_at
+
+    def get(self):
+        with self.lock:
+            age = self.age()
+            if age is not None and age < self.ttl():
+                self.hits += 1
+                return self.value
+            if age is not None and age < self.ttl() + self.stale_ttl():
+                self.stale_hits += 1
+                if self.refresher is None:
+                    self.refresher = threading.Thread(target=self._refresh_in_background, daemon=True)
+                    self.refresher.start()
+                return self.value
+            self.misses += 1
+        with self.refresh_lock:
+            with self.lock:
+                # ein anderer Request hat geladen, während wir gewartet haben
+                age = self.age()
+                if age is not None and age < self.ttl():
+                    return self.value
+            return self._load()
+
+    def refresh(self):
+        with self.refresh_lock:
+            return self._load()
+
+    def _load(self):
+        with self.lock:
+            generation = self.generation
+        value = self.loader()
+        with self.lock:
+            # clear() während des Ladens: Wert kann veraltet sein, nicht cachen
+            if self.generation == generation:
+                self.value = value
+                self.loaded_at = self.clock()
+        return value
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            with self.lock:
+                self.refresher = None
+            # Verbindungen sind pro Thread, sonst bleibt eine offen
+            connections.close_all()
+
+    def clear(self):
+        with self.lock:
+            self.value = None
+            self.loaded_at = None
+            self.generation += 1
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
+
+
+def load_base_info():
+    from .models import PlatformStats
+
+    return PlatformStats.objects.current().as_base_info()
+
+
+base_info_cache = StaleWhileRevalidateCache(load_base_info)
+
+
+def get_base_info():
+    return base_info_cache.get()
+
+
+def invalidate():
+    base_info_cache.clear()
+    if transaction.get_connection().in_atomic_block:
+        # ein paralleler Request kann den Stand vor dem Commit geladen haben
+        transaction.on_commit(base_info_cache.clear)
@@ -0,0 +1,115 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models.query import QuerySet
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from market.models import BusinessRating, Review
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestBusinessRatings:
+    def setup_method(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.customers = [
+            User.objects.create_user(username=f"customer{i}", password="pass", type="customer") for i in range(3)
+        ]
+
+    def review(self, customer, rating):
+        self.client.force_authenticate(user=customer)
+        response = self.client.post(
+            reverse("reviews-list"),
+            {"business_user": self.business.id, "rating": rating, "description": "Text"},
+            format="json",
+        )
+        assert response.status_code == 201
+        return response.data["id"]
+
+    def summary(self):
+        return BusinessRating.objects.get(pk=self.business.pk).summary()
+
+    def test_create_update_destroy(self):
+        first = self.review(self.customers[0], 5)
+        self.review(self.customers[1], 4)
+        assert self.summary() == {
+            "count": 2, "average": 4.5, "histogram": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1},
+        }
+
+        self.client.force_authenticate(user=self.customers[0])
+        response = self.client.patch(reverse("reviews-detail", args=[first]), {"rating": 2}, format="json")
+        assert response.status_code == 200
+        assert self.summary()["histogram"] == {"1": 0, "2": 1, "3": 0, "4": 1, "5": 0}
+        assert self.summary()["average"] == 3.0
+
+        assert self.client.delete(reverse("reviews-detail", args=[first])).status_code == 204
+        assert self.summary() == {
+            "count": 1, "average": 4.0, "histogram": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 0},
+        }
+
+    def test_patch_and_delete_lock_review(self):
+        review_id = self.review(self.customers[0], 5)
+        locked = []
+        original = QuerySet.select_for_update
+
+        def spy(queryset, *args, **kwargs):
+            locked.append((queryset.model, kwargs))
+            return original(queryset, *args, **kwargs)
+
+        self.client.force_authenticate(user=self.customers[0])
+        url = reverse("reviews-detail", args=[review_id])
+        with mock.patch.object(QuerySet, "select_for_update", spy):
+            assert self.client.patch(url, {"rating": 3}, format="json").status_code == 200
+            assert locked == [(Review, {"of": ("self",)})]
+            assert self.client.delete(url).status_code == 204
+        assert locked == [(Review, {"of": ("self",)})] * 2
+        assert self.summary()["count"] == 0
+
+    def test_business_profile_list(self, settings, django_assert_num_queries):
+        self.review(self.customers[0], 3)
+        other = User.objects.create_user(username="other", password="pass", type="business")
+        self.client.force_authenticate(user=self.customers[0])
+        for fast in (True, False):
+            settings.FAST_LIST_SERIALIZATION = fast
+            with django_assert_num_queries(1):
+                response = self.client.get(reverse("business-list"))
+            ratings = {row["user"]: row["rating"] for row in response.data}
+            assert ratings[self.business.id]["count"] == 1
+            assert ratings[self.business.id]["average"] == 3.0
+            assert ratings[other.id] == BusinessRating.empty_summary()
+
+    def test_sparse_rating(self):
+        self.review(self.customers[0], 3)
+        response = self.client.get(reverse("business-list"), {"fields": "user,rating"})
+        assert response.data == [{"user": self.business.id, "rating": self.summary()}]
+
+    def test_profile_detail(self):
+        self.review(self.customers[0], 4)
+        self.client.force_authenticate(user=self.business)
+        url = reverse("profile-detail", args=[self.business.id])
+        response = self.client.get(url)
+        assert response.data["rating"]["count"] == 1
+
+        # neue Bewertung -> neuer ETag, obwohl sich der User nicht ändert
+        self.review(self.customers[1], 2)
+        self.client.force_authenticate(user=self.business)
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 200
+
+    def test_customer_profile_has_no_rating(self):
+        self.client.force_authenticate(user=self.customers[0])
+        response = self.client.get(reverse("profile-detail", args=[self.customers[0].id]))
+        assert response.data["rating"] is None
+
+    def test_reconcile(self):
+        self.review(self.customers[0], 5)
+        Review.objects.update(rating=1)
+        out = StringIO()
+        call_command("reconcile_business_ratings", stdout=out)
+        assert "repaired 1 drifted" in out.getvalue()
+        assert self.summary()["histogram"]["1"] == 1
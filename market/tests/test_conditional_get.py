@@ -0,0 +1,77 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.models import Offer, OfferDetail, Review
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def setup_method(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.client.force_authenticate(user=self.customer)
+        self.offer = Offer.objects.create(user=self.business, title="Design", description="Desc")
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic"
+        )
+        self.review = Review.objects.create(
+            business_user=self.business, reviewer=self.customer, rating=4, description="Gut"
+        )
+
+    def assert_revalidates(self, url, django_assert_num_queries, **params):
+        response = self.client.get(url, params)
+        assert response.status_code == 200
+        etag = response["ETag"]
+        assert response["Last-Modified"]
+        # nur der Precheck, keine Serialisierung
+        with django_assert_num_queries(1):
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        return etag
+
+    def test_offer_retrieve(self, django_assert_num_queries):
+        url = reverse("offers-detail", args=[self.offer.id])
+        etag = self.assert_revalidates(url, django_assert_num_queries)
+
+        # Detailänderung ändert min_price -> neues ETag
+        self.detail.price = 50
+        self.detail.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["min_price"] == 50
+
+    def test_offer_detail_retrieve(self, django_assert_num_queries):
+        url = reverse("offerdetails-detail", args=[self.detail.id])
+        etag = self.assert_revalidates(url, django_assert_num_queries)
+        self.detail.title = "Basic+"
+        self.detail.save()
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_review_list(self, django_assert_num_queries):
+        url = reverse("reviews-list")
+        etag = self.assert_revalidates(url, django_assert_num_queries, business_user_id=self.business.id)
+
+        # anderer Filter -> anderes ETag
+        response = self.client.get(url, {"reviewer_id": self.customer.id}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+        other = User.objects.create_user(username="other", password="pass", type="customer")
+        Review.objects.create(business_user=self.business, reviewer=other, rating=1, description="Naja")
+        response = self.client.get(url, {"business_user_id": self.business.id}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert len(response.data) == 2
+
+    def test_if_modified_since(self):
+        url = reverse("offerdetails-detail", args=[self.detail.id])
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+
+    def test_missing_object_is_still_404(self):
+        response = self.client.get(reverse("offers-detail", args=[9999]), HTTP_IF_NONE_MATCH='"x"')
+        assert response.status_code == 404
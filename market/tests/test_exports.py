@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.models import Offer, OfferDetail, Order
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def body(response):
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+@pytest.mark.django_db
+class TestExports:
+    def setup_method(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.other = User.objects.create_user(username="other", password="pass", type="customer")
+
+        self.offer = Offer.objects.create(user=self.business, title="Design", description="Desc")
+        self.details = [
+            OfferDetail.objects.create(
+                offer=self.offer, title=offer_type, revisions=1, delivery_time_in_days=3,
+                price="99.50", features=["Logo"], offer_type=offer_type
+            )
+            for offer_type in ("basic", "premium")
+        ]
+        Offer.objects.create(user=self.business, title="Leer", description="Ohne Details")
+        self.order = Order.objects.create(
+            customer_user=self.customer, business_user=self.business, offer_detail=self.details[0],
+            title="basic", revisions=1, delivery_time_in_days=3, price="99.50",
+            features=["Logo"], offer_type="basic",
+        )
+
+    def test_offers_ndjson(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(reverse("offers-export"), {"max_price": 100})
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in body(response).splitlines()]
+        assert [row["title"] for row in rows] == ["Design", "Leer"]
+        assert [d["offer_type"] for d in rows[0]["details"]] == ["basic", "premium"]
+        assert rows[0]["details"][0]["price"] == "99.50"
+
+    def test_offers_csv(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(reverse("offers-export"), {"file_format": "csv"})
+        rows = list(csv.DictReader(io.StringIO(body(response))))
+        # eine Zeile pro Detail, Angebote ohne Details mit leeren Detailspalten
+        assert len(rows) == 3
+        assert rows[0]["offer_title"] == "Design"
+        assert json.loads(rows[0]["detail_features"]) == ["Logo"]
+        assert rows[2]["detail_id"] == ""
+
+    def test_orders_follow_visibility(self):
+        self.client.force_authenticate(user=self.customer)
+        rows = body(self.client.get(reverse("orders-export"))).splitlines()
+        assert [json.loads(row)["id"] for row in rows] == [self.order.id]
+
+        self.client.force_authenticate(user=self.other)
+        assert body(self.client.get(reverse("orders-export"))) == ""
+
+        self.client.force_authenticate(user=self.business)
+        response = self.client.get(reverse("orders-export"), {"file_format": "csv"})
+        rows = list(csv.DictReader(io.StringIO(body(response))))
+        assert rows[0]["status"] == "in_progress"
+
+    def test_requires_authentication_and_valid_format(self):
+        assert self.client.get(reverse("orders-export")).status_code == 401
+        self.client.force_authenticate(user=self.customer)
+        assert self.client.get(reverse("offers-export"), {"file_format": "xml"}).status_code == 400
@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.models import Offer, OfferDetail, Review
+
+User = get_user_model()
+
+VARIANTS = {"source": "offers/a.png", "thumbnail": "offers/a_thumbnail.jpg", "webp": "offers/a_webp.webp"}
+
+
+@pytest.mark.django_db
+class TestFastListSerialization:
+    """Der Fast-Path muss exakt dieselbe Ausgabe liefern wie die DRF-Serializer."""
+
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(
+            username="business", password="pass", type="business", first_name="Ada", tel=None,
+        )
+        User.objects.filter(pk=self.business.pk).update(file="profiles/b.png", file_variants={
+            "source": "profiles/b.png", "thumbnail": "profiles/b_thumbnail.jpg",
+        })
+        self.client.force_authenticate(user=self.customer)
+        for index in range(3):
+            offer = Offer.objects.create(user=self.business, title=f"Offer {index}", description="Text")
+            for offer_type, price in (("basic", "99.50"), ("premium", "250.00")):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=3 + index,
+                    price=price, features=["Logo"], offer_type=offer_type,
+                )
+        Offer.objects.filter(title="Offer 0").update(image="offers/a.png", image_variants=VARIANTS)
+        Offer.objects.filter(title="Offer 1").update(image="offers/old.png", image_variants=VARIANTS)
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description="Gut")
+
+    def compare(self, settings, url, params=None):
+        settings.FAST_LIST_SERIALIZATION = False
+        slow = self.client.get(url, params)
+        settings.FAST_LIST_SERIALIZATION = True
+        fast = self.client.get(url, params)
+        assert slow.status_code == fast.status_code == 200
+        assert fast.content == slow.content
+        return fast
+
+    def test_offers(self, settings):
+        response = self.compare(settings, reverse("offers-list"))
+        assert response.data["count"] == 3
+
+    def test_offers_filtered_and_ordered(self, settings):
+        self.compare(settings, reverse("offers-list"), {"ordering": "min_price", "max_delivery_time": 4})
+
+    def test_offers_sparse(self, settings):
+        self.compare(settings, reverse("offers-list"), {"fields": "id,image,details,user_details"})
+
+    def test_offers_cursor(self, settings):
+        first = self.compare(settings, reverse("offers-list"), {"pagination": "cursor", "page_size": 2})
+        cursor = first.data["next"].split("cursor=")[1].split("&")[0]
+        self.compare(settings, reverse("offers-list"), {"pagination": "cursor", "page_size": 2, "cursor": cursor})
+
+    def test_unknown_field_rejected(self, settings):
+        response = self.client.get(reverse("offers-list"), {"fields": "id,nope"})
+        assert response.status_code == 400
+
+    def test_reviews(self, settings):
+        self.compare(settings, reverse("reviews-list"), {"ordering": "rating"})
+
+    def test_business_profiles(self, settings):
+        response = self.compare(settings, reverse("business-list"))
+        assert response.data[0]["tel"] == ""
+
+    def test_offers_query_count(self, settings):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("offers-list"))
+        # COUNT, Seite, Detail-IDs
+        assert len(ctx.captured_queries) == 3
@@ -0,0 +1,123 @@
+import io
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core import images
+from market.models import Offer
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def png_upload(name="bild.png", size=(1200, 800)):
+    buffer = io.BytesIO()
+    Image.new("RGBA", size, (200, 30, 30, 255)).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@pytest.mark.django_db
+class TestImageVariants:
+    @pytest.fixture(autouse=True)
+    def media(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.MEDIA_URL = "/media/"
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+
+    def test_render_and_record(self):
+        offer = Offer.objects.create(user=self.business, title="Design", description="Desc", image=png_upload())
+        assert images.needs_processing(offer, "image")
+
+        images.process_now(offer, "image")
+        offer.refresh_from_db()
+        assert not images.needs_processing(offer, "image")
+        assert set(offer.image_variants) == {"source", "thumbnail", "thumbnail_webp", "webp"}
+        with Image.open(offer.image.storage.path(offer.image_variants["thumbnail_webp"])) as thumb:
+            assert thumb.format == "WEBP"
+            assert max(thumb.size) == 320
+
+    def test_list_serves_thumbnail(self):
+        offer = Offer.objects.create(user=self.business, title="Design", description="Desc", image=png_upload())
+        response = self.client.get(reverse("offers-list"))
+        # noch nicht verarbeitet -> Original
+        assert response.data["results"][0]["image"].endswith(offer.image.url)
+        assert response.data["results"][0]["image_variants"] == {}
+
+        images.process_now(offer, "image")
+        response = self.client.get(reverse("offers-list"))
+        result = response.data["results"][0]
+        assert result["image"].endswith("_thumbnail.jpg")
+        assert result["image_variants"]["webp"].endswith("_webp.webp")
+
+    def test_stale_job_does_not_overwrite_new_upload(self):
+        offer = Offer.objects.create(user=self.business, title="Design", description="Desc", image=png_upload("alt.png"))
+        old_name, old_path = offer.image.name, offer.image.path
+        offer.image = png_upload("neu.png")
+        offer.save()
+        paths = images.render_variants(old_path, images.get_variant_specs())
+        assert images.record_variants(Offer, offer.pk, "image", old_name, old_path, paths) == 0
+
+    def test_profile_variants(self):
+        self.business.file = png_upload("profil.png")
+        self.business.save()
+        images.process_now(self.business, "file")
+        self.client.force_authenticate(user=self.business)
+
+        response = self.client.get(f"/api/profile/{self.business.pk}/")
+        assert response.data["file"].endswith("profil.png")
+        assert response.data["file_variants"]["thumbnail"].endswith("_thumbnail.jpg")
+
+        response = self.client.get(reverse("business-list"))
+        assert response.data[0]["file"].endswith("_thumbnail.jpg")
+
+    def test_worker_pool(self):
+        offer = Offer.objects.create(user=self.business, title="Design", description="Desc", image=png_upload())
+        future = images.get_executor().submit(images.render_variants, offer.image.path, images.get_variant_specs())
+        assert set(future.result(timeout=60)) == {"thumbnail", "thumbnail_webp", "webp"}
+
+    def test_variant_names_keep_source_extension(self, tmp_path):
+        for name in ("logo.png", "logo.jpg"):
+            (tmp_path / name).write_bytes(png_upload(name).read())
+        png = images.render_variants(str(tmp_path / "logo.png"), images.get_variant_specs())
+        jpg = images.render_variants(str(tmp_path / "logo.jpg"), images.get_variant_specs())
+        assert png["thumbnail"].endswith("logo_png_thumbnail.jpg")
+        assert not set(png.values()) & set(jpg.values())
+
+    def test_replaced_image_variants_are_deleted(self, django_capture_on_commit_callbacks):
+        offer = Offer.objects.create(user=self.business, title="Design", description="Desc", image=png_upload("alt.png"))
+        images.process_now(offer, "image")
+        offer.refresh_from_db()
+        storage = offer.image.storage
+        old_variants = [path for name, path in offer.image_variants.items() if name != "source"]
+        assert all(storage.exists(path) for path in old_variants)
+
+        offer.image = png_upload("neu.png")
+        offer.save()
+        images.process_now(offer, "image")
+        assert not any(storage.exists(path) for path in old_variants)
+
+        offer.refresh_from_db()
+        offer.image = None
+        with django_capture_on_commit_callbacks(execute=True):
+            offer.save()
+        new_variants = [path for name, path in offer.image_variants.items() if name != "source"]
+        assert not any(storage.exists(path) for path in new_variants)
+
+    def test_recording_keeps_updated_at_and_changes_etag(self):
+        offer = Offer.objects.create(user=self.business, title="Design", description="Desc", image=png_upload())
+        self.client.force_authenticate(user=self.business)
+        url = reverse("offers-detail", args=[offer.pk])
+        etag = self.client.get(url)["ETag"]
+        updated_at = offer.updated_at
+
+        images.process_now(offer, "image")
+        offer.refresh_from_db()
+        assert offer.updated_at == updated_at
+        assert offer.variants_updated_at is not None
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
@@ -0,0 +1,126 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.cache import check_shared_cache
+from market import cache as offer_list_cache
+from market.cache import GENERATION_KEY
+from market.models import Offer, OfferDetail
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestOfferListCache:
+    def setup_method(self):
+        offer_list_cache.flush_counters()
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="business1", password="pass", type="business")
+        self.offer = Offer.objects.create(user=self.user, title="Design", description="Desc")
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic"
+        )
+        self.url = reverse("offers-list")
+
+    def test_second_anonymous_request_is_a_hit(self, django_assert_num_queries):
+        first = self.client.get(self.url)
+        assert first["X-Cache"] == "MISS"
+        with django_assert_num_queries(0):
+            second = self.client.get(self.url)
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+
+    def test_query_string_is_normalized(self):
+        self.client.get(self.url, {"max_price": 500, "ordering": "-updated_at"})
+        response = self.client.get(f"{self.url}?ordering=-updated_at&page=1&max_price=500&page_size=10")
+        assert response["X-Cache"] == "HIT"
+        response = self.client.get(self.url, {"max_price": 50})
+        assert response["X-Cache"] == "MISS"
+
+    def test_writes_invalidate(self):
+        self.client.get(self.url)
+        self.detail.price = 20
+        self.detail.save()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["min_price"] == 20
+
+        Offer.objects.create(user=self.user, title="Neu", description="Desc")
+        response = self.client.get(self.url)
+        assert response.data["count"] == 2
+
+        self.offer.delete()
+        response = self.client.get(self.url)
+        assert response.data["count"] == 1
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        assert "X-Cache" not in response
+
+    def test_stats_admin_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.user)
+        assert self.client.get(reverse("offers-cache-stats")).status_code == 403
+
+        admin = User.objects.create_superuser(username="admin", password="pass")
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(reverse("offers-cache-stats"))
+        assert response.status_code == 200
+        assert response.data["hits"] == 1
+        assert response.data["misses"] == 1
+        assert response.data["hit_rate"] == 0.5
+
+    def test_counters_are_batched(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        # erst stats() bzw. alle COUNTER_FLUSH_EVERY Requests schreiben in den Cache
+        assert cache.get(offer_list_cache.HITS_KEY) is None
+        assert cache.get(offer_list_cache.MISSES_KEY) is None
+        stats = offer_list_cache.stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_only_listed_user_fields_invalidate(self):
+        self.client.get(self.url)
+        self.user.location = "Berlin"
+        self.user.save()
+        assert self.client.get(self.url)["X-Cache"] == "HIT"
+
+        self.user.first_name = "Erika"
+        self.user.save()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["user_details"]["first_name"] == "Erika"
+
+    def test_queryset_update_invalidates(self):
+        self.client.get(self.url)
+        OfferDetail.objects.filter(pk=self.detail.pk).update(price=30)
+        Offer.objects.filter(pk=self.offer.pk).refresh_min_values()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["min_price"] == 30
+
+    def test_disabled_with_process_local_cache(self, settings):
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        assert "X-Cache" not in response
+        assert response.status_code == 200
+        assert [warning.id for warning in check_shared_cache()] == ["core.W001"]
+
+    def test_lost_generation_does_not_revive_old_pages(self):
+        self.client.get(self.url)
+        self.detail.price = 20
+        self.detail.save()
+        assert self.client.get(self.url)["X-Cache"] == "MISS"
+        # Generation abgelaufen/verdrängt: darf keine frühere Generation wiederholen
+        cache.delete(GENERATION_KEY)
+        self.detail.price = 30
+        self.detail.save()
+        response = self.client.get(self.url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["min_price"] == 30
@@ -0,0 +1,60 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.models import Offer
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestOfferCursorPagination:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="business1", password="pass", type="business")
+        self.offers = [
+            Offer.objects.create(user=self.user, title=f"Offer {i}", description="Desc", min_price=i * 10)
+            for i in range(7)
+        ]
+        # gleiche updated_at-Werte erzwingen, id muss die Reihenfolge entscheiden
+        Offer.objects.filter(pk__in=[o.pk for o in self.offers[2:5]]).update(
+            updated_at=self.offers[2].updated_at
+        )
+
+    def walk(self, params):
+        url = reverse("offers-list")
+        ids = []
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 3, **params})
+        while True:
+            assert response.status_code == 200
+            assert "count" not in response.data
+            ids += [o["id"] for o in response.data["results"]]
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def expected(self, qs):
+        return list(qs.values_list("id", flat=True))
+
+    def test_default_is_newest_first(self):
+        ids = self.walk({})
+        assert ids == self.expected(Offer.objects.order_by("-updated_at", "-id"))
+        assert len(ids) == 7
+
+    def test_ascending_ordering(self):
+        ids = self.walk({"ordering": "updated_at"})
+        assert ids == self.expected(Offer.objects.order_by("updated_at", "id"))
+
+    def test_filters_are_applied(self):
+        ids = self.walk({"min_price": 30})
+        assert ids == self.expected(
+            Offer.objects.filter(min_price__gte=30).order_by("-updated_at", "-id")
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("offers-list"), {"pagination": "cursor", "cursor": "kaputt"})
+        assert response.status_code == 404
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get(reverse("offers-list"))
+        assert response.data["count"] == 7
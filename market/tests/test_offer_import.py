@@ -0,0 +1,91 @@
+import json
+import pytest
+from io import StringIO
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.importers import OfferImporter
+from market.models import Offer, OfferDetail
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def offer_row(title, price=100):
+    return {
+        "title": title,
+        "description": "Importiert",
+        "details": [
+            {
+                "title": offer_type, "revisions": 1, "delivery_time_in_days": 3 + i,
+                "price": price + i * 100, "features": ["A"], "offer_type": offer_type,
+            }
+            for i, offer_type in enumerate(("basic", "standard", "premium"))
+        ],
+    }
+
+
+@pytest.mark.django_db
+class TestOfferBulkImport:
+    def setup_method(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.client.force_authenticate(user=self.business)
+        self.url = reverse("offers-bulk")
+
+    def test_json_array(self, django_assert_max_num_queries):
+        rows = [offer_row(f"Offer {i}") for i in range(25)]
+        with django_assert_max_num_queries(6):
+            response = self.client.post(self.url, rows, format="json")
+        assert response.status_code == 201
+        assert response.data["created"] == 25
+        assert Offer.objects.filter(user=self.business).count() == 25
+        assert OfferDetail.objects.count() == 75
+        offer = Offer.objects.get(pk=response.data["results"][0]["id"])
+        assert (offer.min_price, offer.min_delivery_time) == (100, 3)
+
+    def test_ndjson_with_invalid_rows(self):
+        body = "\n".join([
+            json.dumps(offer_row("Gut")),
+            "{kaputt",
+            json.dumps({"title": "Ohne Details"}),
+            "",
+            json.dumps(offer_row("Auch gut")),
+        ])
+        response = self.client.generic("POST", self.url, body, content_type="application/x-ndjson")
+        assert response.status_code == 207
+        assert [r["status"] for r in response.data["results"]] == ["created", "error", "error", "created"]
+        assert "details" in response.data["results"][2]["errors"]
+        assert Offer.objects.count() == 2
+
+    def test_only_business_users(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.post(self.url, [offer_row("X")], format="json")
+        assert response.status_code == 403
+
+    def test_rejects_single_object(self):
+        response = self.client.post(self.url, offer_row("X"), format="json")
+        assert response.status_code == 400
+
+    def test_management_command(self, tmp_path):
+        path = tmp_path / "offers.ndjson"
+        path.write_text("\n".join(json.dumps(offer_row(f"CLI {i}")) for i in range(7)))
+        out = StringIO()
+        call_command("import_offers", str(path), "--user", "business", "--batch-size", "3", stdout=out)
+        assert "Imported 7 offers, 0 rows failed" in out.getvalue()
+        assert Offer.objects.count() == 7
+
+    def test_management_command_invalid_json(self, tmp_path):
+        path = tmp_path / "offers.json"
+        path.write_text("[{")
+        with pytest.raises(CommandError, match="Invalid JSON input"):
+            call_command("import_offers", str(path), "--user", "business", stdout=StringIO())
+
+    def test_management_command_value_error_is_not_invalid_json(self, tmp_path):
+        path = tmp_path / "offers.json"
+        path.write_text(json.dumps([offer_row("X")]))
+        with mock.patch.object(OfferImporter, "import_batch", side_effect=ValueError("kaputt")), \
+                pytest.raises(ValueError, match="kaputt"):
+            call_command("import_offers", str(path), "--user", "business", stdout=StringIO())
@@ -0,0 +1,128 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.models import Offer, OfferDetail
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def offer_payload(title="Logo Design", prices=(100, 200, 500), days=(7, 5, 3)):
+    return {
+        "title": title,
+        "description": "Desc",
+        "details": [
+            {
+                "title": offer_type.capitalize(),
+                "revisions": 1,
+                "delivery_time_in_days": delivery,
+                "price": price,
+                "features": ["Logo"],
+                "offer_type": offer_type,
+            }
+            for offer_type, price, delivery in zip(("basic", "standard", "premium"), prices, days)
+        ],
+    }
+
+
+@pytest.mark.django_db
+class TestOfferMinValues:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="business1", password="pass", type="business")
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_stores_min_values(self):
+        response = self.client.post(reverse("offers-list"), offer_payload(), format="json")
+        assert response.status_code == 201
+        assert response.data["min_price"] == 100
+        assert response.data["min_delivery_time"] == 3
+        offer = Offer.objects.get(pk=response.data["id"])
+        assert offer.min_price == 100
+        assert offer.min_delivery_time == 3
+
+    def test_detail_update_and_delete_recompute(self):
+        offer = Offer.objects.create(user=self.user, title="Design", description="Desc")
+        cheap = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=2,
+            price=50, features=[], offer_type="basic"
+        )
+        OfferDetail.objects.create(
+            offer=offer, title="Premium", revisions=3, delivery_time_in_days=9,
+            price=300, features=[], offer_type="premium"
+        )
+        offer.refresh_from_db()
+        assert (offer.min_price, offer.min_delivery_time) == (50, 2)
+
+        cheap.price = 80
+        cheap.delivery_time_in_days = 4
+        cheap.save()
+        offer.refresh_from_db()
+        assert (offer.min_price, offer.min_delivery_time) == (80, 4)
+
+        cheap.delete()
+        offer.refresh_from_db()
+        assert (offer.min_price, offer.min_delivery_time) == (300, 9)
+
+    def test_patch_details_recomputes(self):
+        response = self.client.post(reverse("offers-list"), offer_payload(), format="json")
+        url = reverse("offers-detail", args=[response.data["id"]])
+        payload = {"details": [{
+            "title": "Basic", "revisions": 1, "delivery_time_in_days": 1,
+            "price": 20, "features": ["Logo"], "offer_type": "basic",
+        }]}
+        response = self.client.patch(url, payload, format="json")
+        assert response.status_code == 200
+        assert response.data["min_price"] == 20
+        assert response.data["min_delivery_time"] == 1
+
+    def test_filters_use_min_columns(self):
+        self.client.post(reverse("offers-list"), offer_payload("Cheap", prices=(10, 20, 30)), format="json")
+        self.client.post(reverse("offers-list"), offer_payload("Pricey", prices=(400, 500, 600), days=(14, 10, 8)), format="json")
+        url = reverse("offers-list")
+
+        response = self.client.get(url, {"max_price": 100})
+        assert [o["title"] for o in response.data["results"]] == ["Cheap"]
+
+        response = self.client.get(url, {"min_price": 100})
+        assert [o["title"] for o in response.data["results"]] == ["Pricey"]
+
+        response = self.client.get(url, {"max_delivery_time": 5})
+        assert [o["title"] for o in response.data["results"]] == ["Cheap"]
+
+    def test_backfill_command_repairs_drift(self):
+        self.client.post(reverse("offers-list"), offer_payload(), format="json")
+        Offer.objects.update(min_price=0, min_delivery_time=0)
+
+        out = StringIO()
+        call_command("backfill_offer_min_values", "--check", stdout=out)
+        assert "found 1" in out.getvalue()
+        offer = Offer.objects.get()
+        assert offer.min_price == 0
+
+        call_command("backfill_offer_min_values", "--chunk-size", "1", stdout=StringIO())
+        offer.refresh_from_db()
+        assert (offer.min_price, offer.min_delivery_time) == (100, 3)
+
+    def test_patch_reports_all_detail_errors_and_rolls_back(self):
+        response = self.client.post(reverse("offers-list"), offer_payload(), format="json")
+        url = reverse("offers-detail", args=[response.data["id"]])
+        payload = {
+            "title": "Neu",
+            "details": [
+                {"title": "Basic", "revisions": 1, "delivery_time_in_days": 1,
+                 "price": 1, "features": [], "offer_type": "basic"},
+                {"title": "X", "revisions": 1, "delivery_time_in_days": 1,
+                 "price": 1, "features": [], "offer_type": "gibtsnicht"},
+                {"title": "Y", "revisions": 1, "delivery_time_in_days": 1,
+                 "price": 1, "features": [], "offer_type": "weitere"},
+            ],
+        }
+        response = self.client.patch(url, payload, format="json")
+        assert response.status_code == 400
+        assert set(response.data) == {"details[1]", "details[2]"}
+        offer = Offer.objects.get()
+        assert offer.title == "Logo Design"
+        assert offer.min_price == 100
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.models import Offer, OfferDetail
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+def create_offer(user, title="Design"):
+    offer = Offer.objects.create(user=user, title=title, description="Desc")
+    for i, offer_type in enumerate(("basic", "standard", "premium")):
+        OfferDetail.objects.create(
+            offer=offer, title=offer_type, revisions=1, delivery_time_in_days=5 + i,
+            price=100 + i * 50, features=["Logo"], offer_type=offer_type
+        )
+    return offer
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as ctx:
+        response = func()
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestOfferQueryCount:
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="business1", password="pass", type="business")
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_query_count_is_constant(self):
+        url = reverse("offers-list")
+        create_offer(self.user)
+        _, few = count_queries(lambda: self.client.get(url))
+
+        other = User.objects.create_user(username="business2", password="pass", type="business")
+        for i in range(9):
+            create_offer(other, title=f"Offer {i}")
+        response, many = count_queries(lambda: self.client.get(url))
+
+        assert response.status_code == 200
+        assert len(response.data["results"]) == 10
+        # COUNT, Seite inkl. User-JOIN, Prefetch der Detail-IDs
+        assert few == many == 3
+
+    def test_retrieve_query_count(self, django_assert_num_queries):
+        offer = create_offer(self.user)
+        # ETag-Precheck, Offer, Prefetch der Detail-IDs
+        with django_assert_num_queries(3):
+            response = self.client.get(reverse("offers-detail", args=[offer.id]))
+        assert response.status_code == 200
+        assert len(response.data["details"]) == 3
+
+    def test_create_query_count(self, django_assert_num_queries):
+        payload = {
+            "title": "Logo",
+            "description": "Desc",
+            "details": [
+                {
+                    "title": offer_type, "revisions": 1, "delivery_time_in_days": 5,
+                    "price": 100, "features": ["Logo"], "offer_type": offer_type,
+                }
+                for offer_type in ("basic", "standard", "premium")
+            ],
+        }
+        # SAVEPOINT, Offer INSERT, PlatformStats UPDATE, ein bulk INSERT der Details, RELEASE,
+        # Details für die Antwort
+        with django_assert_num_queries(6):
+            response = self.client.post(reverse("offers-list"), payload, format="json")
+        assert response.status_code == 201
+        assert response.data["min_price"] == 100
+
+    def test_partial_update_query_count(self, django_assert_num_queries):
+        offer = create_offer(self.user)
+        with django_assert_num_queries(5):
+            response = self.client.patch(
+                reverse("offers-detail", args=[offer.id]), {"title": "Neu"}, format="json"
+            )
+        assert response.status_code == 200
+        assert response.data["title"] == "Neu"
+        assert len(response.data["details"]) == 3
+
+    def test_partial_update_details_query_count(self, django_assert_num_queries):
+        offer = create_offer(self.user)
+        payload = {"details": [
+            {
+                "title": offer_type, "revisions": 2, "delivery_time_in_days": 2,
+                "price": 10 + i, "features": ["Neu"], "offer_type": offer_type,
+            }
+            for i, offer_type in enumerate(("basic", "standard", "premium"))
+        ]}
+        # zusätzlich: alle Details in einer Abfrage laden, ein bulk UPDATE
+        with django_assert_num_queries(7):
+            response = self.client.patch(
+                reverse("offers-detail", args=[offer.id]), payload, format="json"
+            )
+        assert response.status_code == 200
+        assert response.data["min_price"] == 10
+        assert response.data["min_delivery_time"] == 2
+        assert sorted(d["price"] for d in response.data["details"]) == [10, 11, 12]
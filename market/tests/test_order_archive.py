@@ -0,0 +1,104 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from market import archive
+from market.models import ArchivedOrder, BusinessOrderCounter, Offer, OfferDetail, Order
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestOrderArchive:
+    def setup_method(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        offer = Offer.objects.create(user=self.business, title="Design", description="Text")
+        detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic",
+        )
+        old = timezone.now() - datetime.timedelta(days=400)
+        self.orders = {}
+        for name, status, updated_at in [
+            ("old_completed", "completed", old),
+            ("old_cancelled", "cancelled", old),
+            ("old_running", "in_progress", old),
+            ("new_completed", "completed", timezone.now()),
+        ]:
+            order = Order.objects.create(
+                customer_user=self.customer, business_user=self.business, offer_detail=detail, title=name,
+                revisions=1, delivery_time_in_days=5, price=100, features=["Logo"], offer_type="basic",
+                status=status,
+            )
+            Order.objects.filter(pk=order.pk).update(created_at=updated_at, updated_at=updated_at)
+            self.orders[name] = order.pk
+
+    def counts(self):
+        counter = BusinessOrderCounter.objects.get(pk=self.business.pk)
+        return counter.in_progress, counter.completed, counter.cancelled
+
+    @pytest.mark.parametrize("online", [False, True])
+    def test_archive_in_batches(self, online):
+        moved = archive.archive_orders(older_than_days=180, batch_size=1, online=online)
+        assert moved == 2
+        assert set(ArchivedOrder.objects.values_list("pk", flat=True)) == {
+            self.orders["old_completed"], self.orders["old_cancelled"],
+        }
+        assert not Order.objects.filter(pk__in=ArchivedOrder.objects.values("pk")).exists()
+        archived = ArchivedOrder.objects.get(pk=self.orders["old_completed"])
+        assert archived.title == "old_completed"
+        assert archived.status == "completed"
+        # Zähler bleiben unverändert
+        assert self.counts() == (1, 2, 1)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("archive_orders", "--dry-run", stdout=out)
+        assert "2 orders would be archived" in out.getvalue()
+        call_command("archive_orders", "--online", "--pause", "0", stdout=out)
+        assert "Archived 2 orders." in out.getvalue()
+        out = StringIO()
+        call_command("reconcile_order_counters", "--check", stdout=out)
+        assert "found 0 drifted" in out.getvalue()
+
+    def test_list_with_history(self):
+        archive.archive_orders(older_than_days=180)
+        self.client.force_authenticate(user=self.customer)
+        url = reverse("orders-list")
+
+        live = self.client.get(url)
+        assert {row["id"] for row in live.data} == {self.orders["old_running"], self.orders["new_completed"]}
+
+        history = self.client.get(url, {"history": "true"})
+        assert [row["id"] for row in history.data] == sorted(self.orders.values())
+        assert history.data[0]["title"] == "old_completed"
+
+        filtered = self.client.get(url, {"history": "true", "status": "completed"})
+        assert {row["id"] for row in filtered.data} == {self.orders["old_completed"], self.orders["new_completed"]}
+
+    def test_cursor_with_history(self):
+        archive.archive_orders(older_than_days=180)
+        self.client.force_authenticate(user=self.business)
+        url = reverse("orders-list")
+        seen = []
+        response = self.client.get(url, {"history": "true", "pagination": "cursor", "page_size": 3})
+        seen += [row["id"] for row in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        seen += [row["id"] for row in response.data["results"]]
+        assert response.data["next"] is None
+        assert seen[0] == self.orders["new_completed"]
+        assert sorted(seen) == sorted(self.orders.values())
+
+    def test_other_users_archive_invisible(self):
+        archive.archive_orders(older_than_days=180)
+        stranger = User.objects.create_user(username="stranger", password="pass", type="customer")
+        self.client.force_authenticate(user=stranger)
+        assert self.client.get(reverse("orders-list"), {"history": "true"}).data == []
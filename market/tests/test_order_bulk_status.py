@@ -0,0 +1,62 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from market.models import BusinessOrderCounter, Offer, OfferDetail, Order
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestOrderBulkStatus:
+    def setup_method(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.other = User.objects.create_user(username="other", password="pass", type="business")
+        offer = Offer.objects.create(user=self.business, title="Design", description="Text")
+        detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic",
+        )
+        self.orders = [
+            Order.objects.create(
+                customer_user=self.customer, business_user=business, offer_detail=detail, title="Basic",
+                revisions=1, delivery_time_in_days=5, price=100, features=[], offer_type="basic",
+            )
+            for business in (self.business, self.business, self.business, self.other)
+        ]
+        Order.objects.filter(pk=self.orders[2].pk).update(status="completed")
+        BusinessOrderCounter.objects.recount(self.business.pk)
+        self.url = reverse("orders-bulk-status")
+
+    def post(self, user, ids, status="completed"):
+        self.client.force_authenticate(user=user)
+        return self.client.post(self.url, {"ids": ids, "status": status}, format="json")
+
+    def test_bulk_complete(self, django_assert_max_num_queries):
+        ids = [order.pk for order in self.orders[:3]]
+        before = {order.pk: order.updated_at for order in self.orders}
+        with django_assert_max_num_queries(5):
+            response = self.post(self.business, ids)
+        assert response.status_code == 200
+        assert response.data == {"status": "completed", "updated": ids[:2], "unchanged": ids[2:]}
+        assert set(Order.objects.filter(pk__in=ids).values_list("status", flat=True)) == {"completed"}
+        for order in Order.objects.filter(pk__in=ids[:2]):
+            assert order.updated_at > before[order.pk]
+
+        counter = BusinessOrderCounter.objects.get(pk=self.business.pk)
+        assert (counter.in_progress, counter.completed) == (0, 3)
+
+    def test_foreign_or_unknown_ids_rejected(self):
+        response = self.post(self.business, [self.orders[0].pk, self.orders[3].pk, 9999])
+        assert response.status_code == 400
+        assert str(self.orders[3].pk) in response.data["ids"][0]
+        assert Order.objects.get(pk=self.orders[0].pk).status == "in_progress"
+
+    def test_invalid_status(self):
+        assert self.post(self.business, [self.orders[0].pk], status="lost").status_code == 400
+
+    def test_customer_forbidden(self):
+        assert self.post(self.customer, [self.orders[0].pk]).status_code == 403
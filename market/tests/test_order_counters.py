@@ -0,0 +1,98 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models.query import QuerySet
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from market.models import BusinessOrderCounter, Offer, OfferDetail, Order
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestOrderCounters:
+    def setup_method(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        offer = Offer.objects.create(user=self.business, title="Design", description="Text")
+        self.detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic",
+        )
+
+    def counts(self):
+        counter = BusinessOrderCounter.objects.get(pk=self.business.pk)
+        return counter.in_progress, counter.completed, counter.cancelled
+
+    def create_order(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.post(reverse("orders-list"), {"offer_detail_id": self.detail.id}, format="json")
+        assert response.status_code == 201
+        return response.data["id"]
+
+    def test_create_patch_delete(self):
+        first = self.create_order()
+        self.create_order()
+        assert self.counts() == (2, 0, 0)
+
+        self.client.force_authenticate(user=self.business)
+        response = self.client.patch(reverse("orders-detail", args=[first]), {"status": "completed"}, format="json")
+        assert response.status_code == 200
+        assert self.counts() == (1, 1, 0)
+
+        Order.objects.get(pk=first).delete()
+        assert self.counts() == (1, 0, 0)
+
+    def test_patch_locks_order_before_computing_delta(self):
+        order_id = self.create_order()
+        locked = []
+        original = QuerySet.select_for_update
+
+        def spy(queryset, *args, **kwargs):
+            locked.append((queryset.model, kwargs))
+            return original(queryset, *args, **kwargs)
+
+        self.client.force_authenticate(user=self.business)
+        with mock.patch.object(QuerySet, "select_for_update", spy):
+            response = self.client.patch(reverse("orders-detail", args=[order_id]), {"status": "completed"}, format="json")
+        assert response.status_code == 200
+        assert (Order, {"of": ("self",)}) in locked
+        assert self.counts() == (0, 1, 0)
+
+    def test_count_views_single_query(self, django_assert_num_queries):
+        self.create_order()
+        self.client.force_authenticate(user=self.customer)
+        with django_assert_num_queries(1):
+            response = self.client.get(reverse("order-count", args=[self.business.pk]))
+        assert response.data == {"order_count": 1}
+        with django_assert_num_queries(1):
+            response = self.client.get(reverse("completed-order-count", args=[self.business.pk]))
+        assert response.data == {"completed_order_count": 0}
+
+    def test_missing_counter_is_recounted(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(reverse("order-count", args=[self.business.pk]))
+        assert response.data == {"order_count": 0}
+        assert BusinessOrderCounter.objects.filter(pk=self.business.pk).exists()
+
+    def test_not_a_business(self):
+        self.client.force_authenticate(user=self.customer)
+        assert self.client.get(reverse("order-count", args=[self.customer.pk])).status_code == 404
+        assert self.client.get(reverse("completed-order-count", args=[9999])).status_code == 404
+
+    def test_reconcile(self):
+        self.create_order()
+        # queryset.update() umgeht die Signale
+        Order.objects.update(status="cancelled")
+        out = StringIO()
+        call_command("reconcile_order_counters", "--check", stdout=out)
+        assert "found 1 drifted" in out.getvalue()
+        assert self.counts() == (1, 0, 0)
+
+        call_command("reconcile_order_counters", stdout=StringIO())
+        assert self.counts() == (0, 0, 1)
@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from market.models import Offer, OfferDetail, Order
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestOrderListPagination:
+    def setup_method(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.other = User.objects.create_user(username="other", password="pass", type="business")
+        offer = Offer.objects.create(user=self.business, title="Design", description="Text")
+        detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic",
+        )
+        start = timezone.now() - datetime.timedelta(days=10)
+        self.orders = []
+        for index in range(5):
+            order = Order.objects.create(
+                customer_user=self.customer, business_user=self.business, offer_detail=detail,
+                title=f"Order {index}", revisions=1, delivery_time_in_days=5, price=100,
+                features=["Logo"], offer_type="basic",
+                status="completed" if index % 2 else "in_progress",
+            )
+            Order.objects.filter(pk=order.pk).update(created_at=start + datetime.timedelta(days=index))
+            self.orders.append(order)
+        # fremde Bestellung, darf nie auftauchen
+        Order.objects.create(
+            customer_user=self.other, business_user=self.other, offer_detail=detail, title="Fremd",
+            revisions=1, delivery_time_in_days=5, price=100, features=[], offer_type="basic",
+        )
+        self.start = start
+
+    def ids(self, data):
+        return [row["id"] for row in data]
+
+    def test_default_is_flat_array(self):
+        self.client.force_authenticate(user=self.business)
+        response = self.client.get(reverse("orders-list"))
+        assert response.status_code == 200
+        assert sorted(self.ids(response.data)) == [order.id for order in self.orders]
+
+    def test_cursor_pages_newest_first(self):
+        self.client.force_authenticate(user=self.customer)
+        url = reverse("orders-list")
+        first = self.client.get(url, {"pagination": "cursor", "page_size": 3})
+        assert self.ids(first.data["results"]) == [order.id for order in reversed(self.orders)][:3]
+        second = self.client.get(first.data["next"])
+        assert self.ids(second.data["results"]) == [self.orders[1].id, self.orders[0].id]
+        assert second.data["next"] is None
+
+    def test_status_and_date_filters(self):
+        self.client.force_authenticate(user=self.business)
+        response = self.client.get(reverse("orders-list"), {
+            "status": "in_progress",
+            "created_after": (self.start + datetime.timedelta(days=1)).isoformat(),
+        })
+        assert sorted(self.ids(response.data)) == [self.orders[2].id, self.orders[4].id]
+
+        response = self.client.get(reverse("orders-list"), {
+            "created_before": (self.start + datetime.timedelta(days=2)).isoformat(),
+        })
+        assert sorted(self.ids(response.data)) == [self.orders[0].id, self.orders[1].id]
+
+    def test_invalid_status(self):
+        self.client.force_authenticate(user=self.business)
+        response = self.client.get(reverse("orders-list"), {"status": "lost"})
+        assert response.status_code == 400
+
+    def test_union_instead_of_or(self):
+        self.client.force_authenticate(user=self.business)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("orders-list"), {"status": "completed"})
+        sql = ctx.captured_queries[-1]["sql"]
+        assert "UNION" in sql
+        assert " OR " not in sql
+
+    def test_detail_still_restricted(self):
+        self.client.force_authenticate(user=self.customer)
+        foreign = Order.objects.get(snapshot__title="Fremd")
+        assert self.client.get(reverse("orders-detail", args=[foreign.id])).status_code == 404
+        assert self.client.get(reverse("orders-detail", args=[self.orders[0].id])).status_code == 200
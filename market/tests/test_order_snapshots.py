@@ -0,0 +1,86 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from market.models import Offer, OfferDetail, Order, OrderSnapshot
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestOrderSnapshots:
+    def setup_method(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        offer = Offer.objects.create(user=self.business, title="Design", description="Text")
+        self.detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=2, delivery_time_in_days=5,
+            price="149.90", features=["Logo", "Visitenkarte"], offer_type="basic",
+        )
+
+    def order(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.post(reverse("orders-list"), {"offer_detail_id": self.detail.id}, format="json")
+        assert response.status_code == 201
+        return response
+
+    def test_identical_terms_share_one_snapshot(self):
+        self.order()
+        self.order()
+        assert Order.objects.count() == 2
+        assert OrderSnapshot.objects.count() == 1
+
+        self.detail.features = ["Logo"]
+        self.detail.save()
+        self.order()
+        assert OrderSnapshot.objects.count() == 2
+
+    def test_output_unchanged(self):
+        data = self.order().data
+        order = Order.objects.get()
+        expected = {
+            "id": order.id,
+            "customer_user": self.customer.id,
+            "business_user": self.business.id,
+            "title": "Basic",
+            "revisions": 2,
+            "delivery_time_in_days": 5,
+            "price": 149,
+            "features": ["Logo", "Visitenkarte"],
+            "offer_type": "basic",
+            "status": "in_progress",
+        }
+        assert {key: data[key] for key in expected} == expected
+        listed = self.client.get(reverse("orders-list")).data[0]
+        assert listed == data
+
+    def test_list_query_count(self, django_assert_num_queries):
+        for _ in range(3):
+            self.order()
+        with django_assert_num_queries(1):
+            response = self.client.get(reverse("orders-list"))
+        assert len(response.data) == 3
+
+    def test_sparse_fields(self):
+        self.order()
+        response = self.client.get(reverse("orders-list"), {"fields": "id,title,price"})
+        assert response.data == [{"id": Order.objects.get().id, "title": "Basic", "price": 149}]
+
+    def test_changing_terms_switches_snapshot(self):
+        self.order()
+        order = Order.objects.get()
+        order.title = "Basic+"
+        order.save(update_fields=["title"])
+        order = Order.objects.get()
+        assert order.title == "Basic+"
+        assert order.features == ["Logo", "Visitenkarte"]
+        assert OrderSnapshot.objects.count() == 2
+
+    def test_export(self):
+        self.order()
+        response = self.client.get(reverse("orders-export"), {"file_format": "csv"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith("id,customer_user,business_user,title,revisions")
+        assert ",Basic,2,5,149.90," in lines[1]
@@ -0,0 +1,157 @@
+import threading
+import time
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from market import stats as platform_stats
+from market.models import Offer, PlatformStats, PlatformStatsQuerySet, Review
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestPlatformStats:
+    def setup_method(self):
+        platform_stats.base_info_cache.clear()
+        self.client = APIClient()
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.other_customer = User.objects.create_user(username="customer2", password="pass", type="customer")
+
+    def base_info(self):
+        response = self.client.get(reverse("base-info"))
+        assert response.status_code == 200
+        return response.data
+
+    def stored(self):
+        return PlatformStats.objects.values(*PlatformStats.FIELDS).get()
+
+    def test_counts_follow_writes(self):
+        offer = Offer.objects.create(user=self.business, title="Design", description="Desc")
+        review = Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description="Top")
+        Review.objects.create(business_user=self.business, reviewer=self.other_customer, rating=5, description="Super")
+        assert self.base_info() == {
+            "review_count": 2, "average_rating": 4.5, "business_profile_count": 1, "offer_count": 1,
+        }
+
+        review.rating = 1
+        review.save()
+        assert self.base_info()["average_rating"] == 3.0
+
+        review.delete()
+        offer.delete()
+        User.objects.create_user(username="business2", password="pass", type="business")
+        assert self.base_info() == {
+            "review_count": 1, "average_rating": 5.0, "business_profile_count": 2, "offer_count": 0,
+        }
+        assert self.stored() == PlatformStats.objects.count_all()
+
+    def test_empty_platform(self):
+        Offer.objects.all().delete()
+        assert self.base_info()["average_rating"] == 0
+
+    def test_deleting_business_user_cascades(self):
+        Offer.objects.create(user=self.business, title="Design", description="Desc")
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4, description="Top")
+        self.business.delete()
+        assert self.base_info() == {
+            "review_count": 0, "average_rating": 0, "business_profile_count": 0, "offer_count": 0,
+        }
+
+    def test_cached_value_is_served_without_queries(self, django_assert_num_queries):
+        self.base_info()
+        with django_assert_num_queries(0):
+            self.base_info()
+
+    def test_concurrently_created_row_is_recounted(self):
+        # Zeile fehlte beim UPDATE, ein anderer Request hat sie danach samt
+        # diesem Angebot gezählt angelegt -> create() scheitert
+        Offer.objects.create(user=self.business, title="Design", description="Desc")
+        original = PlatformStatsQuerySet.update
+        calls = []
+
+        def update_before_row_existed(queryset, **kwargs):
+            calls.append(kwargs)
+            return 0 if len(calls) == 1 else original(queryset, **kwargs)
+
+        with mock.patch.object(PlatformStatsQuerySet, "update", update_before_row_existed):
+            PlatformStats.objects.add(offer_count=1)
+        assert self.stored()["offer_count"] == 1
+
+    def test_reconcile_repairs_drift(self):
+        Offer.objects.create(user=self.business, title="Design", description="Desc")
+        PlatformStats.objects.update(offer_count=7, business_profile_count=0)
+
+        out = StringIO()
+        call_command("reconcile_platform_stats", "--check", stdout=out)
+        assert "found 2 drifted" in out.getvalue()
+        assert self.stored()["offer_count"] == 7
+
+        out = StringIO()
+        call_command("reconcile_platform_stats", stdout=out)
+        assert "repaired 2 drifted" in out.getvalue()
+        assert self.stored() == PlatformStats.objects.count_all()
+
+
+class TestStaleWhileRevalidateCache:
+    def setup_method(self):
+        self.now = 0
+        self.loads = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.cache = platform_stats.StaleWhileRevalidateCache(
+            self.load, ttl=lambda: 10, stale_ttl=lambda: 60, clock=lambda: self.now
+        )
+
+    def load(self):
+        self.release.wait(timeout=5)
+        self.loads += 1
+        return self.loads
+
+    def test_fresh_stale_and_expired(self):
+        assert self.cache.get() == 1
+        self.now = 5
+        assert self.cache.get() == 1
+
+        # abgelaufen, aber im Stale-Fenster: alter Wert, Reload im Hintergrund
+        self.now = 20
+        self.release.clear()
+        assert self.cache.get() == 1
+        refresher = self.cache.refresher
+        assert self.cache.get() == 1
+        assert self.cache.refresher is refresher  # nur ein Reload gleichzeitig
+        self.release.set()
+        refresher.join(timeout=5)
+        assert self.loads == 2
+        assert self.cache.get() == 2
+
+        self.now = 200
+        assert self.cache.get() == 3
+        assert self.cache.stats() == {"hits": 2, "stale_hits": 2, "misses": 2}
+
+    def test_clear_during_load_is_not_cached(self):
+        cache = platform_stats.StaleWhileRevalidateCache(
+            lambda: (cache.clear(), "alt")[1], ttl=lambda: 10, stale_ttl=lambda: 60, clock=lambda: self.now
+        )
+        assert cache.get() == "alt"
+        assert cache.value is None
+        assert cache.stats()["misses"] == 1
+
+    def test_concurrent_misses_load_once(self):
+        self.release.clear()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get())) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert results == [1, 1, 1]
+        assert self.loads == 1
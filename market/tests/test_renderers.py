@@ -0,0 +1,78 @@
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.renderers import FastJSONParser, FastJSONRenderer
+from market.models import Offer, OfferDetail, Order
+
+User = get_user_model()
+
+SAMPLE = {
+    "price": Decimal("150.00"),
+    "created_at": datetime.datetime(2024, 5, 1, 8, 30, 0, 1234, tzinfo=datetime.timezone.utc),
+    "local": datetime.datetime(2024, 5, 1, 8, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+    "day": datetime.date(2024, 5, 1),
+    "duration": datetime.timedelta(days=1, seconds=5),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Kunde"),
+    "text": "Grüße   zeile",
+    "nested": [{"a": None, "b": True, "c": 1.5, 1: "int key"}, 1e16, -2e-10],
+    "big": 2 ** 70,
+}
+
+
+def test_renderer_byte_compatible():
+    assert FastJSONRenderer().render(SAMPLE) == JSONRenderer().render(SAMPLE)
+
+
+def test_renderer_indent_falls_back():
+    fast = FastJSONRenderer().render(SAMPLE, "application/json; indent=4")
+    assert fast == JSONRenderer().render(SAMPLE, "application/json; indent=4")
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), Decimal("-Infinity")])
+def test_renderer_rejects_non_finite_like_drf(value):
+    with pytest.raises(ValueError):
+        JSONRenderer().render({"value": [value]})
+    with pytest.raises(ValueError):
+        FastJSONRenderer().render({"value": [value]})
+
+
+@pytest.mark.parametrize("body", [b'{"a": [1, 2.5, "\xc3\xa4"], "b": null}', b'[123456789012345678901234567890]'])
+def test_parser_matches_json_parser(body):
+    assert FastJSONParser().parse(BytesIO(body)) == JSONParser().parse(BytesIO(body))
+
+
+def test_parser_error():
+    with pytest.raises(ParseError, match="JSON parse error"):
+        FastJSONParser().parse(BytesIO(b'{"a": NaN}'))
+
+
+@pytest.mark.django_db
+def test_order_list_byte_compatible():
+    customer = User.objects.create_user(username="customer", password="pass", type="customer")
+    business = User.objects.create_user(username="business", password="pass", type="business")
+    offer = Offer.objects.create(user=business, title="Design", description="Text")
+    detail = OfferDetail.objects.create(
+        offer=offer, title="Basic", revisions=1, delivery_time_in_days=5,
+        price="99.90", features=["Logo"], offer_type="basic",
+    )
+    Order.objects.create(
+        customer_user=customer, business_user=business, offer_detail=detail, title="Basic",
+        revisions=1, delivery_time_in_days=5, price="99.90", features=["Logo"], offer_type="basic",
+    )
+    client = APIClient()
+    client.force_authenticate(user=customer)
+    response = client.get(reverse("orders-list"))
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert response.content == JSONRenderer().render(response.data)
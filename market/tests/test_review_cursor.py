@@ -0,0 +1,70 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from market.models import Review
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestReviewCursorPagination:
+    def setup_method(self):
+        self.client = APIClient()
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.other = User.objects.create_user(username="other", password="pass", type="business")
+        self.customers = [
+            User.objects.create_user(username=f"customer{i}", password="pass", type="customer") for i in range(7)
+        ]
+        for index, customer in enumerate(self.customers):
+            Review.objects.create(
+                business_user=self.business, reviewer=customer, rating=index % 3 + 1, description="Text"
+            )
+        Review.objects.create(business_user=self.other, reviewer=self.customers[0], rating=5, description="Text")
+        self.client.force_authenticate(user=self.customers[0])
+
+    def walk(self, params):
+        url = reverse("reviews-list")
+        ids = []
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 3, **params})
+        while True:
+            assert response.status_code == 200
+            ids += [row["id"] for row in response.data["results"]]
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def expected(self, *ordering):
+        return list(Review.objects.filter(business_user=self.business).order_by(*ordering).values_list("id", flat=True))
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_orderings(self, settings, fast):
+        settings.FAST_LIST_SERIALIZATION = fast
+        base = {"business_user_id": self.business.id}
+        assert self.walk(base) == self.expected("-updated_at", "-id")
+        assert self.walk({**base, "ordering": "updated_at"}) == self.expected("updated_at", "id")
+        assert self.walk({**base, "ordering": "rating"}) == self.expected("rating", "id")
+        assert self.walk({**base, "ordering": "-rating"}) == self.expected("-rating", "-id")
+
+    def test_flat_array_by_default(self):
+        response = self.client.get(reverse("reviews-list"), {"business_user_id": self.business.id})
+        assert isinstance(response.data, list)
+        assert len(response.data) == 7
+
+    def test_reviewer_filter(self):
+        ids = self.walk({"reviewer_id": self.customers[0].id})
+        assert ids == list(
+            Review.objects.filter(reviewer=self.customers[0]).order_by("-updated_at", "-id").values_list("id", flat=True)
+        )
+
+    @pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite query plan")
+    def test_rating_page_uses_index(self):
+        queryset = Review.objects.filter(business_user=self.business).order_by("-rating", "-pk")[:4]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        assert "review_business_rating_idx" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from market.models import Offer, OfferDetail, Order, Review
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def setup_method(self):
+        self.client = APIClient()
+        self.customer = User.objects.create_user(username="customer", password="pass", type="customer")
+        self.business = User.objects.create_user(username="business", password="pass", type="business")
+        self.client.force_authenticate(user=self.customer)
+        self.offer = Offer.objects.create(user=self.business, title="Design", description="Sehr langer Text")
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=5,
+            price=100, features=["Logo"], offer_type="basic"
+        )
+        Order.objects.create(
+            customer_user=self.customer, business_user=self.business, offer_detail=self.detail,
+            title="Basic", revisions=1, delivery_time_in_days=5, price=100,
+            features=["Logo"], offer_type="basic",
+        )
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=5, description="Top")
+
+    def get(self, url, fields):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {"fields": fields})
+        return response, " ".join(q["sql"] for q in ctx.captured_queries)
+
+    def test_offers(self):
+        response, sql = self.get(reverse("offers-list"), "id,title,min_price")
+        assert response.status_code == 200
+        assert response.data["results"] == [{"id": self.offer.id, "title": "Design", "min_price": 100}]
+        assert '"market_offer"."description"' not in sql
+        # weder Details-Prefetch noch User-JOIN
+        assert "market_offerdetail" not in sql
+        assert "users_customuser" not in sql
+
+    def test_offers_with_user_details(self):
+        response, sql = self.get(reverse("offers-list"), "title,user_details")
+        assert response.data["results"][0]["user_details"]["username"] == "business"
+        assert '"market_offer"."description"' not in sql
+
+    def test_orders(self):
+        response, sql = self.get(reverse("orders-list"), "id,status,price")
+        assert response.data == [{"id": Order.objects.get().id, "status": "in_progress", "price": 100}]
+        assert '"market_order"."features"' not in sql
+
+    def test_reviews(self):
+        response, sql = self.get(reverse("reviews-list"), "rating")
+        assert response.data == [{"rating": 5}]
+        assert '"market_review"."description"' not in sql
+
+    def test_profiles(self):
+        response, sql = self.get(reverse("business-list"), "user,username")
+        assert response.data == [{"user": self.business.id, "username": "business"}]
+        assert '"users_customuser"."description"' not in sql
+
+        response, _ = self.get(reverse("customer-list"), "uploaded_at")
+        assert list(response.data[0]) == ["uploaded_at"]
+
+    def test_unknown_field(self):
+        response, _ = self.get(reverse("orders-list"), "id,offer_detail_id")
+        assert response.status_code == 400
+        assert "offer_detail_id" in str(response.data["fields"])
+
+    def test_without_fields_everything(self):
+        response = self.client.get(reverse("offers-list"))
+        assert "description" in response.data["results"][0]
@@ -0,0 +1,8 @@
+from market.api.pagination import KeysetPagination
+
+
+class ProfileKeysetPagination(KeysetPagination):
+    # (type, id)-Index, siehe CustomUser.Meta
+    ordering_field = "id"
+    default_descending = False
+    page_size = 20
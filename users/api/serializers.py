@@ -1,11 +1,25 @@
 from rest_framework import serializers
+from core import images
+from core.fastserializers import ValuesSerializer
 from ..models import CustomUser
-from market.models import Offer, OfferDetail, Order, Review
+from market.models import BusinessRating, Offer, OfferDetail, Order, Review
+
+def rating_summary(user):
+    """BusinessRating of a business user as dict, needs select_related('rating')."""
+    if user.type != "business":
+        return None
+    try:
+        return user.rating.summary()
+    except BusinessRating.DoesNotExist:
+        return BusinessRating.empty_summary()
+
 
 class ProfileSerializer(serializers.ModelSerializer):
     user = serializers.IntegerField(source="id", read_only=True)
     file = serializers.ImageField(required=False, allow_null=True)
+    file_variants = serializers.SerializerMethodField()
     type = serializers.CharField(read_only=True)
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = CustomUser
@@ -15,16 +29,24 @@ class ProfileSerializer(serializers.ModelSerializer):
             "first_name",
             "last_name",
             "file",
+            "file_variants",
             "location",
             "tel",
             "description",
             "working_hours",
             "type",
             "email",
-            "created_at"
+            "created_at",
+            "rating",
         ]
         read_only_fields = ["user", "created_at", "type"]
 
+    def get_file_variants(self, obj):
+        return images.variant_urls(obj.file, obj.file_variants, self.context.get("request"))
+
+    def get_rating(self, obj):
+        return rating_summary(obj)
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
         optional_fields = [
@@ -32,7 +54,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             "tel", "description", "working_hours"
         ]
         for field in optional_fields:
-            if data.get(field) is None:
+            if field in data and data[field] is None:
                 data[field] = ""
         return data
 
@@ -43,6 +65,9 @@ class ProfileSerializer(serializers.ModelSerializer):
 
 class BusinessProfileListOutputSerializer(serializers.ModelSerializer):
     user = serializers.IntegerField(source="id", read_only=True)
+    file = serializers.SerializerMethodField()
+    file_variants = serializers.SerializerMethodField()
+    rating = serializers.SerializerMethodField()
 
     class Meta:
         model = CustomUser
@@ -52,14 +77,26 @@ class BusinessProfileListOutputSerializer(serializers.ModelSerializer):
             "first_name",
             "last_name",
             "file",
+            "file_variants",
             "location",
             "tel",
             "description",
             "working_hours",
-            "type"
+            "type",
+            "rating",
         ]
         read_only_fields = fields # All fields are read-only for output
 
+    def get_rating(self, obj):
+        return rating_summary(obj)
+
+    def get_file(self, obj):
+        # Liste zeigt das Thumbnail, bis es erzeugt ist das Original
+        return images.variant_url(obj.file, obj.file_variants, "thumbnail", self.context.get("request"))
+
+    def get_file_variants(self, obj):
+        return images.variant_urls(obj.file, obj.file_variants, self.context.get("request"))
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
         optional_fields = [
@@ -67,10 +104,50 @@ class BusinessProfileListOutputSerializer(serializers.ModelSerializer):
             "tel", "description", "working_hours"
         ]
         for field in optional_fields:
-            if data.get(field) is None:
+            if field in data and data[field] is None:
                 data[field] = ""
         return data
         
+class BusinessProfileListValuesSerializer(ValuesSerializer):
+    """Fast path for the business profile list, output identical to BusinessProfileListOutputSerializer."""
+    serializer_class = BusinessProfileListOutputSerializer
+    columns = {
+        "file": ["file", "file_variants"],
+        "file_variants": ["file", "file_variants"],
+        "rating": ["type", "rating__review_count", "rating__rating_sum"]
+        + [f"rating__rating_{star}" for star in BusinessRating.STARS],
+    }
+    optional_fields = ("first_name", "last_name", "location", "tel", "description", "working_hours")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        file_field = CustomUser._meta.get_field("file")
+        self.file = lambda name: file_field.attr_class(None, file_field, name)
+
+    def represent_rating(self, row):
+        if row["type"] != "business":
+            return None
+        if row["rating__review_count"] is None:
+            return BusinessRating.empty_summary()
+        histogram = [row[f"rating__rating_{star}"] for star in BusinessRating.STARS]
+        return BusinessRating.summarize(row["rating__review_count"], row["rating__rating_sum"], histogram)
+
+    def represent_file(self, row):
+        return images.variant_url(self.file(row["file"]), row["file_variants"], "thumbnail", self.request)
+
+    def represent_file_variants(self, row):
+        return images.variant_urls(self.file(row["file"]), row["file_variants"], self.request)
+
+    def serialize(self, rows):
+        data = super().serialize(rows)
+        optional = [field for field in self.optional_fields if field in self.field_names]
+        for item in data:
+            for field in optional:
+                if item[field] is None:
+                    item[field] = ""
+        return data
+
+
 class BusinessProfileListSerializer(serializers.ModelSerializer):
     user = serializers.IntegerField(source="id", read_only=True)
     file = serializers.ImageField(required=False, allow_null=True)
@@ -1,29 +1,93 @@
 from django.shortcuts import render
+from django_filters.rest_framework import CharFilter, DjangoFilterBackend, FilterSet
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
+from core.conditional import ConditionalGetMixin
+from core.fastserializers import FastListMixin
+from core.fieldsets import SparseFieldsetMixin
+from market.api.pagination import CursorPaginationMixin
+from market.models import BusinessRating
 from users.models import CustomUser
-from .serializers import BusinessProfileListOutputSerializer, ProfileSerializer, CustomerProfileListSerializer
+from .pagination import ProfileKeysetPagination
+from .serializers import (
+    BusinessProfileListOutputSerializer, BusinessProfileListValuesSerializer,
+    ProfileSerializer, CustomerProfileListSerializer,
+)
 from authentication.api.permissions import IsOwnerOrReadOnly
 
 from rest_framework.exceptions import PermissionDenied
 from .permissions import IsProfileOwner
 
-class ProfileDetailView(generics.RetrieveUpdateAPIView):
-    queryset = CustomUser.objects.all()
+class ProfileDetailView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
+    queryset = CustomUser.objects.select_related('rating')
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated, IsProfileOwner]
 
-class BusinessProfileListView(generics.ListAPIView):
+    def get_object_validators(self):
+        # rating (BusinessRating) und Bildvarianten ändern sich ohne CustomUser.updated_at
+        row = (
+            CustomUser.objects.filter(pk=self.kwargs['pk'])
+            .values_list('updated_at', 'rating__updated_at', 'variants_updated_at', 'pk')
+            .first()
+        )
+        if row is None:
+            return None
+        updated_at, rating_updated_at, variants_updated_at, pk = row
+        last_modified = max(filter(None, [updated_at, rating_updated_at, variants_updated_at]))
+        return last_modified, pk, rating_updated_at, variants_updated_at
+
+
+class ProfileFilter(FilterSet):
+    """
+    ``location`` (exact) and ``name`` (case-sensitive username prefix), both
+    backed by the (type, ...) indexes on CustomUser.
+    """
+    location = CharFilter(field_name='location')
+    name = CharFilter(method='filter_name_prefix')
+
+    class Meta:
+        model = CustomUser
+        fields = ['location', 'name']
+
+    def filter_name_prefix(self, queryset, name, value):
+        # Bereich statt LIKE, damit der Index greift (LIKE ist in SQLite
+        # case-insensitive und nutzt den Index nicht)
+        queryset = queryset.filter(username__gte=value, username__startswith=value)
+        if ord(value[-1]) < 0x10FFFF:
+            queryset = queryset.filter(username__lt=value[:-1] + chr(ord(value[-1]) + 1))
+        return queryset
+
+
+class ProfileListMixin(CursorPaginationMixin):
+    """Plain array by default, ``?pagination=cursor`` returns pages keyed on id."""
+    pagination_class = None
+    cursor_pagination_class = ProfileKeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProfileFilter
+
+class BusinessProfileListView(ProfileListMixin, SparseFieldsetMixin, FastListMixin, generics.ListAPIView):
     queryset = CustomUser.objects.filter(type='business')
     serializer_class = BusinessProfileListOutputSerializer
+    fast_serializer_class = BusinessProfileListValuesSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None
+    sparse_field_columns = {
+        'file': ['file', 'file_variants'],
+        'file_variants': ['file', 'file_variants'],
+        'rating': ['type', 'rating__review_count', 'rating__rating_sum']
+        + [f'rating__rating_{star}' for star in BusinessRating.STARS],
+    }
 
-class CustomerProfileListView(generics.ListAPIView):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_fields()
+        if requested is None or 'rating' in requested:
+            queryset = queryset.select_related('rating')
+        return queryset
+
+class CustomerProfileListView(ProfileListMixin, SparseFieldsetMixin, generics.ListAPIView):
     queryset = CustomUser.objects.filter(type="customer")
     serializer_class = CustomerProfileListSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None
 
 
 
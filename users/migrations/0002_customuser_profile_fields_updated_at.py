@@ -0,0 +1,59 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:28
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='file',
+            field=models.ImageField(blank=True, null=True, upload_to='profile_pics/'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='description',
+            field=models.TextField(blank=True, default='', null=True),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='first_name',
+            field=models.CharField(blank=True, default='', max_length=150),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='last_name',
+            field=models.CharField(blank=True, default='', max_length=150),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='location',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='tel',
+            field=models.CharField(blank=True, default='', max_length=50, null=True),
+        ),
+        migrations.AlterField(
+            model_name='customuser',
+            name='working_hours',
+            field=models.CharField(blank=True, default='', max_length=255, null=True),
+        ),
+    ]
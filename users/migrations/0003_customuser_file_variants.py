@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_customuser_profile_fields_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='file_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_customuser_profile_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='variants_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
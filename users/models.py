@@ -15,7 +15,19 @@ class CustomUser(AbstractUser):
     first_name = models.CharField(max_length=150, blank=True, default="")
     last_name = models.CharField(max_length=150, blank=True, default="")
     file = models.ImageField(upload_to="profile_pics/", blank=True, null=True)
+    # Thumbnail/WebP-Varianten, befüllt von core.images
+    file_variants = models.JSONField(default=dict, blank=True, editable=False)
+    variants_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Profillisten: type-Filter + Keyset auf id, siehe users.api.views
+            models.Index(fields=['type', 'id'], name='user_type_id_idx'),
+            models.Index(fields=['type', 'location', 'id'], name='user_type_location_idx'),
+            models.Index(fields=['type', 'username'], name='user_type_username_idx'),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.type})"
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core import images
+
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def schedule_profile_image_variants(sender, instance, **kwargs):
+    if images.needs_processing(instance, "file"):
+        images.schedule(instance, "file")
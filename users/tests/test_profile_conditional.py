@@ -0,0 +1,20 @@
+import pytest
+from rest_framework.test import APIClient
+from users.models import CustomUser
+
+pytestmark = pytest.mark.django_db
+
+
+def test_profile_etag_changes_after_update():
+    client = APIClient()
+    user = CustomUser.objects.create_user(username='foo@bar.com', email='foo@bar.com', password='secret')
+    client.force_authenticate(user=user)
+    url = f'/api/profile/{user.pk}/'
+
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    client.patch(url, {"first_name": "John"})
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data['first_name'] == 'John'
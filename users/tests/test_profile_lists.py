@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.models import CustomUser
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    viewer = CustomUser.objects.create_user(username='viewer', password='secret', type='customer')
+    client.force_authenticate(user=viewer)
+    return client
+
+
+def create_businesses():
+    return [
+        CustomUser.objects.create_user(username=name, password='secret', type='business', location=location)
+        for name, location in [
+            ('anna', 'Berlin'), ('anton', 'Hamburg'), ('berta', 'Berlin'), ('Andreas', 'Berlin'), ('carl', 'Köln'),
+        ]
+    ]
+
+
+def usernames(response):
+    return [row['username'] for row in response.data['results']]
+
+
+def cursor_params(**params):
+    return {'pagination': 'cursor', **params}
+
+
+def test_cursor_pages(client):
+    businesses = create_businesses()
+    url = reverse('business-list')
+
+    response = client.get(url, cursor_params(page_size=2))
+    assert response.status_code == 200
+    assert usernames(response) == ['anna', 'anton']
+
+    seen = usernames(response)
+    while response.data['next']:
+        response = client.get(response.data['next'])
+        seen += usernames(response)
+    assert seen == [user.username for user in businesses]
+
+
+def test_flat_array_by_default(client):
+    create_businesses()
+    response = client.get(reverse('business-list'))
+    assert isinstance(response.data, list)
+    assert len(response.data) == 5
+
+    response = client.get(reverse('customer-list'))
+    assert [row['username'] for row in response.data] == ['viewer']
+    response = client.get(reverse('customer-list'), cursor_params())
+    assert usernames(response) == ['viewer']
+
+
+def test_location_and_name_filters(client):
+    create_businesses()
+    url = reverse('business-list')
+    assert usernames(client.get(url, cursor_params(location='Berlin'))) == ['anna', 'berta', 'Andreas']
+    # Präfix ist case-sensitive
+    assert usernames(client.get(url, cursor_params(name='an'))) == ['anna', 'anton']
+    assert usernames(client.get(url, cursor_params(name='an', location='Hamburg'))) == ['anton']
+    assert usernames(client.get(url, cursor_params(name='x'))) == []
+    assert [row['username'] for row in client.get(url, {'name': 'an'}).data] == ['anna', 'anton']
+
+
+def test_filters_use_indexes(client):
+    create_businesses()
+    url = reverse('business-list')
+    for params, index in [
+        (cursor_params(), 'user_type_id_idx'),
+        (cursor_params(location='Berlin'), 'user_type_location_idx'),
+        (cursor_params(name='an'), 'user_type_username_idx'),
+    ]:
+        with CaptureQueriesContext(connection) as ctx:
+            client.get(url, params)
+        sql = ctx.captured_queries[-1]['sql']
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        assert index in plan, (params, plan)